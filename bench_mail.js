@@ -0,0 +1,176 @@
+// bench_mail.js - Benchmark doručovania emailov pre OddlženieOnline.sk
+// Lokálny SMTP server (náhrada Gmailu so simulovanou latenciou siete) a meranie
+// priepustnosti a latencie odosielania cez nodemailer: pool spojení vs. spojenie na správu.
+//
+// Použitie:
+//   node bench_mail.js                                  # pool vs. bez poolu, JSON na stdout
+//   node bench_mail.js --messages 200 --concurrency 20 --attachment-kb 400 --rtt 40 --pool-size 3
+//   node bench_mail.js --smtp 2525 --rtt 40             # iba SMTP server pre server.js:
+//                                                       # SMTP_HOST=127.0.0.1 SMTP_PORT=2525 node server.js
+
+const net = require('net');
+
+// ============================================
+// LOKÁLNY SMTP SERVER
+// ============================================
+// Minimálny SMTP (RFC 5321) bez TLS a AUTH: prijme každú správu a zahodí ju.
+// rtt = oneskorenie každej odpovede v ms (sieť k vzdialenému serveru),
+// failEvery = každá N-tá správa dostane 451 (dočasná chyba, na skúšku opakovania).
+function startSmtpServer({ port = 0, rtt = 0, failEvery = 0 } = {}) {
+  const stats = { connections: 0, messages: 0, rejected: 0, bytes: 0 };
+
+  const server = net.createServer((socket) => {
+    stats.connections++;
+    let buffer = '';
+    let inData = false;
+    let dataBytes = 0;
+    const reply = (line) => setTimeout(() => socket.writable && socket.write(line + '\r\n'), rtt);
+
+    reply('220 localhost bench SMTP');
+    socket.setEncoding('latin1');
+    socket.on('error', () => {});
+    socket.on('data', (chunk) => {
+      buffer += chunk;
+      for (;;) {
+        if (inData) {
+          const end = buffer.indexOf('\r\n.\r\n');
+          if (end === -1) {
+            // Koniec správy môže byť rozdelený medzi dva chunky, posledné 4 znaky necháme
+            dataBytes += Math.max(0, buffer.length - 4);
+            buffer = buffer.slice(-4);
+            return;
+          }
+          dataBytes += end;
+          buffer = buffer.slice(end + 5);
+          inData = false;
+          stats.bytes += dataBytes;
+          if (failEvery && (stats.messages + stats.rejected + 1) % failEvery === 0) {
+            stats.rejected++;
+            reply('451 4.3.0 Dočasná chyba, skúste znova');
+          } else {
+            stats.messages++;
+            reply('250 2.0.0 OK');
+          }
+          continue;
+        }
+        const eol = buffer.indexOf('\r\n');
+        if (eol === -1) return;
+        const line = buffer.slice(0, eol);
+        buffer = buffer.slice(eol + 2);
+        const verb = line.slice(0, 4).toUpperCase();
+        if (verb === 'EHLO') reply('250-localhost\r\n250-SIZE 52428800\r\n250 8BITMIME');
+        else if (verb === 'HELO' || verb === 'MAIL' || verb === 'RCPT' || verb === 'RSET' || verb === 'NOOP') reply('250 OK');
+        else if (verb === 'DATA') { inData = true; dataBytes = 0; reply('354 Koniec <CRLF>.<CRLF>'); }
+        else if (verb === 'QUIT') { reply('221 Bye'); setTimeout(() => socket.end(), rtt); }
+        else reply('502 Neznámy príkaz');
+      }
+    });
+  });
+
+  return new Promise((resolve) => {
+    server.listen(port, '127.0.0.1', () => resolve({ server, port: server.address().port, stats }));
+  });
+}
+
+// ============================================
+// MERANIE
+// ============================================
+function percentile(sorted, p) {
+  return sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] : 0;
+}
+
+// messages správ, najviac concurrency naraz (ako súbežné úlohy fronty žiadostí)
+async function runScenario(nodemailer, smtp, { pool, poolSize, messages, concurrency, attachment }) {
+  const transport = nodemailer.createTransport({
+    host: '127.0.0.1',
+    port: smtp.port,
+    secure: false,
+    ignoreTLS: true,
+    ...(pool ? { pool: true, maxConnections: poolSize, maxMessages: 100 } : {})
+  });
+  const before = { ...smtp.stats };
+  const latencies = [];
+  let next = 0;
+  const start = Date.now();
+
+  async function worker() {
+    while (next < messages) {
+      const i = next++;
+      const sent = Date.now();
+      await transport.sendMail({
+        from: 'OddlženieOnline.sk <bench@localhost>',
+        to: `klient${i}@localhost`,
+        subject: `Bench ${i}`,
+        html: '<p>Žiadosť úspešne prijatá</p>',
+        attachments: attachment ? [{ filename: 'Dokumenty.pdf', content: attachment }] : []
+      });
+      latencies.push(Date.now() - sent);
+    }
+  }
+
+  await Promise.all(Array.from({ length: Math.min(concurrency, messages) }, worker));
+  const seconds = (Date.now() - start) / 1000;
+  transport.close();
+
+  latencies.sort((a, b) => a - b);
+  return {
+    messages,
+    seconds,
+    messagesPerSecond: Math.round(messages / seconds * 10) / 10,
+    latencyMs: {
+      p50: percentile(latencies, 0.5),
+      p95: percentile(latencies, 0.95),
+      max: latencies[latencies.length - 1]
+    },
+    smtpConnections: smtp.stats.connections - before.connections
+  };
+}
+
+function parseArgs(argv) {
+  const args = { messages: 100, concurrency: 10, attachmentKb: 300, rtt: 30, poolSize: 3, smtp: null };
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, '').replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(name in args)) throw new Error(`Neznámy parameter ${argv[i]}`);
+    args[name] = Number(argv[++i]);
+  }
+  return args;
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+
+  if (args.smtp !== null) {
+    const smtp = await startSmtpServer({ port: args.smtp, rtt: args.rtt });
+    console.log(`📧 Lokálny SMTP server na 127.0.0.1:${smtp.port} (rtt ${args.rtt} ms), Ctrl+C ukončí`);
+    setInterval(() => console.log(`   ${JSON.stringify(smtp.stats)}`), 10000).unref();
+    return;
+  }
+
+  const nodemailer = require('nodemailer');
+  const smtp = await startSmtpServer({ rtt: args.rtt });
+  const attachment = Buffer.alloc(args.attachmentKb * 1024, 'PDF ');
+  const options = { messages: args.messages, concurrency: args.concurrency, poolSize: args.poolSize, attachment };
+
+  const report = {
+    meta: {
+      timestamp: new Date().toISOString(),
+      node: process.version,
+      nodemailer: require('nodemailer/package.json').version,
+      rttMs: args.rtt,
+      attachmentKb: args.attachmentKb,
+      concurrency: args.concurrency,
+      poolSize: args.poolSize
+    },
+    pooled: await runScenario(nodemailer, smtp, { ...options, pool: true }),
+    unpooled: await runScenario(nodemailer, smtp, { ...options, pool: false })
+  };
+  report.speedup = Math.round(report.pooled.messagesPerSecond / report.unpooled.messagesPerSecond * 100) / 100;
+
+  smtp.server.close();
+  console.log(JSON.stringify(report, null, 2));
+}
+
+main().catch((err) => {
+  console.error('❌', err.message);
+  process.exit(1);
+});
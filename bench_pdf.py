@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark PDF generátora pre OddlženieOnline.sk
+Generuje syntetické formuláre rôznej veľkosti a meria čas, pamäť a veľkosť výstupu.
+
+Použitie:
+    python3 bench_pdf.py                       # všetky profily, JSON na stdout
+    python3 bench_pdf.py --profiles small large --repeat 5 --out bench.json
+    python3 bench_pdf.py --baseline bench.json # porovnanie s predchádzajúcim behom
+    python3 bench_pdf.py --sizes               # len veľkosti: predvolený vs. kompaktný profil
+"""
+
+import argparse, io, json, os, platform, resource, subprocess, sys, tempfile, time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Profil -> (počet riadkov v každej dynamickej skupine, dĺžka voľných textov v znakoch,
+# dĺžka textových polí riadkov alebo None = krátke reálne hodnoty)
+PROFILES = {
+    'small': (1, 200, None),
+    'medium': (10, 1000, None),
+    'large': (100, 4000, None),
+    'xlarge': (300, 10000, None),
+    # Každé textové pole riadku na limite schémy (max_length): riadok hustej tabuľky je vyšší ako strana
+    'long_fields': (3, 1000, 1000),
+}
+
+LOREM = ('Dlh vznikol po strate zamestnania, keď som si na splátky hypotéky a spotrebného úveru '
+         'požičiaval od ďalších veriteľov & splácal jeden úver druhým <bez> možnosti refinancovania. ')
+
+
+def _text(length):
+    return (LOREM * (length // len(LOREM) + 1))[:length]
+
+
+def make_payload(rows, text_len, field_len=None):
+    """Synthetic form payload with `rows` entries in every dynamic group and long free-text fields.
+    With field_len every text field of the group rows is that long too."""
+    data = {
+        'meno': 'Ján', 'priezvisko': 'Nováček', 'titul': 'Ing.', 'datumNarodenia': '1980-05-17',
+        'rodneCislo': '800517/1234', 'ulica': 'Štúrova', 'cisloDomu': '12', 'psc': '94901',
+        'obec': 'Nitra', 'telefon': '+421900123456', 'email': 'jan.novacek@example.sk',
+        'vzdelanie': 'úplné stredné odborné', 'vzdelanieRok': '1999', 'vzdelanieOdbor': 'strojárstvo',
+        'vzdelanieSkaola': 'SPŠ Nitra', 'jazyky': 'slovenský, anglický (A2)', 'vodicak': 'Áno',
+        'vodicakTyp': 'B', 'zdravotnyStav': _text(text_len // 4), 'soc_zamestanany': 'on',
+        'soc_szco': 'on', 'ico': '12345678', 'rodinnyStav': 'ženatý', 'bsm': 'Áno',
+        'vydaj_byvanie': '450', 'vydaj_strava': '250', 'vydaj_dlhy': '300',
+        'vznikDlhov': _text(text_len), 'mojeUcasti': _text(text_len // 8),
+        'ineMajetkoveHodnoty': _text(text_len // 4), 'zabezpPrava': _text(text_len // 8),
+        'histIne': _text(text_len // 4), 'obydlieTyp': 'uplatnujem',
+        'obydlieVyber': 'Byt|1|Byt 3+1, Štúrova 12, Nitra', 'obydlieBSM': 'Áno',
+    }
+    groups = {
+        'praca': {'od': '2005', 'do': '2019', 'zamestnavatel': 'Strojárne Nitra a.s.', 'pozicia': 'zámočník'},
+        'prijem': {'suma': '820', 'zdroj': 'mzda'},
+        'dom': {'meno': 'Mária Nováčková', 'datnar': '1982-03-04', 'vztah': 'manželka',
+                'soc_zamestanany': 'on'},
+        'blizka': {'meno': 'Peter Nováček', 'vztah': 'brat', 'adresa': 'Hlavná 5, 010 01 Žilina'},
+        'p': {'lv': '1234', 'obec': 'Nitra', 'ku': 'Chrenová', 'parcela': '455/12', 'vymera': '650',
+              'druh': 'záhrada', 'hodnota': '15000', 'podiel': '1/2'},
+        's': {'lv': '1234', 'obec': 'Nitra', 'ku': 'Chrenová', 'supisne': '2211', 'orient': '12',
+              'parcela': '455/11', 'popis': 'rodinný dom', 'hodnota': '90000', 'podiel': '1/2'},
+        'b': {'lv': '5678', 'obec': 'Nitra', 'ku': 'Klokočina', 'vchod': '2', 'poschodie': '4',
+              'cislo': '17', 'supisne': '3301', 'orient': '8', 'parcela': '1200/4',
+              'druh': 'zastavaná plocha', 'popisStavby': 'bytový dom', 'podielSpoloc': '6512/450000',
+              'popisBytu': '3-izbový byt', 'hodnota': '110000', 'podiel': '1/1'},
+        'h': {'popis': 'osobné motorové vozidlo Škoda Octavia', 'vin': 'TMBJJ7NE1J0123456',
+              'spz': 'NR123AB', 'kde': 'Nitra', 'hodnota': '4500'},
+        'ucet': {'iban': 'SK3112000000198742637541', 'banka': 'Všeobecná úverová banka, a.s.',
+                 'zostatok': '12,40'},
+        'hp': {'lv': '999', 'obec': 'Levice', 'ku': 'Levice', 'parcela': '77/1', 'vymera': '300',
+               'druh': 'orná pôda', 'hodnota': '3000', 'podiel': '1/1'},
+        'hs': {'lv': '999', 'obec': 'Levice', 'ku': 'Levice', 'supisne': '12', 'orient': '3',
+               'parcela': '77/2', 'popis': 'garáž', 'hodnota': '6000', 'podiel': '1/1'},
+        'hb': {'lv': '888', 'obec': 'Levice', 'ku': 'Levice', 'cislo': '5', 'popisBytu': '1-izbový byt',
+               'hodnota': '45000', 'podiel': '1/1'},
+        'hh': {'popis': 'motocykel Jawa 350', 'vin': 'JAWA350123', 'spz': 'LV456CD', 'kde': 'predaný',
+               'hodnota': '1200'},
+        'ver': {'nazov': 'Slovenská sporiteľňa, a.s.', 'ico': '00151653', 'ulica': 'Tomášikova',
+                'supisne': '48', 'obec': 'Bratislava', 'psc': '83237', 'stat': 'SR'},
+    }
+    for prefix, fields in groups.items():
+        if field_len:
+            fields = {field: value if field == 'datnar' or field.startswith('soc_') else _text(field_len)
+                      for field, value in fields.items()}
+        for i in range(rows):
+            for field, value in fields.items():
+                numbered = field in ('nazov', 'popis', 'meno') and not field_len
+                data[f'{prefix}_{field}_{i}'] = f'{value} {i + 1}' if numbered else value
+    return data
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _peak_rss_kb():
+    # ru_maxrss je na Linuxe v kB, na macOS v bajtoch
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def bench_warm(data, repeat):
+    """Time every generate_* method and generate_all_bytes in this (already warm) process"""
+    import pdf_generator
+    result = {'documents': {}}
+    for key, (_, method) in pdf_generator.DOCUMENTS.items():
+        times, size = [], 0
+        for _ in range(repeat):
+            buf = io.BytesIO()
+            elapsed, _ = _timed(lambda: getattr(pdf_generator.PDFGenerator(data), method)(buf))
+            times.append(elapsed)
+            size = len(buf.getvalue())
+        result['documents'][key] = {'seconds_min': min(times), 'seconds_median': sorted(times)[len(times) // 2],
+                                    'bytes': size}
+    times = [_timed(lambda: pdf_generator.PDFGenerator(data).generate_all_bytes())[0] for _ in range(repeat)]
+    result['generate_all'] = {'seconds_min': min(times), 'seconds_median': sorted(times)[len(times) // 2]}
+    result['bytes_total'] = sum(d['bytes'] for d in result['documents'].values())
+    result['peak_rss_kb'] = _peak_rss_kb()
+    return result
+
+
+def bench_sizes(data):
+    """Bytes of every document (and the merged PDF) in the default and the compact output profile"""
+    import pdf_generator
+    sizes = {}
+    for compact in (False, True):
+        gen = pdf_generator.PDFGenerator(data, signature_date='01.01.2025', compact=compact)
+        pdfs = gen.generate_all_bytes()
+        names = gen.file_names()
+        row = {key: len(pdfs[names[key]]) for key in pdf_generator.DOCUMENTS}
+        row['merged'] = sum(len(b) for b in gen.generate_all_bytes(merged=True).values())
+        sizes['compact' if compact else 'default'] = row
+    result = {'documents': {}}
+    for key, before in sizes['default'].items():
+        after = sizes['compact'][key]
+        result['documents'][key] = {'bytes_default': before, 'bytes_compact': after,
+                                    'saved_pct': round(100 * (1 - after / before), 1)}
+    before = sum(d['bytes_default'] for k, d in result['documents'].items() if k != 'merged')
+    after = sum(d['bytes_compact'] for k, d in result['documents'].items() if k != 'merged')
+    result['bytes_total_default'] = before
+    result['bytes_total_compact'] = after
+    result['saved_pct'] = round(100 * (1 - after / before), 1)
+    return result
+
+
+def bench_cold(profile, font_cache=None):
+    """Render one payload in a fresh interpreter, including imports and font registration
+    (from the pickled font cache at font_cache if given)"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--cold-child', profile]
+    env = dict(os.environ)
+    env.pop('PDF_FONT_CACHE', None)
+    if font_cache:
+        env['PDF_FONT_CACHE'] = font_cache
+    elapsed, proc = _timed(lambda: subprocess.run(cmd, capture_output=True, check=True, env=env))
+    child = json.loads(proc.stdout)
+    child['seconds_process'] = elapsed
+    return child
+
+
+def bench_cold_font_cache(profile):
+    """bench_cold with a font cache primed by a previous process, as a restarted worker sees it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fonts.pickle')
+        subprocess.run([sys.executable, '-c', 'import pdf_generator; pdf_generator.load_reportlab()'],
+                       cwd=HERE, env={**os.environ, 'PDF_FONT_CACHE': path}, check=True)
+        return bench_cold(profile, font_cache=path)
+
+
+def _cold_child(profile):
+    """Entry point of the process started by bench_cold; prints its own measurements as JSON"""
+    import_seconds, pdf_generator = _timed(lambda: __import__('pdf_generator'))
+    trace = pdf_generator.RenderTrace()
+    load_seconds, _ = _timed(lambda: pdf_generator.load_reportlab(trace))
+    data = make_payload(*PROFILES[profile])
+    render_seconds, pdfs = _timed(lambda: pdf_generator.PDFGenerator(data).generate_all_bytes())
+    json.dump({'seconds_import': import_seconds, 'import_budget_seconds': pdf_generator.IMPORT_BUDGET_SECONDS,
+               'seconds_reportlab': load_seconds, 'seconds_fonts': pdf_generator.FONT_REGISTRATION_SECONDS,
+               'font_cache': trace.spans[0]['font_cache'], 'seconds_render': render_seconds,
+               'bytes_total': sum(len(b) for b in pdfs.values()), 'peak_rss_kb': _peak_rss_kb(),
+               'rss_budget_kb': pdf_generator.rss_budget_kb(data)}, sys.stdout)
+
+
+def bench_layouts(data, repeat):
+    """doc.build time and page count of every DENSE_DOCUMENTS document, per-item vs dense layout"""
+    import pdf_generator
+    result = {}
+    for key in pdf_generator.DENSE_DOCUMENTS:
+        method = pdf_generator.DOCUMENTS[key][1]
+        row = {}
+        for layout, dense in (('per_item', ()), ('dense', (key,))):
+            times, pages = [], 0
+            for _ in range(repeat):
+                trace = pdf_generator.RenderTrace()
+                getattr(pdf_generator.PDFGenerator(data, trace=trace, dense=dense), method)(io.BytesIO())
+                build = next(span for span in trace.spans if span['name'] == f'{key}.build')
+                times.append(build['seconds'])
+                pages = build['pages']
+            row[layout] = {'build_seconds_min': min(times), 'pages': pages}
+        result[key] = row
+    return result
+
+
+def bench_previews(data, repeat):
+    """PDFGenerator.preview time of every document: first page only, whole document, and a repeat
+    of the whole document from a MemoryRenderCache (the warm-worker path of /api/preview)"""
+    import pdf_generator
+    result = {}
+    for key in pdf_generator.DOCUMENTS:
+        row = {}
+        for variant, kwargs in (('first_page', {'max_pages': 1}), ('full', {})):
+            times = [_timed(lambda: pdf_generator.PDFGenerator(data).preview(key, **kwargs))[0] for _ in range(repeat)]
+            row[f'{variant}_seconds_min'] = min(times)
+        cache = pdf_generator.MemoryRenderCache()
+        pdf_generator.PDFGenerator(data).preview(key, cache=cache)
+        times = [_timed(lambda: pdf_generator.PDFGenerator(data).preview(key, cache=cache))[0] for _ in range(repeat)]
+        row['cached_seconds_min'] = min(times)
+        result[key] = row
+    return result
+
+
+def run_sizes(profiles):
+    """Size-only report: per profile and document, default vs compact output"""
+    return {'profiles': {profile: bench_sizes(make_payload(*PROFILES[profile])) for profile in profiles}}
+
+
+def run(profiles, repeat):
+    import reportlab
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'reportlab': reportlab.Version,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'profiles': {},
+    }
+    for profile in profiles:
+        rows, text_len, field_len = PROFILES[profile]
+        data = make_payload(rows, text_len, field_len)
+        report['profiles'][profile] = {
+            'rows_per_group': rows,
+            'text_len': text_len,
+            'field_len': field_len,
+            'payload_keys': len(data),
+            'cold': bench_cold(profile),
+            'cold_font_cache': bench_cold_font_cache(profile),
+            'warm': bench_warm(data, repeat),
+            'sizes': bench_sizes(data),
+            'layouts': bench_layouts(data, repeat),
+            'previews': bench_previews(data, repeat),
+        }
+    return report
+
+
+def over_rss_budget(report):
+    """Profiles whose cold render exceeded the documented RSS cap (pdf_generator.rss_budget_kb)"""
+    return [{'profile': profile, 'peak_rss_kb': cur['cold']['peak_rss_kb'],
+             'rss_budget_kb': cur['cold']['rss_budget_kb']}
+            for profile, cur in report['profiles'].items()
+            if cur['cold']['peak_rss_kb'] > cur['cold']['rss_budget_kb']]
+
+
+def over_import_budget(report):
+    """Profiles whose cold start spent longer importing pdf_generator than IMPORT_BUDGET_SECONDS"""
+    return [{'profile': profile, 'seconds_import': cur['cold']['seconds_import'],
+             'import_budget_seconds': cur['cold']['import_budget_seconds']}
+            for profile, cur in report['profiles'].items()
+            if cur['cold']['seconds_import'] > cur['cold']['import_budget_seconds']]
+
+
+def compare(report, baseline, tolerance):
+    """List of regressions where warm generate_all or total size grew by more than `tolerance`"""
+    regressions = []
+    for profile, cur in report['profiles'].items():
+        old = baseline.get('profiles', {}).get(profile)
+        if not old:
+            continue
+        checks = [
+            ('warm.generate_all.seconds_min', cur['warm']['generate_all']['seconds_min'],
+             old['warm']['generate_all']['seconds_min']),
+            ('warm.bytes_total', cur['warm']['bytes_total'], old['warm']['bytes_total']),
+            ('sizes.bytes_total_compact', cur.get('sizes', {}).get('bytes_total_compact'),
+             old.get('sizes', {}).get('bytes_total_compact')),
+            ('cold.seconds_process', cur['cold']['seconds_process'], old['cold']['seconds_process']),
+        ]
+        for name, now, before in checks:
+            if before and now > before * (1 + tolerance):
+                regressions.append({'profile': profile, 'metric': name, 'baseline': before, 'current': now})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark PDF generátora')
+    parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+    parser.add_argument('--repeat', type=int, default=3, help='Počet opakovaní teplého merania')
+    parser.add_argument('--out', help='Uložiť JSON report do súboru (inak stdout)')
+    parser.add_argument('--baseline', help='JSON report z predchádzajúceho behu na porovnanie')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+        help='Povolený relatívny nárast oproti baseline (predvolené 0.2 = 20 %%)')
+    parser.add_argument('--sizes', action='store_true',
+        help='Iba porovnanie veľkostí PDF: predvolený vs. kompaktný profil (bez merania času)')
+    parser.add_argument('--cold-child', metavar='PROFILE', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, HERE)
+    if args.cold_child:
+        _cold_child(args.cold_child)
+        return 0
+
+    report = run_sizes(args.profiles) if args.sizes else run(args.profiles, args.repeat)
+    status = 0
+    if not args.sizes:
+        report['rss_over_budget'] = over_rss_budget(report)
+        report['import_over_budget'] = over_import_budget(report)
+        status = 1 if report['rss_over_budget'] or report['import_over_budget'] else 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare(report, json.load(f), args.tolerance)
+        status = 1 if report['regressions'] or status else 0
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+// form_validation.js - Validácia údajov formulára OddlženieOnline.sk podľa form_schema.json
+// Rovnaké kontroly ako FormSchema.compile v pdf_generator.py, aby zlé údaje
+// skončili 400-kou hneď a nie až v PDF workeri po zaradení do fronty.
+// Bez závislostí na npm balíkoch: používa ho server.js aj testy (tests/test_schema.py).
+
+// Polia a limity formulára, rovnaký súbor číta aj pdf_generator.py
+const FORM_SCHEMA = require('./form_schema.json');
+
+const ROW_KEY_RE = /^([^_]+)_(.+)_(0|[1-9]\d*)$/;
+const ISO_DATE_RE = /^(\d{4})-(\d{2})-(\d{2})$/;
+const LOCAL_DATE_RE = /^\d{1,2}\.\s?\d{1,2}\.\s?\d{4}$/;
+
+function fieldSpec(spec) {
+  const s = typeof spec === 'string' ? { type: spec } : spec;
+  return { type: s.type, maxLength: s.max_length || FORM_SCHEMA.limits.max_length };
+}
+
+const FORM_FIELDS = new Map(Object.entries(FORM_SCHEMA.fields).map(([name, spec]) => [name, fieldSpec(spec)]));
+const FORM_GROUPS = new Map(Object.entries(FORM_SCHEMA.groups).map(([prefix, fields]) =>
+  [prefix, new Map(Object.entries(fields).map(([name, spec]) => [name, fieldSpec(spec)]))]));
+
+function validDate(text) {
+  const m = ISO_DATE_RE.exec(text);
+  if (!m) return LOCAL_DATE_RE.test(text);
+  const [y, mo, d] = [Number(m[1]), Number(m[2]), Number(m[3])];
+  const date = new Date(Date.UTC(2000, mo - 1, d));
+  date.setUTCFullYear(y);
+  return y >= 1 && date.getUTCMonth() === mo - 1 && date.getUTCDate() === d;
+}
+
+function fieldError(field, raw) {
+  if (raw === null || raw === undefined) return null;
+  if (!['string', 'number', 'boolean'].includes(typeof raw)) {
+    return `očakáva sa text, nie ${Array.isArray(raw) ? 'list' : typeof raw}`;
+  }
+  if (raw === false) return null;
+  const text = String(raw).trim();
+  if (text.length > field.maxLength) return `najviac ${field.maxLength} znakov`;
+  if (field.type === 'date' && text && !validDate(text)) {
+    return ISO_DATE_RE.test(text) ? `neexistujúci dátum ${text}` : 'dátum musí byť RRRR-MM-DD alebo D.M.RRRR';
+  }
+  return null;
+}
+
+// Zoznam chýb '<kľúč>: <problém>', prázdny pre platné údaje.
+// partial = rozpracovaný koncept, povinné polia ešte môžu chýbať.
+function validateForm(data, { partial = false } = {}) {
+  const limits = FORM_SCHEMA.limits;
+  if (!data || typeof data !== 'object' || Array.isArray(data)) {
+    return [`payload: očakáva sa objekt, nie ${Array.isArray(data) ? 'list' : typeof data}`];
+  }
+  const keys = Object.keys(data);
+  if (keys.length > limits.max_keys) {
+    return [`payload: ${keys.length} polí, najviac ${limits.max_keys}`];
+  }
+
+  const errors = [];
+  const missing = partial ? [] : FORM_SCHEMA.required.filter(name => typeof data[name] !== 'string' || !data[name].trim());
+  if (missing.length) errors.push(`chýbajúce povinné údaje: ${missing.join(', ')}`);
+
+  const rows = new Map();
+  for (const key of keys) {
+    const raw = data[key];
+    const field = FORM_FIELDS.get(key);
+    let error = null;
+    if (field) {
+      error = fieldError(field, raw);
+    } else {
+      const m = ROW_KEY_RE.exec(key);
+      const group = m && FORM_GROUPS.get(m[1]);
+      if (group && Number(m[3]) <= limits.max_index) {
+        if (!rows.has(m[1])) rows.set(m[1], new Set());
+        rows.get(m[1]).add(m[3]);
+        const rowField = group.get(m[2]);
+        if (rowField) error = fieldError(rowField, raw);
+        else if (typeof raw === 'string' && raw.length > limits.max_value_length) {
+          error = `najviac ${limits.max_value_length} znakov`;
+        }
+      } else if (FORM_GROUPS.has(key.split('_', 1)[0])) {
+        error = `očakáva sa <skupina>_<pole>_<index 0-${limits.max_index}>`;
+      } else if (typeof raw === 'string' && raw.length > limits.max_value_length) {
+        error = `najviac ${limits.max_value_length} znakov`;
+      }
+    }
+    if (error) errors.push(`${key}: ${error}`);
+  }
+  for (const [prefix, indexes] of rows) {
+    if (indexes.size > limits.max_rows) errors.push(`${prefix}: ${indexes.size} riadkov, najviac ${limits.max_rows}`);
+  }
+  return errors;
+}
+
+module.exports = { FORM_SCHEMA, validateForm };
@@ -5,25 +5,840 @@ PDF Generator pre OddlženieOnline.sk
 Generuje 4 dokumenty pre osobný bankrot - kompatibilné s HTML formulárom
 """
 
+# Iba ľahké konštanty ReportLabu; platypus, farby a fonty (~0.2 s) načíta až load_reportlab
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import json, sys, re
+from reportlab.lib.enums import TA_CENTER
+import argparse, copy, hashlib, io, json, mmap, os, pickle, sys, re, time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager, nullcontext
+from types import MappingProxyType
 from datetime import datetime
 
-try:
-    pdfmetrics.registerFont(TTFont('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
-    pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'))
-    FONT = 'DejaVuSans'
-    FONT_BOLD = 'DejaVuSans-Bold'
-except:
-    FONT = 'Helvetica'
-    FONT_BOLD = 'Helvetica-Bold'
+FONT_FILES = {
+    'DejaVuSans': '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    'DejaVuSans-Bold': '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+}
+# Cesta k pickle cache rozparsovaných fontov (--font-cache), prázdne = vypnutá
+FONT_CACHE_ENV = 'PDF_FONT_CACHE'
+
+# Nastaví load_reportlab: DejaVu, alebo Helvetica ak DejaVu nie je k dispozícii
+FONT = FONT_BOLD = None
+FONT_REGISTRATION_SECONDS = 0.0
+_reportlab_loaded = False
+
+# Zvýšiť pri každej zmene šablón dokumentov, zneplatní to cache renderov
+GENERATOR_VERSION = '2.2.1'
+
+class RenderTrace:
+    """Opt-in per-stage instrumentation: wall time and net allocated memory blocks of each phase,
+    plus phase metadata such as row and page counts"""
+
+    def __init__(self, **meta):
+        self.meta = meta
+        self.spans = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **meta):
+        """Time a phase; the yielded dict can be filled with extra metadata while it runs"""
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield meta
+        finally:
+            self.spans.append({'name': name, 'seconds': round(time.perf_counter() - start, 6),
+                               'alloc_blocks': sys.getallocatedblocks() - blocks, **meta})
+
+    def to_dict(self):
+        return {**self.meta, 'total_seconds': round(time.perf_counter() - self._start, 6),
+                'font_registration_seconds': round(FONT_REGISTRATION_SECONDS, 6),
+                'spans': self.spans}
+
+    def emit(self, target):
+        """Append the trace as one JSON line to target: '-' for stderr, otherwise a file path"""
+        line = json.dumps(self.to_dict(), ensure_ascii=False) + '\n'
+        if target == '-':
+            sys.stderr.write(line)
+            sys.stderr.flush()
+        else:
+            with open(target, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+class _NullTrace:
+    """Stand-in used when tracing is off, so instrumented code pays almost nothing"""
+    spans = None
+
+    def span(self, name, **meta):
+        return nullcontext(meta)
+
+
+NULL_TRACE = _NullTrace()
+
+
+def load_reportlab(trace=NULL_TRACE):
+    """Import the ReportLab rendering stack and register the fonts, once per process.
+
+    Kept out of module import so --help, --validate and callers that only need esc
+    start in a fraction of the time; everything that lays out or draws calls
+    this first (get_style_registry does). The names are bound as module globals, so the
+    rendering code below uses them as if they were imported at the top.
+    """
+    global _reportlab_loaded, colors, pdfmetrics, rl_config, _FUZZ, TTFont, ParagraphStyle, \
+        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Flowable, \
+        StaticParagraph, _Bookmark
+    if _reportlab_loaded:
+        return
+    with trace.span('reportlab') as meta:
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Flowable
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab import rl_config
+        from reportlab.rl_config import _FUZZ
+
+        class StaticParagraph(Paragraph):
+            """Paragraph with constant text that remembers its line breaks per available width.
+
+            Masters are kept for the whole process (static_paragraph) and stories get shallow copies:
+            the parsed fragments and the remembered breaks are shared, layout state of one placement
+            stays on its copy.
+            """
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self._wraps = {}
+
+            def wrap(self, availWidth, availHeight):
+                hit = self._wraps.get(availWidth)
+                if hit is not None:
+                    self.width, self.height, self._wrapWidths, self.blPara = hit
+                    return self.width, self.height
+                size = super().wrap(availWidth, availHeight)
+                if availWidth >= _FUZZ:
+                    self._wraps[availWidth] = (self.width, self.height, self._wrapWidths, self.blPara)
+                return size
+
+        class _Bookmark(Flowable):
+            """Zero-size flowable that starts a top-level PDF outline entry where it is drawn"""
+
+            def __init__(self, key, title):
+                Flowable.__init__(self)
+                self.key = key
+                self.title = title
+
+            def wrap(self, availWidth, availHeight):
+                return 0, 0
+
+            def draw(self):
+                self.canv.bookmarkPage(self.key)
+                self.canv.addOutlineEntry(self.title, self.key, level=0)
+                self.canv.showOutline()
+
+        meta['font_cache'] = _register_fonts()
+    _reportlab_loaded = True
+
+
+def _register_fonts():
+    """Register FONT_FILES (from the pickle cache when FONT_CACHE_ENV names one) and set FONT,
+    FONT_BOLD and FONT_REGISTRATION_SECONDS; returns 'hit', 'miss' or None without a cache"""
+    global FONT, FONT_BOLD, FONT_REGISTRATION_SECONDS
+    start = time.perf_counter()
+    cache_path = os.environ.get(FONT_CACHE_ENV)
+    status = None
+    try:
+        fonts = _load_font_cache(cache_path) if cache_path else None
+        status = cache_path and ('miss' if fonts is None else 'hit')
+        if fonts is None:
+            fonts = [TTFont(name, path) for name, path in FONT_FILES.items()]
+            for font in fonts:
+                _map_font_file(font.face)
+            if cache_path:
+                _save_font_cache(cache_path, fonts)
+        for font in fonts:
+            pdfmetrics.registerFont(font)
+        FONT, FONT_BOLD = 'DejaVuSans', 'DejaVuSans-Bold'
+    except Exception:
+        FONT, FONT_BOLD = 'Helvetica', 'Helvetica-Bold'
+    FONT_REGISTRATION_SECONDS = time.perf_counter() - start
+    return status
+
+
+def _map_font_file(face):
+    """Read the font tables from a read-only mapping of the file instead of a private copy:
+    the pages are shared by every worker process through the page cache"""
+    with open(face.filename, 'rb') as f:
+        face._ttf_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _font_cache_key():
+    """Identity of the parsed fonts: a changed font file, ReportLab or Python invalidates the cache"""
+    import reportlab
+    files = [(path, os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in FONT_FILES.values()]
+    return [reportlab.Version, sys.version_info[:2], files]
+
+
+def _load_font_cache(path):
+    """TTFont objects from the pickle cache at path, or None when it is missing or stale.
+
+    The cache holds the parsed metrics; the font tables themselves are mapped from the
+    TTF files (_map_font_file).
+    """
+    try:
+        with open(path, 'rb') as f:
+            key, fonts = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+        return None
+    if key != _font_cache_key():
+        return None
+    from reportlab.pdfbase.ttfonts import TTFontFace
+    from weakref import WeakKeyDictionary
+    loaded = []
+    for font_state, face_state in fonts:
+        face = TTFontFace.__new__(TTFontFace)
+        face.__dict__.update(face_state)
+        _map_font_file(face)
+        # Rovnaký prepočet na 1000 jednotiek ako TTFontFile.extractInfo (lambda sa nedá picklovať)
+        scale = 1000 / face.unitsPerEm
+        face._pdfScale = (lambda x: x) if face.unitsPerEm == 1000 else (lambda x: x * scale)
+        font = TTFont.__new__(TTFont)
+        font.__dict__.update(font_state, face=face, state=WeakKeyDictionary())
+        loaded.append(font)
+    return loaded
+
+
+def _save_font_cache(path, fonts):
+    """Pickle the parsed fonts to path atomically; a failed write only costs the next start a parse"""
+    fonts = [({k: v for k, v in vars(font).items() if k not in ('face', 'state')},
+              {k: v for k, v in vars(font.face).items() if k not in ('_pdfScale', '_ttf_data')})
+             for font in fonts]
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            pickle.dump((_font_cache_key(), fonts), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f'⚠️ Cache fontov sa nedá zapísať ({path}): {e}', file=sys.stderr)
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+# Farby dokumentov, colors.HexColor z nich robí až _build_style_registry
+COLOR_TEXT = '#1e293b'
+COLOR_SUBTITLE = '#475569'
+COLOR_NAVY = '#1e3a5f'
+COLOR_BODY = '#334155'
+COLOR_MUTED = '#64748b'
+COLOR_GRID = '#e2e8f0'
+COLOR_HEADER_BG = '#e0e7ff'
+
+StyleRegistry = namedtuple('StyleRegistry', [
+    'paragraphs',          # name -> ParagraphStyle (read-only mapping)
+    'header_table',        # _header_table
+    'field_table',         # _field_table
+    'item_header',         # _item_header
+    'list_table',          # praca
+    'list_table_compact',  # prijem, blizka
+    'dense_table',         # _dense_table
+])
+
+_style_registry = None
+
+def get_style_registry(trace=NULL_TRACE):
+    """Paragraph and table styles shared by every PDFGenerator in this process, built on first use"""
+    global _style_registry
+    load_reportlab(trace)
+    with trace.span('styles') as meta:
+        meta['cached'] = _style_registry is not None
+        if _style_registry is None:
+            _style_registry = _build_style_registry()
+    return _style_registry
+
+def _build_style_registry():
+    text, subtitle, navy, body, muted, grid, header_bg = map(colors.HexColor, (
+        COLOR_TEXT, COLOR_SUBTITLE, COLOR_NAVY, COLOR_BODY, COLOR_MUTED, COLOR_GRID, COLOR_HEADER_BG))
+    paragraphs = {s.name: s for s in [
+        ParagraphStyle(name='DocTitle', fontName=FONT_BOLD, fontSize=13,
+            textColor=text, spaceAfter=6, alignment=TA_CENTER, leading=16),
+        ParagraphStyle(name='DocSubtitle', fontName=FONT, fontSize=9,
+            textColor=subtitle, spaceAfter=16, alignment=TA_CENTER),
+        ParagraphStyle(name='SectionH', fontName=FONT_BOLD, fontSize=10,
+            textColor=navy, spaceAfter=8, spaceBefore=14),
+        ParagraphStyle(name='SubH', fontName=FONT_BOLD, fontSize=9,
+            textColor=body, spaceAfter=6, spaceBefore=8),
+        ParagraphStyle(name='Body', fontName=FONT, fontSize=9,
+            textColor=body, spaceAfter=4, leading=13),
+        ParagraphStyle(name='BodyBold', fontName=FONT_BOLD, fontSize=9,
+            textColor=text, spaceAfter=4, leading=13),
+        ParagraphStyle(name='Small', fontName=FONT, fontSize=8,
+            textColor=muted, spaceAfter=3, leading=11),
+        ParagraphStyle(name='Legal', fontName=FONT, fontSize=8,
+            textColor=subtitle, spaceAfter=4, leading=12),
+        ParagraphStyle(name='TblLabel', fontName=FONT_BOLD, fontSize=9,
+            textColor=text, leading=12),
+        ParagraphStyle(name='TblValue', fontName=FONT, fontSize=9,
+            textColor=text, leading=12),
+        ParagraphStyle(name='TblDenseHead', fontName=FONT_BOLD, fontSize=8,
+            textColor=navy, leading=10),
+        ParagraphStyle(name='TblDense', fontName=FONT, fontSize=8,
+            textColor=text, leading=10),
+    ]}
+    return StyleRegistry(
+        paragraphs=MappingProxyType(paragraphs),
+        header_table=TableStyle([
+            ('FONT', (0,0),(0,-1), FONT_BOLD, 9),
+            ('FONT', (1,0),(1,-1), FONT, 9),
+            ('TEXTCOLOR', (0,0),(-1,-1), text),
+            ('VALIGN', (0,0),(-1,-1), 'TOP'),
+            ('BOTTOMPADDING', (0,0),(-1,-1), 4),
+            ('TOPPADDING', (0,0),(-1,-1), 2),
+        ]),
+        field_table=TableStyle([
+            # Pre bunky bez Paragraphu (_table_cell): rovnaké písmo, riadkovanie a farba ako TblLabel/TblValue
+            ('FONT', (0,0),(0,-1), FONT_BOLD, 9, 12),
+            ('FONT', (1,0),(1,-1), FONT, 9, 12),
+            ('TEXTCOLOR', (0,0),(-1,-1), text),
+            ('VALIGN', (0,0),(-1,-1), 'TOP'),
+            ('BOTTOMPADDING', (0,0),(-1,-1), 5),
+            ('TOPPADDING', (0,0),(-1,-1), 3),
+            ('GRID', (0,0),(-1,-1), 0.5, grid),
+        ]),
+        item_header=TableStyle([
+            ('FONT', (0,0),(-1,-1), FONT_BOLD, 9),
+            ('BACKGROUND', (0,0),(-1,-1), header_bg),
+            ('TEXTCOLOR', (0,0),(-1,-1), navy),
+            ('BOTTOMPADDING', (0,0),(-1,-1), 6),
+            ('TOPPADDING', (0,0),(-1,-1), 6),
+            ('LEFTPADDING', (0,0),(-1,-1), 8),
+        ]),
+        list_table=TableStyle([
+            ('FONT', (0,0),(-1,0), FONT_BOLD, 9),
+            ('FONT', (0,1),(-1,-1), FONT, 9),
+            ('BACKGROUND', (0,0),(-1,0), header_bg),
+            ('GRID', (0,0),(-1,-1), 0.5, grid),
+            ('VALIGN', (0,0),(-1,-1), 'TOP'),
+            ('BOTTOMPADDING', (0,0),(-1,-1), 5),
+            ('TOPPADDING', (0,0),(-1,-1), 3),
+        ]),
+        list_table_compact=TableStyle([
+            ('FONT',(0,0),(-1,0),FONT_BOLD,9),('FONT',(0,1),(-1,-1),FONT,9),
+            ('BACKGROUND',(0,0),(-1,0),header_bg),
+            ('GRID',(0,0),(-1,-1),0.5,grid),
+            ('BOTTOMPADDING',(0,0),(-1,-1),4),('TOPPADDING',(0,0),(-1,-1),3),
+        ]),
+        dense_table=TableStyle([
+            ('FONT', (0,0),(0,-1), FONT, 8),
+            ('TEXTCOLOR', (0,0),(0,-1), text),
+            ('BACKGROUND', (0,0),(-1,0), header_bg),
+            ('GRID', (0,0),(-1,-1), 0.5, grid),
+            ('VALIGN', (0,0),(-1,-1), 'TOP'),
+            ('BOTTOMPADDING', (0,0),(-1,-1), 3),
+            ('TOPPADDING', (0,0),(-1,-1), 2),
+            ('LEFTPADDING', (0,0),(-1,-1), 4),
+            ('RIGHTPADDING', (0,0),(-1,-1), 4),
+        ]),
+    )
+
+# Zaškrtávacie políčka sociálneho postavenia v životopise: pole formulára -> text
+SOCIAL_STATUS_LABELS = {
+    'soc_zamestanany': 'zamestnaný/á',
+    'soc_szco': 'samostatne zárobkovo činná osoba',
+    'soc_dochodok': 'poberateľ/-ka dôchodku',
+    'soc_nezamestnany': 'dobrovoľne nezamestnaný/á',
+    'soc_uchadzac': 'uchádzač/-ka o zamestnanie',
+    'soc_davky': 'poberateľ/-ka sociálnych dávok',
+    'soc_ine': 'iné',
+}
+
+# To isté pre osoby v spoločnej domácnosti (dom_soc_*_<i>), vypísané v jednom riadku
+HOUSEHOLD_STATUS_LABELS = {**SOCIAL_STATUS_LABELS, 'soc_szco': 'SZČO'}
+
+# Poradie a názvy súborov dokumentov: kľúč -> (prefix súboru, metóda PDFGenerator)
+DOCUMENTS = {
+    'zivotopis': ('Zivotopis', 'generate_zivotopis'),
+    'majetok': ('Majetok', 'generate_majetok'),
+    'historia': ('Majetok_Historia', 'generate_majetok_historia'),
+    'veritelia': ('Veritelia', 'generate_veritelia'),
+}
+
+# Záložky (outline) v spojenom PDF
+DOCUMENT_TITLES = {
+    'zivotopis': 'Životopis dlžníka',
+    'majetok': 'Zoznam majetku',
+    'historia': 'Zoznam majetku za posledné tri roky',
+    'veritelia': 'Zoznam veriteľov',
+}
+COMBINED_PREFIX = 'Dokumenty'
+
+# Dokumenty, ktoré vedia husté rozloženie: jedna tabuľka na skupinu namiesto tabuľky na položku
+DENSE_DOCUMENTS = ('majetok', 'historia', 'veritelia')
+
+# Stĺpce hustej tabuľky podľa druhu položky: (hlavička, šírka v cm, formát bunky). Formát sa plní
+# hodnotami z _<druh>_rows v poradí riadkov, {0} je prvé pole. Spolu so stĺpcom "č." 16 cm.
+DENSE_COLUMNS = {
+    'pozemok': (
+        ('LV / Obec / Katastrálne územie', 5.0, '{0}<br/>{1}<br/>{2}'),
+        ('Parcela / Výmera (m²) / Druh', 5.0, '{3}<br/>{4}<br/>{5}'),
+        ('Hodnota / Podiel', 5.0, '{6}<br/>{7}'),
+    ),
+    'stavba': (
+        ('LV / Obec / Katastrálne územie', 4.3, '{0}<br/>{1}<br/>{2}'),
+        ('Súpisné / orientačné č. / Parcela', 3.7, '{3} / {4}<br/>{5}'),
+        ('Popis stavby', 4.0, '{6}'),
+        ('Hodnota / Podiel', 3.0, '{7}<br/>{8}'),
+    ),
+    'byt': (
+        ('LV / Obec / Katastrálne územie', 3.4, '{0}<br/>{1}<br/>{2}'),
+        ('Vchod / Poschodie / Byt č.', 2.4, '{3} / {4} / {5}'),
+        ('Súpisné / orientačné č. / Parcela / Druh', 3.4, '{6} / {7}<br/>{8}<br/>{9}'),
+        ('Stavba / Podiel na spol. častiach / Byt', 3.6, '{10}<br/>{11}<br/>{12}'),
+        ('Hodnota / Podiel', 2.2, '{13}<br/>{14}'),
+    ),
+    'hist_byt': (
+        ('LV / Obec / Katastrálne územie', 3.8, '{0}<br/>{1}<br/>{2}'),
+        ('Vchod / Poschodie / Byt č.', 2.6, '{3} / {4} / {5}'),
+        ('Súpisné / orientačné č. / Parcela', 3.4, '{6} / {7}<br/>{8}'),
+        ('Popis bytu', 3.0, '{9}'),
+        ('Hodnota / Podiel', 2.2, '{10}<br/>{11}'),
+    ),
+    'hnutelna': (
+        ('Popis', 5.0, '{0}'),
+        ('Výrobné číslo / VIN / ŠPZ', 4.0, '{1}<br/>{2}'),
+        ('Kde sa nachádza', 3.5, '{3}'),
+        ('Hodnota', 2.5, '{4}'),
+    ),
+    'ucet': (
+        ('Číslo účtu / IBAN', 6.0, '{0}'),
+        ('Banka', 6.0, '{1}'),
+        ('Zostatok', 3.0, '{2}'),
+    ),
+    'veritel': (
+        ('Názov / Meno', 5.0, '{0}'),
+        ('IČO / Dátum narodenia', 3.0, '{1}'),
+        ('Adresa (trvalé bydlisko / sídlo)', 5.0, '{2} {3}<br/>{5} {4}'),
+        ('Štát', 2.0, '{6}'),
+    ),
+}
+DENSE_COLUMNS['hist_hnutelna'] = DENSE_COLUMNS['hnutelna']
+
+# Polia spoločnej hlavičky (_header_table) a názvov súborov
+HEADER_KEYS = ('meno', 'priezvisko', 'titul', 'datumNarodenia', 'rodneCislo', 'ulica', 'cisloDomu', 'psc', 'obec')
+
+# Kľúč dokumentu -> (skalárne polia, prefixy dynamických riadkov), ktoré dokument číta.
+# Pri zmene šablóny treba udržiavať aktuálne, inak cache vráti neaktuálny dokument.
+DOCUMENT_DEPENDENCIES = {
+    'zivotopis': (HEADER_KEYS + (
+        'telefon', 'email', 'vzdelanie', 'vzdelanieRok', 'vzdelanieOdbor', 'vzdelanieSkaola',
+        'dalsieVzdelanie', 'jazyky', 'vodicak', 'vodicakTyp', 'zdravotnyStav',
+        'soc_zamestanany', 'soc_szco', 'soc_dochodok', 'soc_nezamestnany', 'soc_uchadzac', 'soc_davky',
+        'soc_ine', 'ico', 'dochodokDruh', 'davkyDruh', 'inePostavenie', 'rodinnyStav', 'bsm',
+        'vydaj_byvanie', 'vydaj_strava', 'vydaj_hygiena', 'vydaj_zdravie', 'vydaj_deti', 'vydaj_poistne',
+        'vydaj_cestovne', 'vydaj_dlhy', 'vznikDlhov', 'mojeUcasti', 'blizkeUcasti',
+    ), ('praca', 'prijem', 'dom', 'blizka')),
+    'majetok': (HEADER_KEYS + (
+        'ineMajetkoveHodnoty', 'zabezpPrava', 'sudneSpory', 'obydlieTyp', 'obydlieVyber', 'obydlieBSM',
+    ), ('p', 's', 'b', 'h', 'ucet')),
+    'historia': (HEADER_KEYS + ('histIne', 'histZabezp', 'histSpory'), ('hp', 'hs', 'hb', 'hh')),
+    'veritelia': (HEADER_KEYS, ('ver',)),
+}
+# Spojené PDF (generate_combined) závisí od všetkého, od čoho závisia jednotlivé dokumenty
+DOCUMENT_DEPENDENCIES['combined'] = (
+    tuple(dict.fromkeys(k for scalars, _ in DOCUMENT_DEPENDENCIES.values() for k in scalars)),
+    tuple(p for _, prefixes in DOCUMENT_DEPENDENCIES.values() for p in prefixes),
+)
+
+_process_pool = None
+
+def _get_process_pool():
+    """Lazily created pool shared by all parallel renders in this process"""
+    global _process_pool
+    if _process_pool is None:
+        # concurrent.futures ťahá multiprocessing (~25 ms), väčšina procesov ho nepotrebuje
+        from concurrent.futures import ProcessPoolExecutor
+        _process_pool = ProcessPoolExecutor(max_workers=min(len(DOCUMENTS), os.cpu_count() or 1))
+    return _process_pool
+
+def _render_document(data, method, filename, options, traced=False):
+    """Process pool entry point: render one document in a worker process.
+    options are the parent's PDFGenerator.options. Returns (filename, spans)
+    so the parent can merge the worker's trace."""
+    trace = RenderTrace() if traced else None
+    getattr(PDFGenerator(data, trace=trace, **options), method)(filename)
+    return filename, trace and trace.spans
+
+def _render_document_bytes(data, method, options, traced=False):
+    """Process pool entry point: render one document in memory, returns (bytes, spans)"""
+    trace = RenderTrace() if traced else None
+    buf = io.BytesIO()
+    getattr(PDFGenerator(data, trace=trace, **options), method)(buf)
+    return buf.getvalue(), trace and trace.spans
+
+def write_frame(stream, header, blobs=()):
+    """Write one framed reply: a JSON header line listing blob sizes, then the raw blobs back to back"""
+    blobs = list(blobs)
+    header = dict(header)
+    if blobs:
+        header['files'] = [{'name': name, 'size': len(blob)} for name, blob in blobs]
+    stream.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+    for _, blob in blobs:
+        stream.write(blob)
+    stream.flush()
+
+def read_frame(stream):
+    """Read one frame written by write_frame, returns (header, {name: bytes}) or (None, None) at EOF"""
+    line = stream.readline()
+    if not line:
+        return None, None
+    header = json.loads(line)
+    return header, {f['name']: stream.read(f['size']) for f in header.get('files', [])}
+
+def document_payload(data, document):
+    """The part of the payload a document depends on, per DOCUMENT_DEPENDENCIES.
+
+    Only output-neutral normalization is applied: scalar keys that are None or '' are dropped,
+    since g() treats those exactly like missing keys.
+    """
+    scalars, prefixes = DOCUMENT_DEPENDENCIES[document]
+    subset = {k: data[k] for k in scalars if data.get(k) not in (None, '')}
+    for key, val in data.items():
+        m = ROW_KEY_RE.match(key)
+        if m and m.group(1) in prefixes:
+            subset[key] = val
+    return subset
+
+def render_cache_key(data, signature_date, document, compact=False, dense=()):
+    """Content address of one rendered document: generator version, form schema, document, output
+    profile, layout, signature date and the canonical form of the payload subset the document reads"""
+    canonical = json.dumps(document_payload(data, document), sort_keys=True, separators=(',', ':'),
+                           ensure_ascii=False)
+    variant = f'{document}:compact' if compact else document
+    dense = sorted(set(dense) & (set(DENSE_DOCUMENTS) if document == 'combined' else {document}))
+    if dense:
+        variant += ':dense=' + ','.join(dense)
+    schema = get_form_schema().digest
+    digest = hashlib.sha256(f'{GENERATOR_VERSION}\n{schema}\n{variant}\n{signature_date}\n'.encode('utf-8'))
+    digest.update(canonical.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class MemoryRenderCache:
+    """In-process LRU cache of rendered PDF sets, bounded by total size and entry age.
+
+    A hit restarts the entry's ttl, like the mtime refresh of DiskRenderCache, so documents
+    of a draft that is still being edited stay cached until the final submit.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires, pdfs, size)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.time():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries[key] = (time.time() + self.ttl,) + entry[1:]
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, key, pdfs):
+        size = sum(len(b) for b in pdfs.values())
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.time() + self.ttl, dict(pdfs), size)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        self.size -= self._entries.pop(key)[2]
+
+
+class DiskRenderCache:
+    """LRU cache of rendered PDF sets in a local directory, one framed file per entry.
+
+    The file mtime serves as last-access time, so several worker processes can share the directory.
+    Files are written atomically and readable only by the owner, since they hold personal data.
+    A failed write (full disk, removed directory) only loses the entry and counts in write_errors.
+    """
+
+    # Adresár sa prechádza (_evict) až po toľkých zápisoch alebo po zapísaní max_bytes / EVICT_EVERY
+    EVICT_EVERY = 16
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, ttl=600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+        self._puts = 0
+        self._written = 0
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pdfset')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if os.stat(path).st_mtime + self.ttl < time.time():
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, 'rb') as f:
+                _, pdfs = read_frame(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pdfs
+
+    def put(self, key, pdfs):
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                write_frame(f, {'key': key}, pdfs.items())
+            os.replace(tmp, path)
+        except OSError:
+            self.write_errors += 1
+            self._unlink(tmp)
+            return
+        self._puts += 1
+        self._written += sum(len(b) for b in pdfs.values())
+        if self._puts >= self.EVICT_EVERY or self._written >= self.max_bytes // self.EVICT_EVERY:
+            self._evict()
+
+    def _evict(self):
+        self._puts = self._written = 0
+        now = time.time()
+        entries, total = [], 0
+        try:
+            listing = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in listing:
+            if not entry.name.endswith('.pdfset'):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if st.st_mtime + self.ttl < now:
+                self._unlink(entry.path)
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# <prefix>_<field>_<idx>, napr. ver_nazov_3 alebo dom_soc_szco_0; index bez úvodných núl,
+# inak by '07' a '7' boli ten istý riadok
+ROW_KEY_RE = re.compile(r'^([^_]+)_(.+)_(0|[1-9]\d*)$')
+
+# Deklaratívna schéma formulára: polia, ich typy a predvolené hodnoty, dynamické skupiny
+FORM_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'form_schema.json')
+
+ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+LOCAL_DATE_RE = re.compile(r'^\d{1,2}\.\s?\d{1,2}\.\s?\d{4}$')
+
+FieldSpec = namedtuple('FieldSpec', ['type', 'default', 'max_length'])
+
+
+class FormValidationError(ValueError):
+    """Payload rejected by the form schema; errors lists '<key>: <problem>' for every bad value"""
+
+    # Koľko chýb vypísať v správe výnimky, celý zoznam je v errors
+    SHOWN = 10
+
+    def __init__(self, errors):
+        self.errors = errors
+        shown = '; '.join(errors[:self.SHOWN])
+        if len(errors) > self.SHOWN:
+            shown += f' (+{len(errors) - self.SHOWN} ďalších)'
+        super().__init__('Neplatné údaje formulára: ' + shown)
+
+
+class FormSchema:
+    """form_schema.json compiled into namedtuple record types.
+
+    compile() turns a payload into a Form once per PDFGenerator: every schema field is an attribute
+    holding stripped, escaped text (dates as DD.MM.YYYY, flags as bool, the default for missing or
+    empty values), groups maps each row prefix to its row records ordered by index and file_stem is
+    the unescaped '<meno>_<priezvisko>' of the output file names.
+
+    The size limits (key count, rows per group, row index, text length) are the same ones
+    server.js applies before queueing a submission; both read them from the schema file.
+    digest identifies the compiled fields and groups (types, defaults, lengths) for render_cache_key.
+    """
+
+    TYPES = ('text', 'date', 'flag')
+
+    def __init__(self, spec):
+        self.limits = spec['limits']
+        self.fields = self._field_specs(spec['fields'], self.limits['max_length'])
+        self.groups = {prefix: self._field_specs(fields, self.limits['max_length'])
+                       for prefix, fields in spec['groups'].items()}
+        self.form_type = namedtuple('Form', list(self.fields) + ['groups', 'file_stem'])
+        self.row_types = {prefix: namedtuple(f'Row_{prefix}', list(fields)) for prefix, fields in self.groups.items()}
+        compiled = json.dumps([self.fields, self.groups], sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.sha256(compiled.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _field_specs(cls, fields, max_length):
+        specs = {}
+        for name, spec in fields.items():
+            if isinstance(spec, str):
+                spec = {'type': spec}
+            if spec['type'] not in cls.TYPES:
+                raise ValueError(f'Neznámy typ poľa {name}: {spec["type"]}')
+            specs[name] = FieldSpec(spec['type'], esc(spec.get('default', '')), spec.get('max_length', max_length))
+        return specs
+
+    def compile(self, data):
+        """Validate and normalize data in one pass, raises FormValidationError listing every bad value"""
+        if not isinstance(data, dict):
+            raise FormValidationError([f'payload: očakáva sa objekt, nie {type(data).__name__}'])
+        limits = self.limits
+        if len(data) > limits['max_keys']:
+            raise FormValidationError([f'payload: {len(data)} polí, najviac {limits["max_keys"]}'])
+        errors = []
+        scalars, rows = {}, {}
+        for key, raw in data.items():
+            if key in self.fields:
+                scalars[key] = raw
+                continue
+            m = ROW_KEY_RE.match(key)
+            if m and m.group(1) in self.groups and int(m.group(3)) <= limits['max_index']:
+                rows.setdefault(m.group(1), {}).setdefault(int(m.group(3)), {})[m.group(2)] = raw
+                if (m.group(2) not in self.groups[m.group(1)] and isinstance(raw, str)
+                        and len(raw) > limits['max_value_length']):
+                    errors.append(f'{key}: najviac {limits["max_value_length"]} znakov')
+            elif key.partition('_')[0] in self.groups:
+                errors.append(f'{key}: očakáva sa <skupina>_<pole>_<index 0-{limits["max_index"]}>')
+            elif isinstance(raw, str) and len(raw) > limits['max_value_length']:
+                errors.append(f'{key}: najviac {limits["max_value_length"]} znakov')
+
+        for prefix, by_index in rows.items():
+            if len(by_index) > limits['max_rows']:
+                errors.append(f'{prefix}: {len(by_index)} riadkov, najviac {limits["max_rows"]}')
+
+        values = self._values(self.fields, scalars, errors, '{}')
+        groups = {}
+        for prefix, fields in self.groups.items():
+            make = self.row_types[prefix]._make
+            groups[prefix] = [make(self._values(fields, row, errors, f'{prefix}_{{}}_{idx}'))
+                              for idx, row in sorted(rows.get(prefix, {}).items())]
+        if errors:
+            raise FormValidationError(errors)
+        file_stem = f"{_text(scalars.get('meno')) or 'Dlznik'}_{_text(scalars.get('priezvisko')) or 'Neznamy'}"
+        return self.form_type._make(values + [groups, file_stem])
+
+    @staticmethod
+    def _values(fields, raw_values, errors, key):
+        """Normalized value of every field, in schema order; key formats the field name for errors"""
+        values = []
+        for name, field in fields.items():
+            raw = raw_values.get(name)
+            if raw is None:
+                values.append(False if field.type == 'flag' else field.default)
+                continue
+            try:
+                values.append(_normalize(field, raw))
+            except ValueError as e:
+                errors.append(f'{key.format(name)}: {e}')
+                values.append(None)
+        return values
+
+def _normalize(field, raw):
+    """Stripped, escaped text of a form value (dates as DD.MM.YYYY), bool for flags"""
+    if not isinstance(raw, (str, int, float)):
+        raise ValueError(f'očakáva sa text, nie {type(raw).__name__}')
+    text = _text(raw)
+    if len(text) > field.max_length:
+        raise ValueError(f'najviac {field.max_length} znakov')
+    if field.type == 'flag':
+        return bool(text)
+    if field.type == 'date' and text:
+        m = ISO_DATE_RE.match(text)
+        if m:
+            try:
+                datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            except ValueError:
+                raise ValueError(f'neexistujúci dátum {text}') from None
+            text = f'{m.group(3)}.{m.group(2)}.{m.group(1)}'
+        elif not LOCAL_DATE_RE.match(text):
+            raise ValueError('dátum musí byť RRRR-MM-DD alebo D.M.RRRR')
+    return esc(text) if text else field.default
+
+_form_schema = None
+
+def get_form_schema():
+    """FormSchema from FORM_SCHEMA_PATH, loaded and compiled once per process"""
+    global _form_schema
+    if _form_schema is None:
+        with open(FORM_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            _form_schema = FormSchema(json.load(f))
+    return _form_schema
+
+def _text(raw):
+    """Form value as stripped text, '' for None and False"""
+    if raw is None or raw is False:
+        return ''
+    return str(raw).strip()
+
+# Šírky stĺpcov _field_table a predvolený ľavý/pravý vnútorný okraj bunky tabuľky
+FIELD_COL_WIDTHS = (6*cm, 10*cm)
+CELL_PADDING = 6
+
+def _table_cell(text, style, width, paragraph=None):
+    """text as a plain string cell when it fits on one line of width in style and has no markup,
+    entity or whitespace that Paragraph would collapse; otherwise a wrapping paragraph(text, style)
+    (static_paragraph for constant labels).
+
+    Plain cells skip markup parsing and line breaking. The table style must give them the font,
+    size, leading and color of style; the baseline is then the same as the Paragraph's.
+    """
+    if ('<' in text or '&' in text or text != ' '.join(text.split())
+            or pdfmetrics.stringWidth(text, style.fontName, style.fontSize) > width):
+        return (paragraph or Paragraph)(text, style)
+    return text
+
+_static_paragraphs = {}
+
+def static_paragraph(text, style):
+    """Paragraph for constant text (titles, headings, declarations): markup is parsed and lines
+    are broken once per process, every story gets a copy of the shared StaticParagraph"""
+    key = (text, style.name)
+    master = _static_paragraphs.get(key)
+    if master is None:
+        master = _static_paragraphs[key] = StaticParagraph(text, style)
+    return copy.copy(master)
 
 def esc(text):
     """Escape HTML special chars for ReportLab Paragraph"""
@@ -31,721 +846,1175 @@ def esc(text):
         return ''
     return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
 
-def format_date(text):
-    """Convert YYYY-MM-DD to DD.MM.YYYY, leave other formats unchanged"""
-    if not text:
-        return ''
-    text = str(text).strip()
-    m = re.match(r'^(\d{4})-(\d{2})-(\d{2})$', text)
-    if m:
-        return f'{m.group(3)}.{m.group(2)}.{m.group(1)}'
-    return text
+# Zdokumentovaný strop špičkovej pamäte (RSS) procesu pri jednom renderi: proces s fontmi
+# a štýlmi + lineárna časť za každý riadok dynamických skupín (payload, jeho index a obsah
+# hotových strán). Namerané: 10 riadkov/skupinu 37 MB, 300 -> 53 MB, 1000 -> 96 MB
+# (predtým bez streamovania 77 MB a 171 MB). Kontroluje bench_pdf.py.
+RSS_BASE_MB = 48
+RSS_PER_ROW_KB = 6
+
+# Zdokumentovaný strop času importu modulu; ReportLab a fonty načíta až load_reportlab.
+# Namerané: 0.08 s (predtým s ReportLabom a registráciou fontov pri importe 0.23 s),
+# load_reportlab 0.2 s, z toho fonty 45 ms, z pickle cache (--font-cache) 17 ms. Kontroluje bench_pdf.py.
+IMPORT_BUDGET_SECONDS = 0.15
+
+def rss_budget_kb(data):
+    """Documented peak RSS cap of a process rendering data, in kB (ru_maxrss units on Linux)"""
+    rows = len({m.group(1, 3) for m in map(ROW_KEY_RE.match, data) if m})
+    return RSS_BASE_MB * 1024 + rows * RSS_PER_ROW_KB
+
+
+class LazyStory(list):
+    """Platypus story fed from a generator, materialized only a few flowables ahead.
+
+    doc.build() consumes the story from the front (del story[0], split parts inserted back
+    at the front) and checks len() before each step, so topping the buffer up in __len__
+    is enough. Laid-out flowables are dropped as soon as they are drawn, so memory no longer
+    grows with the number of flowables: only the lookahead window and the finished pages'
+    content streams are held. reportlab keeps page streams uncompressed until canvas.save(),
+    roughly 10 KB per page, which together with the payload itself is what RSS_PER_ROW_KB covers.
+    seconds sums the time spent in the generator itself, i.e. story assembly without layout.
+    """
+
+    # keepWithNext chains (handle_keepWithNext) look ahead within this window
+    LOOKAHEAD = 16
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+        self.produced = 0
+        self.seconds = 0.0
+        self.closed = False
+
+    def close(self):
+        """End the story early: doc.build() sees it empty and finishes without another page"""
+        self._source = None
+        self.closed = True
+
+    def __len__(self):
+        if self.closed:
+            return 0
+        n = super().__len__()
+        if self._source is None or n >= self.LOOKAHEAD:
+            return n
+        start = time.perf_counter()
+        while self._source is not None and n < self.LOOKAHEAD:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+                break
+            self.produced += 1
+            n += 1
+        self.seconds += time.perf_counter() - start
+        return n
+
+
+# Kompaktný výstupný profil: rovnaký vzhľad, menej bajtov v prílohách a úložisku.
+# Info slovník PDF bez predvolených výplní ("anonymous", "unspecified", reklama ReportLabu).
+COMPACT_DOC_OPTIONS = MappingProxyType({
+    'pageCompression': 1,
+    'title': '', 'author': '', 'subject': '', 'creator': '', 'producer': '',
+})
+
+
+@contextmanager
+def _output_profile(compact):
+    """Process-wide reportlab settings of the compact profile, for the duration of one build.
+
+    Streams are written as raw Flate instead of ASCII85-wrapped Flate, which is 25 % larger.
+    TrueType subsets hold only the glyphs the document uses: by default reportlab reserves all
+    of ASCII in subset 0 (asciiReadable) and opens a second subset at the first diacritic, so
+    every font is embedded twice. Glyphs are identical either way, ToUnicode keeps the text
+    extractable. Rendering is single-threaded per process, so the switch is safe to flip here.
+    """
+    if not compact:
+        yield
+        return
+    fonts = [font for font in map(pdfmetrics.getFont, (FONT, FONT_BOLD)) if isinstance(font, TTFont)]
+    saved = rl_config.useA85, [font._asciiReadable for font in fonts]
+    rl_config.useA85 = 0
+    for font in fonts:
+        font._asciiReadable = False
+    try:
+        yield
+    finally:
+        rl_config.useA85 = saved[0]
+        for font, readable in zip(fonts, saved[1]):
+            font._asciiReadable = readable
 
 class PDFGenerator:
-    def __init__(self, data):
+    def __init__(self, data, trace=None, signature_date=None, compact=False, dense=()):
         self.data = data
-        self.styles = self._create_styles()
-
-    def g(self, key, default=''):
-        """Get value from data safely"""
-        val = self.data.get(key, default)
-        if val is None:
-            return default
-        return str(val).strip() if val else default
-
-    def _create_styles(self):
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(name='DocTitle', fontName=FONT_BOLD, fontSize=13,
-            textColor=colors.HexColor('#1e293b'), spaceAfter=6, alignment=TA_CENTER, leading=16))
-        styles.add(ParagraphStyle(name='DocSubtitle', fontName=FONT, fontSize=9,
-            textColor=colors.HexColor('#475569'), spaceAfter=16, alignment=TA_CENTER))
-        styles.add(ParagraphStyle(name='SectionH', fontName=FONT_BOLD, fontSize=10,
-            textColor=colors.HexColor('#1e3a5f'), spaceAfter=8, spaceBefore=14))
-        styles.add(ParagraphStyle(name='SubH', fontName=FONT_BOLD, fontSize=9,
-            textColor=colors.HexColor('#334155'), spaceAfter=6, spaceBefore=8))
-        styles.add(ParagraphStyle(name='Body', fontName=FONT, fontSize=9,
-            textColor=colors.HexColor('#334155'), spaceAfter=4, leading=13))
-        styles.add(ParagraphStyle(name='BodyBold', fontName=FONT_BOLD, fontSize=9,
-            textColor=colors.HexColor('#1e293b'), spaceAfter=4, leading=13))
-        styles.add(ParagraphStyle(name='Small', fontName=FONT, fontSize=8,
-            textColor=colors.HexColor('#64748b'), spaceAfter=3, leading=11))
-        styles.add(ParagraphStyle(name='Legal', fontName=FONT, fontSize=8,
-            textColor=colors.HexColor('#475569'), spaceAfter=4, leading=12))
-        return styles
+        self.trace = trace or NULL_TRACE
+        # Kompaktný profil (menšie PDF, rovnaký vzhľad); je súčasťou kľúča cache
+        self.compact = compact
+        # Dokumenty v hustom rozložení (podmnožina DENSE_DOCUMENTS, True = všetky)
+        self.dense = frozenset(DENSE_DOCUMENTS if dense is True else dense or ())
+        unsupported = self.dense - set(DENSE_DOCUMENTS)
+        if unsupported:
+            raise ValueError(f'Husté rozloženie nepodporujú: {", ".join(sorted(unsupported))}')
+        # Dátum pod podpisom (DD.MM.YYYY); je súčasťou kľúča cache, preto sa dá zadať
+        self.signature_date = signature_date or datetime.now().strftime('%d.%m.%Y')
+        # Nastavenia výstupu pre procesy poolu, ktoré si vytvárajú vlastný PDFGenerator
+        self.options = {'signature_date': self.signature_date, 'compact': compact, 'dense': sorted(self.dense)}
+        # Dokumenty, ktoré posledné generate_all_bytes vzalo z cache
+        self.cache_hits = []
+        # Payload overený a prevedený raz; dokumenty čítajú už normalizované a escapované hodnoty.
+        # Pred štýlmi, aby neplatné údaje neplatili načítanie ReportLabu.
+        with self.trace.span('form') as meta:
+            self.form = get_form_schema().compile(data)
+            meta['rows'] = {prefix: len(rows) for prefix, rows in self.form.groups.items() if rows}
+        self.registry = get_style_registry(self.trace)
+        self.styles = self.registry.paragraphs
 
     def _make_doc(self, filename):
+        options = COMPACT_DOC_OPTIONS if self.compact else {}
         return SimpleDocTemplate(filename, pagesize=A4,
-            rightMargin=2*cm, leftMargin=2*cm, topMargin=1.5*cm, bottomMargin=1.5*cm)
+            rightMargin=2*cm, leftMargin=2*cm, topMargin=1.5*cm, bottomMargin=1.5*cm, **options)
+
+    def _render(self, key, filename, build_story, max_pages=None):
+        """Lay out one document into filename (path or file-like). build_story is a generator
+        method; its flowables are created while the layout consumes them (see LazyStory),
+        so the build span includes story assembly. max_pages ends the document after that
+        many pages; the rest of the story is never built. story_seconds on the span is the
+        part of it spent assembling the story."""
+        story = LazyStory(build_story())
+        doc = self._make_doc(filename)
+        if max_pages:
+            doc.afterPage = lambda: doc.page >= max_pages and story.close()
+        with self.trace.span(f'{key}.build') as meta, _output_profile(self.compact):
+            doc.build(story)
+            meta['pages'] = doc.page
+            meta['flowables'] = story.produced
+            meta['story_seconds'] = round(story.seconds, 6)
+        return filename
 
     def _header_table(self):
         """Common header with debtor info"""
+        form = self.form
         data = [
-            ['Meno:', esc(self.g('meno'))],
-            ['Priezvisko:', esc(self.g('priezvisko'))],
-            ['Titul:', esc(self.g('titul'))],
-            ['Dátum narodenia:', esc(format_date(self.g('datumNarodenia')))],
-            ['Rodné číslo:', esc(self.g('rodneCislo'))],
-            ['Trvalé bydlisko:', esc(f"{self.g('ulica')} {self.g('cisloDomu')}, {self.g('psc')} {self.g('obec')}")],
+            ['Meno:', form.meno],
+            ['Priezvisko:', form.priezvisko],
+            ['Titul:', form.titul],
+            ['Dátum narodenia:', form.datumNarodenia],
+            ['Rodné číslo:', form.rodneCislo],
+            ['Trvalé bydlisko:', f'{form.ulica} {form.cisloDomu}, {form.psc} {form.obec}'],
         ]
         t = Table(data, colWidths=[5*cm, 11*cm])
-        t.setStyle(TableStyle([
-            ('FONT', (0,0),(0,-1), FONT_BOLD, 9),
-            ('FONT', (1,0),(1,-1), FONT, 9),
-            ('TEXTCOLOR', (0,0),(-1,-1), colors.HexColor('#1e293b')),
-            ('VALIGN', (0,0),(-1,-1), 'TOP'),
-            ('BOTTOMPADDING', (0,0),(-1,-1), 4),
-            ('TOPPADDING', (0,0),(-1,-1), 2),
-        ]))
+        t.setStyle(self.registry.header_table)
         return t
 
     def _field_table(self, rows):
-        """Create a standard field table with text wrapping"""
-        label_style = ParagraphStyle('TblLabel', fontName=FONT_BOLD, fontSize=9,
-            textColor=colors.HexColor('#1e293b'), leading=12)
-        value_style = ParagraphStyle('TblValue', fontName=FONT, fontSize=9,
-            textColor=colors.HexColor('#1e293b'), leading=12)
+        """Create a standard field table with text wrapping (only for cells that need it)"""
+        label_style = self.styles['TblLabel']
+        value_style = self.styles['TblValue']
+        label_width, value_width = (width - 2 * CELL_PADDING for width in FIELD_COL_WIDTHS)
         wrapped = []
         for r in rows:
-            wrapped.append([Paragraph(str(r[0]), label_style), Paragraph(str(r[1]), value_style)])
-        t = Table(wrapped, colWidths=[6*cm, 10*cm])
-        t.setStyle(TableStyle([
-            ('VALIGN', (0,0),(-1,-1), 'TOP'),
-            ('BOTTOMPADDING', (0,0),(-1,-1), 5),
-            ('TOPPADDING', (0,0),(-1,-1), 3),
-            ('GRID', (0,0),(-1,-1), 0.5, colors.HexColor('#e2e8f0')),
-        ]))
+            wrapped.append([_table_cell(str(r[0]), label_style, label_width, static_paragraph),
+                            _table_cell(str(r[1]), value_style, value_width)])
+        t = Table(wrapped, colWidths=list(FIELD_COL_WIDTHS))
+        t.setStyle(self.registry.field_table)
         return t
 
     def _item_header(self, text):
         """Colored header row for items"""
         t = Table([[text]], colWidths=[16*cm])
-        t.setStyle(TableStyle([
-            ('FONT', (0,0),(-1,-1), FONT_BOLD, 9),
-            ('BACKGROUND', (0,0),(-1,-1), colors.HexColor('#e0e7ff')),
-            ('TEXTCOLOR', (0,0),(-1,-1), colors.HexColor('#1e3a5f')),
-            ('BOTTOMPADDING', (0,0),(-1,-1), 6),
-            ('TOPPADDING', (0,0),(-1,-1), 6),
-            ('LEFTPADDING', (0,0),(-1,-1), 8),
-        ]))
+        t.setStyle(self.registry.item_header)
         return t
 
-    def _signature_block(self, story):
-        today = datetime.now().strftime('%d.%m.%Y')
-        story.append(Spacer(1, 1.2*cm))
-        story.append(Paragraph(f'V __________________ , dňa {today}', self.styles['Body']))
-        story.append(Spacer(1, 1*cm))
-        story.append(Paragraph('________________________________________', self.styles['Body']))
-        story.append(Paragraph('Podpis dlžníka', self.styles['Body']))
-
-    def _collect_dynamic(self, prefix):
-        """Collect dynamic form fields by prefix into list of dicts.
-        E.g. prefix='p' collects p_lv_0, p_obec_0, p_lv_1, p_obec_1 etc."""
-        items = {}
-        pattern = re.compile(f'^{re.escape(prefix)}_(.+?)_(\\d+)$')
-        for key, val in self.data.items():
-            m = pattern.match(key)
-            if m:
-                field_name = m.group(1)
-                idx = int(m.group(2))
-                if idx not in items:
-                    items[idx] = {}
-                items[idx][field_name] = val
-        return [items[k] for k in sorted(items.keys())]
+    def _signature_block(self):
+        yield Spacer(1, 1.2*cm)
+        yield Paragraph(f'V __________________ , dňa {self.signature_date}', self.styles['Body'])
+        yield Spacer(1, 1*cm)
+        yield static_paragraph('________________________________________', self.styles['Body'])
+        yield static_paragraph('Podpis dlžníka', self.styles['Body'])
+
+    # ============================================
+    # POLOŽKY DYNAMICKÝCH SKUPÍN (riadky tabuliek)
+    # ============================================
+    def _item_section(self, document, items, title, kind, spaced=True, empty='(žiadne)'):
+        """All rows of one dynamic group: an item header and a field table per row, or with the
+        dense layout of this document a single table for the whole group (DENSE_COLUMNS)"""
+        if not items:
+            yield static_paragraph(empty, self.styles['Body'])
+        elif document in self.dense:
+            yield self._dense_table(items, kind)
+        else:
+            rows = getattr(self, f'_{kind}_rows')
+            for i, item in enumerate(items, 1):
+                yield self._item_header(f'{title} č. {i}')
+                yield self._field_table(rows(item))
+                if spaced:
+                    yield Spacer(1, 0.2*cm)
+
+    def _dense_table(self, items, kind):
+        """One table for a whole group: a numbered row per item whose cells combine several fields,
+        fixed column widths and a header row repeated on every page"""
+        columns = DENSE_COLUMNS[kind]
+        rows = getattr(self, f'_{kind}_rows')
+        head, cell = self.styles['TblDenseHead'], self.styles['TblDense']
+        data = [[static_paragraph('č.', head)] + [static_paragraph(title, head) for title, _, _ in columns]]
+        for i, item in enumerate(items, 1):
+            values = [value for _, value in rows(item)]
+            data.append([str(i)] + [Paragraph(fmt.format(*values), cell) for _, _, fmt in columns])
+        t = Table(data, colWidths=[1*cm] + [width*cm for _, width, _ in columns], repeatRows=1, splitInRow=1)
+        t.setStyle(self.registry.dense_table)
+        return t
+
+    def _pozemok_rows(self, p):
+        return [
+            ['List vlastníctva č.:', p.lv],
+            ['Obec:', p.obec],
+            ['Katastrálne územie:', p.ku],
+            ['Parcela č.:', f'{p.parcela} (register {p.register})'],
+            ['Výmera (m²):', p.vymera],
+            ['Druh pozemku:', p.druh],
+            ['Hodnota:', f'{p.hodnota} €'],
+            ['Spoluvlastnícky podiel:', p.podiel],
+        ]
+
+    def _stavba_rows(self, s):
+        return [
+            ['List vlastníctva č.:', s.lv],
+            ['Obec:', s.obec],
+            ['Katastrálne územie:', s.ku],
+            ['Súpisné číslo:', s.supisne],
+            ['Orientačné číslo:', s.orient],
+            ['Na pozemku parcelné číslo:', f'{s.parcela} (register {s.register})'],
+            ['Popis stavby:', s.popis],
+            ['Hodnota:', f'{s.hodnota} €'],
+            ['Spoluvlastnícky podiel:', s.podiel],
+        ]
+
+    def _byt_rows(self, b):
+        return [
+            ['List vlastníctva č.:', b.lv],
+            ['Obec:', b.obec],
+            ['Katastrálne územie:', b.ku],
+            ['Vchod:', b.vchod],
+            ['Poschodie:', b.poschodie],
+            ['Číslo bytu:', b.cislo],
+            ['Súpisné číslo:', b.supisne],
+            ['Orientačné číslo:', b.orient],
+            ['Na pozemku parcelné číslo:', f'{b.parcela} (register {b.register})'],
+            ['Druh pozemku:', b.druh],
+            ['Popis stavby:', b.popisStavby],
+            ['Podiel na spoločných častiach:', b.podielSpoloc],
+            ['Popis bytu:', b.popisBytu],
+            ['Hodnota:', f'{b.hodnota} €'],
+            ['Spoluvlastnícky podiel:', b.podiel],
+        ]
+
+    def _hnutelna_rows(self, h):
+        return [
+            ['Popis:', h.popis],
+            ['Výrobné číslo / VIN:', h.vin],
+            ['Evidenčné číslo / ŠPZ:', h.spz],
+            ['Kde sa nachádza:', h.kde],
+            ['Hodnota:', f'{h.hodnota} €'],
+        ]
+
+    def _ucet_rows(self, u):
+        return [
+            ['Číslo účtu / IBAN:', u.iban],
+            ['Banka:', u.banka],
+            ['Zostatok:', f'{u.zostatok} €'],
+        ]
+
+    def _hist_byt_rows(self, b):
+        return [
+            ['List vlastníctva č.:', b.lv],
+            ['Obec:', b.obec],
+            ['Katastrálne územie:', b.ku],
+            ['Vchod:', b.vchod],
+            ['Poschodie:', b.poschodie],
+            ['Číslo bytu:', b.cislo],
+            ['Súpisné číslo:', b.supisne],
+            ['Orientačné číslo:', b.orient],
+            ['Na pozemku parcelné číslo:', f'{b.parcela} (register {b.register})'],
+            ['Popis bytu:', b.popisBytu],
+            ['Hodnota:', f'{b.hodnota} €'],
+            ['Spoluvlastnícky podiel:', b.podiel],
+        ]
+
+    def _hist_hnutelna_rows(self, h):
+        return [
+            ['Popis:', h.popis],
+            ['VIN:', h.vin],
+            ['ŠPZ:', h.spz],
+            ['Kde sa nachádza:', h.kde],
+            ['Hodnota:', f'{h.hodnota} €'],
+        ]
+
+    def _veritel_rows(self, v):
+        return [
+            ['Názov / Meno:', v.nazov],
+            ['IČO / Dátum narodenia:', v.ico],
+            ['Ulica (trvalé bydlisko / sídlo):', v.ulica],
+            ['Súpisné číslo:', v.supisne],
+            ['Obec:', v.obec],
+            ['PSČ:', v.psc],
+            ['Štát:', v.stat],
+        ]
 
     # ============================================
     # DOKUMENT 1: ŽIVOTOPIS DLŽNÍKA
     # ============================================
-    def generate_zivotopis(self, filename):
-        doc = self._make_doc(filename)
-        story = []
+    def generate_zivotopis(self, filename, max_pages=None):
+        return self._render('zivotopis', filename, self._story_zivotopis, max_pages)
 
-        story.append(Paragraph('Životopis dlžníka, aktuálna životná situácia', self.styles['DocTitle']))
-        story.append(Paragraph('a zoznam spriaznených osôb', self.styles['DocTitle']))
-        story.append(Paragraph('V súlade s § 167 ods. 2 a § 168 ods. 2 zákona č. 7/2005 Z. z. o konkurze a reštrukturalizácii', self.styles['DocSubtitle']))
-        story.append(Spacer(1, 0.3*cm))
+    def _story_zivotopis(self):
+        form = self.form
+        yield static_paragraph('Životopis dlžníka, aktuálna životná situácia', self.styles['DocTitle'])
+        yield static_paragraph('a zoznam spriaznených osôb', self.styles['DocTitle'])
+        yield static_paragraph('V súlade s § 167 ods. 2 a § 168 ods. 2 zákona č. 7/2005 Z. z. o konkurze a reštrukturalizácii', self.styles['DocSubtitle'])
+        yield Spacer(1, 0.3*cm)
 
         # 1. Osobné údaje
-        story.append(Paragraph('1. Osobné údaje dlžníka', self.styles['SectionH']))
-        story.append(self._header_table())
-        story.append(Spacer(1, 0.2*cm))
+        yield static_paragraph('1. Osobné údaje dlžníka', self.styles['SectionH'])
+        yield self._header_table()
+        yield Spacer(1, 0.2*cm)
 
         # Kontakt
-        story.append(Paragraph('Kontaktné údaje:', self.styles['SubH']))
-        story.append(self._field_table([
-            ['Telefónne číslo:', esc(self.g('telefon'))],
-            ['E-mail:', esc(self.g('email'))],
-        ]))
+        yield static_paragraph('Kontaktné údaje:', self.styles['SubH'])
+        yield self._field_table([
+            ['Telefónne číslo:', form.telefon],
+            ['E-mail:', form.email],
+        ])
 
         # 2. Vzdelanie
-        story.append(Paragraph('2. Vzdelanie dlžníka', self.styles['SectionH']))
-        story.append(self._field_table([
-            ['Najvyššie dosiahnuté vzdelanie:', esc(self.g('vzdelanie'))],
-            ['Ukončené v roku:', esc(self.g('vzdelanieRok'))],
-            ['Odbor:', esc(self.g('vzdelanieOdbor'))],
-            ['Škola:', esc(self.g('vzdelanieSkaola'))],
-            ['Ďalšie vzdelanie, rekvalifikácia:', esc(self.g('dalsieVzdelanie'))],
-        ]))
+        yield static_paragraph('2. Vzdelanie dlžníka', self.styles['SectionH'])
+        yield self._field_table([
+            ['Najvyššie dosiahnuté vzdelanie:', form.vzdelanie],
+            ['Ukončené v roku:', form.vzdelanieRok],
+            ['Odbor:', form.vzdelanieOdbor],
+            ['Škola:', form.vzdelanieSkaola],
+            ['Ďalšie vzdelanie, rekvalifikácia:', form.dalsieVzdelanie],
+        ])
 
         # 3. Schopnosti
-        story.append(Paragraph('3. Schopnosti, znalosti a zručnosti dlžníka', self.styles['SectionH']))
-        story.append(self._field_table([
-            ['Jazykové znalosti:', esc(self.g('jazyky'))],
-            ['Vodičský preukaz:', esc(f"{self.g('vodicak')}, typ: {self.g('vodicakTyp')}")],
-        ]))
+        yield static_paragraph('3. Schopnosti, znalosti a zručnosti dlžníka', self.styles['SectionH'])
+        yield self._field_table([
+            ['Jazykové znalosti:', form.jazyky],
+            ['Vodičský preukaz:', f'{form.vodicak}, typ: {form.vodicakTyp}'],
+        ])
 
         # 4. Zdravotný stav
-        story.append(Paragraph('4. Zdravotný stav dlžníka', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('zdravotnyStav', 'Neuvedené')), self.styles['Body']))
+        yield static_paragraph('4. Zdravotný stav dlžníka', self.styles['SectionH'])
+        yield Paragraph(form.zdravotnyStav, self.styles['Body'])
 
         # 5. Pracovné skúsenosti
-        story.append(Paragraph('5. Pracovné skúsenosti dlžníka', self.styles['SectionH']))
-        praca_items = self._collect_dynamic('praca')
+        yield static_paragraph('5. Pracovné skúsenosti dlžníka', self.styles['SectionH'])
+        praca_items = form.groups['praca']
         if praca_items:
             rows = [['Od – Do', 'Zamestnávateľ', 'Pracovná pozícia']]
             for p in praca_items:
                 rows.append([
-                    esc(f"{p.get('od','')} – {p.get('do','')}"),
-                    esc(p.get('zamestnavatel', '')),
-                    esc(p.get('pozicia', ''))
+                    f'{p.od} – {p.do}',
+                    p.zamestnavatel,
+                    p.pozicia
                 ])
             t = Table(rows, colWidths=[4*cm, 6*cm, 6*cm])
-            t.setStyle(TableStyle([
-                ('FONT', (0,0),(-1,0), FONT_BOLD, 9),
-                ('FONT', (0,1),(-1,-1), FONT, 9),
-                ('BACKGROUND', (0,0),(-1,0), colors.HexColor('#e0e7ff')),
-                ('GRID', (0,0),(-1,-1), 0.5, colors.HexColor('#e2e8f0')),
-                ('VALIGN', (0,0),(-1,-1), 'TOP'),
-                ('BOTTOMPADDING', (0,0),(-1,-1), 5),
-                ('TOPPADDING', (0,0),(-1,-1), 3),
-            ]))
-            story.append(t)
+            t.setStyle(self.registry.list_table)
+            yield t
         else:
-            story.append(Paragraph('Neuvedené', self.styles['Body']))
+            yield static_paragraph('Neuvedené', self.styles['Body'])
 
         # 6. Sociálne postavenie
-        story.append(Paragraph('6. Sociálne postavenie dlžníka', self.styles['SectionH']))
-        story.append(Paragraph('V súčasnosti som:', self.styles['SubH']))
-        soc_map = {
-            'soc_zamestanany': 'zamestnaný/á',
-            'soc_szco': 'samostatne zárobkovo činná osoba',
-            'soc_dochodok': 'poberateľ/-ka dôchodku',
-            'soc_nezamestnany': 'dobrovoľne nezamestnaný/á',
-            'soc_uchadzac': 'uchádzač/-ka o zamestnanie',
-            'soc_davky': 'poberateľ/-ka sociálnych dávok',
-            'soc_ine': 'iné',
-        }
-        for key, label in soc_map.items():
-            checked = '☒' if self.g(key) else '☐'
+        yield static_paragraph('6. Sociálne postavenie dlžníka', self.styles['SectionH'])
+        yield static_paragraph('V súčasnosti som:', self.styles['SubH'])
+        for key, label in SOCIAL_STATUS_LABELS.items():
+            checked = '☒' if getattr(form, key) else '☐'
             extra = ''
-            if key == 'soc_szco' and self.g(key):
-                extra = f'    IČO: {esc(self.g("ico"))}'
-            elif key == 'soc_dochodok' and self.g(key):
-                extra = f'    druh: {esc(self.g("dochodokDruh"))}'
-            elif key == 'soc_davky' and self.g(key):
-                extra = f'    druh: {esc(self.g("davkyDruh"))}'
-            elif key == 'soc_ine' and self.g(key):
-                extra = f'    {esc(self.g("inePostavenie"))}'
-            story.append(Paragraph(f'{checked} {label}{extra}', self.styles['Body']))
+            if key == 'soc_szco' and getattr(form, key):
+                extra = f'    IČO: {form.ico}'
+            elif key == 'soc_dochodok' and getattr(form, key):
+                extra = f'    druh: {form.dochodokDruh}'
+            elif key == 'soc_davky' and getattr(form, key):
+                extra = f'    druh: {form.davkyDruh}'
+            elif key == 'soc_ine' and getattr(form, key):
+                extra = f'    {form.inePostavenie}'
+            if extra:
+                yield Paragraph(f'{checked} {label}{extra}', self.styles['Body'])
+            else:
+                yield static_paragraph(f'{checked} {label}', self.styles['Body'])
 
         # Rodinný stav a BSM
-        story.append(Spacer(1, 0.2*cm))
-        story.append(self._field_table([
-            ['Rodinný stav:', esc(self.g('rodinnyStav'))],
-            ['BSM:', esc(self.g('bsm', 'Nie'))],
-        ]))
+        yield Spacer(1, 0.2*cm)
+        yield self._field_table([
+            ['Rodinný stav:', form.rodinnyStav],
+            ['BSM:', form.bsm],
+        ])
 
         # 7. Životná situácia
-        story.append(Paragraph('7. Opíšte v stručnosti Vašu aktuálnu životnú situáciu', self.styles['SectionH']))
+        yield static_paragraph('7. Opíšte v stručnosti Vašu aktuálnu životnú situáciu', self.styles['SectionH'])
 
         # Príjmy
-        story.append(Paragraph('Moje príjmy:', self.styles['SubH']))
-        prijem_items = self._collect_dynamic('prijem')
+        yield static_paragraph('Moje príjmy:', self.styles['SubH'])
+        prijem_items = form.groups['prijem']
         if prijem_items:
             rows = [['Suma (€)', 'Zdroj']]
             for p in prijem_items:
-                rows.append([esc(f"{p.get('suma','')} €"), esc(p.get('zdroj',''))])
+                rows.append([f'{p.suma} €', p.zdroj])
             t = Table(rows, colWidths=[5*cm, 11*cm])
-            t.setStyle(TableStyle([
-                ('FONT',(0,0),(-1,0),FONT_BOLD,9),('FONT',(0,1),(-1,-1),FONT,9),
-                ('BACKGROUND',(0,0),(-1,0),colors.HexColor('#e0e7ff')),
-                ('GRID',(0,0),(-1,-1),0.5,colors.HexColor('#e2e8f0')),
-                ('BOTTOMPADDING',(0,0),(-1,-1),4),('TOPPADDING',(0,0),(-1,-1),3),
-            ]))
-            story.append(t)
+            t.setStyle(self.registry.list_table_compact)
+            yield t
 
         # Výdavky
-        story.append(Paragraph('Moje výdavky:', self.styles['SubH']))
+        yield static_paragraph('Moje výdavky:', self.styles['SubH'])
         vydavky = [
-            ['Bývanie (nájom, energie):', esc(f"{self.g('vydaj_byvanie','0')} €")],
-            ['Strava:', esc(f"{self.g('vydaj_strava','0')} €")],
-            ['Hygiena a ošatenie:', esc(f"{self.g('vydaj_hygiena','0')} €")],
-            ['Zdravotná starostlivosť:', esc(f"{self.g('vydaj_zdravie','0')} €")],
-            ['Starostlivosť o deti:', esc(f"{self.g('vydaj_deti','0')} €")],
-            ['Poistné:', esc(f"{self.g('vydaj_poistne','0')} €")],
-            ['Cestovné:', esc(f"{self.g('vydaj_cestovne','0')} €")],
-            ['Splácanie dlhov:', esc(f"{self.g('vydaj_dlhy','0')} €")],
+            ['Bývanie (nájom, energie):', f'{form.vydaj_byvanie} €'],
+            ['Strava:', f'{form.vydaj_strava} €'],
+            ['Hygiena a ošatenie:', f'{form.vydaj_hygiena} €'],
+            ['Zdravotná starostlivosť:', f'{form.vydaj_zdravie} €'],
+            ['Starostlivosť o deti:', f'{form.vydaj_deti} €'],
+            ['Poistné:', f'{form.vydaj_poistne} €'],
+            ['Cestovné:', f'{form.vydaj_cestovne} €'],
+            ['Splácanie dlhov:', f'{form.vydaj_dlhy} €'],
         ]
-        story.append(self._field_table(vydavky))
+        yield self._field_table(vydavky)
 
         # Vznik dlhov
-        story.append(Paragraph('Ako vznikli moje dlhy:', self.styles['SubH']))
-        story.append(Paragraph(esc(self.g('vznikDlhov', 'Neuvedené')), self.styles['Body']))
+        yield static_paragraph('Ako vznikli moje dlhy:', self.styles['SubH'])
+        yield Paragraph(form.vznikDlhov, self.styles['Body'])
 
         # 8. Spriaznené osoby
-        story.append(Paragraph('8. Zoznam osôb spriaznených s dlžníkom', self.styles['SectionH']))
+        yield static_paragraph('8. Zoznam osôb spriaznených s dlžníkom', self.styles['SectionH'])
 
         # 8.1 Spoločná domácnosť
-        story.append(Paragraph('8.1. Spoločnú domácnosť tvorím s týmito osobami:', self.styles['SubH']))
-        dom_osoby = self._collect_dynamic('dom')
+        yield static_paragraph('8.1. Spoločnú domácnosť tvorím s týmito osobami:', self.styles['SubH'])
+        dom_osoby = form.groups['dom']
         if dom_osoby:
             for i, osoba in enumerate(dom_osoby, 1):
-                story.append(self._item_header(f'Osoba č. {i}'))
+                yield self._item_header(f'Osoba č. {i}')
                 # Build social status string
                 soc_parts = []
-                soc_dom_map = {
-                    'soc_zamestanany': 'zamestnaný/á',
-                    'soc_szco': 'SZČO',
-                    'soc_dochodok': 'poberateľ/-ka dôchodku',
-                    'soc_nezamestnany': 'dobrovoľne nezamestnaný/á',
-                    'soc_uchadzac': 'uchádzač/-ka o zamestnanie',
-                    'soc_davky': 'poberateľ/-ka sociálnych dávok',
-                    'soc_ine': 'iné',
-                }
-                for sk, sl in soc_dom_map.items():
-                    if osoba.get(sk):
+                for sk, sl in HOUSEHOLD_STATUS_LABELS.items():
+                    if getattr(osoba, sk):
                         extra = ''
                         if sk == 'soc_szco':
-                            ico_val = osoba.get('ico', '')
+                            ico_val = osoba.ico
                             if ico_val:
                                 extra = f' (IČO: {ico_val})'
                         elif sk == 'soc_dochodok':
-                            druh = osoba.get('dochodokDruh', '')
+                            druh = osoba.dochodokDruh
                             if druh:
                                 extra = f' ({druh})'
                         elif sk == 'soc_davky':
-                            druh = osoba.get('davkyDruh', '')
+                            druh = osoba.davkyDruh
                             if druh:
                                 extra = f' ({druh})'
                         elif sk == 'soc_ine':
-                            ine_val = osoba.get('ine', '')
+                            ine_val = osoba.ine
                             if ine_val:
                                 extra = f' ({ine_val})'
                         soc_parts.append(f'{sl}{extra}')
                 soc_text = ', '.join(soc_parts) if soc_parts else '–'
-                story.append(self._field_table([
-                    ['Meno a priezvisko:', esc(osoba.get('meno', ''))],
-                    ['Dátum narodenia:', esc(format_date(osoba.get('datnar', '')))],
-                    ['Vzťah:', esc(osoba.get('vztah', ''))],
-                    ['Sociálne postavenie:', esc(soc_text)],
-                ]))
-                story.append(Spacer(1, 0.15*cm))
+                yield self._field_table([
+                    ['Meno a priezvisko:', osoba.meno],
+                    ['Dátum narodenia:', osoba.datnar],
+                    ['Vzťah:', osoba.vztah],
+                    ['Sociálne postavenie:', soc_text],
+                ])
+                yield Spacer(1, 0.15*cm)
         else:
-            story.append(Paragraph('(žiadne osoby v domácnosti)', self.styles['Body']))
+            yield static_paragraph('(žiadne osoby v domácnosti)', self.styles['Body'])
 
         # 8.2 Blízke osoby
-        story.append(Paragraph('8.2. Blízke osoby mimo domácnosti:', self.styles['SubH']))
-        blizke = self._collect_dynamic('blizka')
+        yield static_paragraph('8.2. Blízke osoby mimo domácnosti:', self.styles['SubH'])
+        blizke = form.groups['blizka']
         if blizke:
             rows = [['Meno a priezvisko', 'Vzťah', 'Adresa']]
             for b in blizke:
-                rows.append([esc(b.get('meno','')), esc(b.get('vztah','')), esc(b.get('adresa',''))])
+                rows.append([b.meno, b.vztah, b.adresa])
             t = Table(rows, colWidths=[5.5*cm, 4*cm, 6.5*cm])
-            t.setStyle(TableStyle([
-                ('FONT',(0,0),(-1,0),FONT_BOLD,9),('FONT',(0,1),(-1,-1),FONT,9),
-                ('BACKGROUND',(0,0),(-1,0),colors.HexColor('#e0e7ff')),
-                ('GRID',(0,0),(-1,-1),0.5,colors.HexColor('#e2e8f0')),
-                ('BOTTOMPADDING',(0,0),(-1,-1),4),('TOPPADDING',(0,0),(-1,-1),3),
-            ]))
-            story.append(t)
+            t.setStyle(self.registry.list_table_compact)
+            yield t
         else:
-            story.append(Paragraph('Neuvedené', self.styles['Body']))
+            yield static_paragraph('Neuvedené', self.styles['Body'])
 
         # 8.3 Účasti v PO
-        story.append(Paragraph('8.3. Kvalifikované účasti v právnických osobách:', self.styles['SubH']))
-        story.append(Paragraph('a) Moje účasti:', self.styles['BodyBold']))
-        story.append(Paragraph(esc(self.g('mojeUcasti', '(žiadne)')), self.styles['Body']))
-        story.append(Paragraph('b) Účasti blízkych osôb:', self.styles['BodyBold']))
-        story.append(Paragraph(esc(self.g('blizkeUcasti', '(žiadne)')), self.styles['Body']))
+        yield static_paragraph('8.3. Kvalifikované účasti v právnických osobách:', self.styles['SubH'])
+        yield static_paragraph('a) Moje účasti:', self.styles['BodyBold'])
+        yield Paragraph(form.mojeUcasti, self.styles['Body'])
+        yield static_paragraph('b) Účasti blízkych osôb:', self.styles['BodyBold'])
+        yield Paragraph(form.blizkeUcasti, self.styles['Body'])
 
         # Čestné prehlásenie
-        story.append(Spacer(1, 0.5*cm))
-        story.append(Paragraph(
+        yield Spacer(1, 0.5*cm)
+        yield static_paragraph(
             'Čestne vyhlasujem, že som platobne neschopný/á, do tohto stavu som sa nepriviedol/a úmyselne, '
             'pri preberaní záväzkov som sa nespoliehal/a na to, že svoje dlhy budem riešiť oddlžením a nemám '
             'v úmysle poškodiť svojho/ich veriteľa/ov alebo zvýhodniť niektorého/ých veriteľa/ov.',
-            self.styles['Legal']))
-        story.append(Paragraph(
+            self.styles['Legal'])
+        yield static_paragraph(
             'Čestne vyhlasujem, že na území Slovenskej republiky mám centrum hlavných záujmov.',
-            self.styles['Legal']))
-        story.append(Paragraph(
+            self.styles['Legal'])
+        yield static_paragraph(
             'Čestne vyhlasujem, že všetky údaje uvedené v žiadosti sú pravdivé a úplné a som si vedomý/á '
             'právnych následkov v prípade úmyselného uvedenia nepravdivých alebo neúplných údajov.',
-            self.styles['Legal']))
+            self.styles['Legal'])
 
-        self._signature_block(story)
-        doc.build(story)
-        return filename
+        yield from self._signature_block()
 
     # ============================================
     # DOKUMENT 2: ZOZNAM MAJETKU
     # ============================================
-    def generate_majetok(self, filename):
-        doc = self._make_doc(filename)
-        story = []
+    def generate_majetok(self, filename, max_pages=None):
+        return self._render('majetok', filename, self._story_majetok, max_pages)
 
-        story.append(Paragraph('Zoznam majetku dlžníka', self.styles['DocTitle']))
-        story.append(Spacer(1, 0.3*cm))
-        story.append(self._header_table())
-        story.append(Spacer(1, 0.3*cm))
+    def _story_majetok(self):
+        form = self.form
+        yield static_paragraph('Zoznam majetku dlžníka', self.styles['DocTitle'])
+        yield Spacer(1, 0.3*cm)
+        yield self._header_table()
+        yield Spacer(1, 0.3*cm)
 
         # Pozemky
-        story.append(Paragraph('Pozemok', self.styles['SectionH']))
-        pozemky = self._collect_dynamic('p')
-        if pozemky:
-            for i, p in enumerate(pozemky, 1):
-                story.append(self._item_header(f'Pozemok č. {i}'))
-                reg = p.get('register', 'C')
-                story.append(self._field_table([
-                    ['List vlastníctva č.:', esc(p.get('lv',''))],
-                    ['Obec:', esc(p.get('obec',''))],
-                    ['Katastrálne územie:', esc(p.get('ku',''))],
-                    ['Parcela č.:', esc(f"{p.get('parcela','')} (register {reg})")],
-                    ['Výmera (m²):', esc(p.get('vymera',''))],
-                    ['Druh pozemku:', esc(p.get('druh',''))],
-                    ['Hodnota:', esc(f"{p.get('hodnota','')} €")],
-                    ['Spoluvlastnícky podiel:', esc(p.get('podiel',''))],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Pozemok', self.styles['SectionH'])
+        yield from self._item_section('majetok', form.groups['p'], 'Pozemok', 'pozemok')
 
         # Stavby
-        story.append(Paragraph('Stavba', self.styles['SectionH']))
-        stavby = self._collect_dynamic('s')
-        if stavby:
-            for i, s in enumerate(stavby, 1):
-                story.append(self._item_header(f'Stavba č. {i}'))
-                reg = s.get('register', 'C')
-                story.append(self._field_table([
-                    ['List vlastníctva č.:', esc(s.get('lv',''))],
-                    ['Obec:', esc(s.get('obec',''))],
-                    ['Katastrálne územie:', esc(s.get('ku',''))],
-                    ['Súpisné číslo:', esc(s.get('supisne',''))],
-                    ['Orientačné číslo:', esc(s.get('orient',''))],
-                    ['Na pozemku parcelné číslo:', esc(f"{s.get('parcela','')} (register {reg})")],
-                    ['Popis stavby:', esc(s.get('popis',''))],
-                    ['Hodnota:', esc(f"{s.get('hodnota','')} €")],
-                    ['Spoluvlastnícky podiel:', esc(s.get('podiel',''))],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Stavba', self.styles['SectionH'])
+        yield from self._item_section('majetok', form.groups['s'], 'Stavba', 'stavba')
 
         # Byty
-        story.append(Paragraph('Byt a nebytový priestor', self.styles['SectionH']))
-        byty = self._collect_dynamic('b')
-        if byty:
-            for i, b in enumerate(byty, 1):
-                story.append(self._item_header(f'Byt č. {i}'))
-                reg = b.get('register', 'C')
-                story.append(self._field_table([
-                    ['List vlastníctva č.:', esc(b.get('lv',''))],
-                    ['Obec:', esc(b.get('obec',''))],
-                    ['Katastrálne územie:', esc(b.get('ku',''))],
-                    ['Vchod:', esc(b.get('vchod',''))],
-                    ['Poschodie:', esc(b.get('poschodie',''))],
-                    ['Číslo bytu:', esc(b.get('cislo',''))],
-                    ['Súpisné číslo:', esc(b.get('supisne',''))],
-                    ['Orientačné číslo:', esc(b.get('orient',''))],
-                    ['Na pozemku parcelné číslo:', esc(f"{b.get('parcela','')} (register {reg})")],
-                    ['Druh pozemku:', esc(b.get('druh',''))],
-                    ['Popis stavby:', esc(b.get('popisStavby',''))],
-                    ['Podiel na spoločných častiach:', esc(b.get('podielSpoloc',''))],
-                    ['Popis bytu:', esc(b.get('popisBytu',''))],
-                    ['Hodnota:', esc(f"{b.get('hodnota','')} €")],
-                    ['Spoluvlastnícky podiel:', esc(b.get('podiel',''))],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Byt a nebytový priestor', self.styles['SectionH'])
+        yield from self._item_section('majetok', form.groups['b'], 'Byt', 'byt')
 
         # Hnuteľné veci
-        story.append(Paragraph('Hnuteľná vec', self.styles['SectionH']))
-        hnutelne = self._collect_dynamic('h')
-        if hnutelne:
-            for i, h in enumerate(hnutelne, 1):
-                story.append(self._item_header(f'Hnuteľná vec č. {i}'))
-                story.append(self._field_table([
-                    ['Popis:', esc(h.get('popis',''))],
-                    ['Výrobné číslo / VIN:', esc(h.get('vin',''))],
-                    ['Evidenčné číslo / ŠPZ:', esc(h.get('spz',''))],
-                    ['Kde sa nachádza:', esc(h.get('kde',''))],
-                    ['Hodnota:', esc(f"{h.get('hodnota','')} €")],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Hnuteľná vec', self.styles['SectionH'])
+        yield from self._item_section('majetok', form.groups['h'], 'Hnuteľná vec', 'hnutelna')
 
         # Účty
-        story.append(Paragraph('Pohľadávka z účtu', self.styles['SectionH']))
-        ucty = self._collect_dynamic('ucet')
-        if ucty:
-            for i, u in enumerate(ucty, 1):
-                story.append(self._item_header(f'Účet č. {i}'))
-                story.append(self._field_table([
-                    ['Číslo účtu / IBAN:', esc(u.get('iban',''))],
-                    ['Banka:', esc(u.get('banka',''))],
-                    ['Zostatok:', esc(f"{u.get('zostatok','')} €")],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Pohľadávka z účtu', self.styles['SectionH'])
+        yield from self._item_section('majetok', form.groups['ucet'], 'Účet', 'ucet')
 
         # Iné
-        story.append(Paragraph('Iná majetková hodnota', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('ineMajetkoveHodnoty', '(žiadne)')), self.styles['Body']))
+        yield static_paragraph('Iná majetková hodnota', self.styles['SectionH'])
+        yield Paragraph(form.ineMajetkoveHodnoty, self.styles['Body'])
 
         # Zabezpečovacie práva
-        story.append(Paragraph('Zabezpečovacie práva k majetku', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('zabezpPrava', '(žiadne)')), self.styles['Body']))
+        yield static_paragraph('Zabezpečovacie práva k majetku', self.styles['SectionH'])
+        yield Paragraph(form.zabezpPrava, self.styles['Body'])
 
         # Súdne spory
-        story.append(Paragraph('Súdne spory súvisiace s majetkom', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('sudneSpory', 'nemám')), self.styles['Body']))
+        yield static_paragraph('Súdne spory súvisiace s majetkom', self.styles['SectionH'])
+        yield Paragraph(form.sudneSpory, self.styles['Body'])
 
         # Obydlie
-        story.append(Paragraph('Obydlie – nepostihnuteľná hodnota obydlia dlžníka', self.styles['SectionH']))
-        obydlie_typ = self.g('obydlieTyp')
+        yield static_paragraph('Obydlie – nepostihnuteľná hodnota obydlia dlžníka', self.styles['SectionH'])
+        obydlie_typ = form.obydlieTyp
         if obydlie_typ == 'nevlastnim':
-            story.append(Paragraph(
+            yield static_paragraph(
                 '☒ Vyhlasujem, že nevlastním obývateľnú vec, ktorá by mohla byť v zozname majetku '
-                'označená za obydlie.', self.styles['Body']))
+                'označená za obydlie.', self.styles['Body'])
         elif obydlie_typ == 'uplatnujem':
-            obydlie_vyber = self.g('obydlieVyber')
+            obydlie_vyber = form.obydlieVyber
             parts = obydlie_vyber.split('|') if obydlie_vyber else ['', '', '']
             typ_tabulky = parts[0] if len(parts) > 0 else ''
             cislo_polozky = parts[1] if len(parts) > 1 else ''
             popis_polozky = parts[2] if len(parts) > 2 else obydlie_vyber
-            bsm_obydlie = self.g('obydlieBSM', 'Nie')
-            story.append(Paragraph(
+            bsm_obydlie = form.obydlieBSM
+            yield Paragraph(
                 f'☒ Uplatňujem si nepostihnuteľnú hodnotu obydlia na obývateľnú vec (obydlie) '
-                f'uvedenú v tabuľke označenej ako <b>{esc(typ_tabulky)}</b>, '
-                f'číslo položky <b>{esc(cislo_polozky)}</b>.', self.styles['Body']))
+                f'uvedenú v tabuľke označenej ako <b>{typ_tabulky}</b>, '
+                f'číslo položky <b>{cislo_polozky}</b>.', self.styles['Body'])
             if popis_polozky:
-                story.append(Paragraph(f'Špecifikácia: {esc(popis_polozky)}', self.styles['Small']))
-            story.append(Spacer(1, 0.15*cm))
+                yield Paragraph(f'Špecifikácia: {popis_polozky}', self.styles['Small'])
+            yield Spacer(1, 0.15*cm)
             if bsm_obydlie == 'Áno':
-                story.append(Paragraph(
+                yield static_paragraph(
                     'Označené obydlie <b>je</b> v bezpodielovom spoluvlastníctve manželov. '
                     'Nepostihnuteľná hodnota obydlia: 20 000 € (10 000 € pre každého z manželov).',
-                    self.styles['Body']))
+                    self.styles['Body'])
             else:
-                story.append(Paragraph(
+                yield static_paragraph(
                     'Označené obydlie <b>nie je</b> v bezpodielovom spoluvlastníctve manželov. '
                     'Nepostihnuteľná hodnota obydlia: 10 000 €.',
-                    self.styles['Body']))
+                    self.styles['Body'])
         else:
-            story.append(Paragraph('☐ Neuvedené', self.styles['Body']))
+            yield static_paragraph('☐ Neuvedené', self.styles['Body'])
 
         # Záverečné vyhlásenia
-        story.append(Spacer(1, 0.3*cm))
-        story.append(Paragraph(
+        yield Spacer(1, 0.3*cm)
+        yield static_paragraph(
             'Vyhlasujem, že v súčasnosti vlastním majetok uvedený v prílohe.',
-            self.styles['Legal']))
-        story.append(Paragraph(
+            self.styles['Legal'])
+        yield static_paragraph(
             'Vyhlasujem, že všetky údaje uvedené v zozname majetku sú pravdivé, úplné a som si vedomý '
             'právnych následkov v prípade úmyselného uvedenia nepravdivých alebo neúplných údajov.',
-            self.styles['Legal']))
+            self.styles['Legal'])
 
-        self._signature_block(story)
-        doc.build(story)
-        return filename
+        yield from self._signature_block()
 
     # ============================================
     # DOKUMENT 3: HISTÓRIA MAJETKU (3 roky)
     # ============================================
-    def generate_majetok_historia(self, filename):
-        doc = self._make_doc(filename)
-        story = []
+    def generate_majetok_historia(self, filename, max_pages=None):
+        return self._render('historia', filename, self._story_majetok_historia, max_pages)
 
-        story.append(Paragraph('Zoznam majetku väčšej hodnoty, ktorý dlžník', self.styles['DocTitle']))
-        story.append(Paragraph('vlastnil v posledných troch rokoch', self.styles['DocTitle']))
-        story.append(Spacer(1, 0.3*cm))
-        story.append(self._header_table())
-        story.append(Spacer(1, 0.3*cm))
+    def _story_majetok_historia(self):
+        form = self.form
+        yield static_paragraph('Zoznam majetku väčšej hodnoty, ktorý dlžník', self.styles['DocTitle'])
+        yield static_paragraph('vlastnil v posledných troch rokoch', self.styles['DocTitle'])
+        yield Spacer(1, 0.3*cm)
+        yield self._header_table()
+        yield Spacer(1, 0.3*cm)
 
         # Hist pozemky
-        story.append(Paragraph('Pozemok', self.styles['SectionH']))
-        hp = self._collect_dynamic('hp')
-        if hp:
-            for i, p in enumerate(hp, 1):
-                story.append(self._item_header(f'Pozemok č. {i}'))
-                reg = p.get('register', 'C')
-                story.append(self._field_table([
-                    ['List vlastníctva č.:', esc(p.get('lv',''))],
-                    ['Obec:', esc(p.get('obec',''))],
-                    ['Katastrálne územie:', esc(p.get('ku',''))],
-                    ['Parcela č.:', esc(f"{p.get('parcela','')} (register {reg})")],
-                    ['Výmera (m²):', esc(p.get('vymera',''))],
-                    ['Druh pozemku:', esc(p.get('druh',''))],
-                    ['Hodnota:', esc(f"{p.get('hodnota','')} €")],
-                    ['Spoluvlastnícky podiel:', esc(p.get('podiel',''))],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Pozemok', self.styles['SectionH'])
+        yield from self._item_section('historia', form.groups['hp'], 'Pozemok', 'pozemok')
 
         # Hist stavby
-        story.append(Paragraph('Stavba', self.styles['SectionH']))
-        hs = self._collect_dynamic('hs')
-        if hs:
-            for i, s in enumerate(hs, 1):
-                story.append(self._item_header(f'Stavba č. {i}'))
-                reg = s.get('register', 'C')
-                story.append(self._field_table([
-                    ['List vlastníctva č.:', esc(s.get('lv',''))],
-                    ['Obec:', esc(s.get('obec',''))],
-                    ['Katastrálne územie:', esc(s.get('ku',''))],
-                    ['Súpisné číslo:', esc(s.get('supisne',''))],
-                    ['Orientačné číslo:', esc(s.get('orient',''))],
-                    ['Na pozemku parcelné číslo:', esc(f"{s.get('parcela','')} (register {reg})")],
-                    ['Popis stavby:', esc(s.get('popis',''))],
-                    ['Hodnota:', esc(f"{s.get('hodnota','')} €")],
-                    ['Spoluvlastnícky podiel:', esc(s.get('podiel',''))],
-                ]))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Stavba', self.styles['SectionH'])
+        yield from self._item_section(
+            'historia', form.groups['hs'], 'Stavba', 'stavba', spaced=False)
 
         # Hist byty
-        story.append(Paragraph('Byt a nebytový priestor', self.styles['SectionH']))
-        hb = self._collect_dynamic('hb')
-        if hb:
-            for i, b in enumerate(hb, 1):
-                story.append(self._item_header(f'Byt č. {i}'))
-                reg = b.get('register', 'C')
-                story.append(self._field_table([
-                    ['List vlastníctva č.:', esc(b.get('lv',''))],
-                    ['Obec:', esc(b.get('obec',''))],
-                    ['Katastrálne územie:', esc(b.get('ku',''))],
-                    ['Vchod:', esc(b.get('vchod',''))],
-                    ['Poschodie:', esc(b.get('poschodie',''))],
-                    ['Číslo bytu:', esc(b.get('cislo',''))],
-                    ['Súpisné číslo:', esc(b.get('supisne',''))],
-                    ['Orientačné číslo:', esc(b.get('orient',''))],
-                    ['Na pozemku parcelné číslo:', esc(f"{b.get('parcela','')} (register {reg})")],
-                    ['Popis bytu:', esc(b.get('popisBytu',''))],
-                    ['Hodnota:', esc(f"{b.get('hodnota','')} €")],
-                    ['Spoluvlastnícky podiel:', esc(b.get('podiel',''))],
-                ]))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Byt a nebytový priestor', self.styles['SectionH'])
+        yield from self._item_section(
+            'historia', form.groups['hb'], 'Byt', 'hist_byt', spaced=False)
 
         # Hist hnuteľné
-        story.append(Paragraph('Hnuteľná vec', self.styles['SectionH']))
-        hh = self._collect_dynamic('hh')
-        if hh:
-            for i, h in enumerate(hh, 1):
-                story.append(self._item_header(f'Hnuteľná vec č. {i}'))
-                story.append(self._field_table([
-                    ['Popis:', esc(h.get('popis',''))],
-                    ['VIN:', esc(h.get('vin',''))],
-                    ['ŠPZ:', esc(h.get('spz',''))],
-                    ['Kde sa nachádza:', esc(h.get('kde',''))],
-                    ['Hodnota:', esc(f"{h.get('hodnota','')} €")],
-                ]))
-        else:
-            story.append(Paragraph('(žiadne)', self.styles['Body']))
+        yield static_paragraph('Hnuteľná vec', self.styles['SectionH'])
+        yield from self._item_section(
+            'historia', form.groups['hh'], 'Hnuteľná vec', 'hist_hnutelna', spaced=False)
 
         # Iné
-        story.append(Paragraph('Iné (cenné papiere, pohľadávky, účty)', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('histIne', '(žiadne)')), self.styles['Body']))
+        yield static_paragraph('Iné (cenné papiere, pohľadávky, účty)', self.styles['SectionH'])
+        yield Paragraph(form.histIne, self.styles['Body'])
 
         # Zabezp. práva + spory
-        story.append(Paragraph('Zabezpečovacie práva k majetku', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('histZabezp', '(žiadne)')), self.styles['Body']))
-        story.append(Paragraph('Súdne spory súvisiace s majetkom', self.styles['SectionH']))
-        story.append(Paragraph(esc(self.g('histSpory', '(žiadne)')), self.styles['Body']))
+        yield static_paragraph('Zabezpečovacie práva k majetku', self.styles['SectionH'])
+        yield Paragraph(form.histZabezp, self.styles['Body'])
+        yield static_paragraph('Súdne spory súvisiace s majetkom', self.styles['SectionH'])
+        yield Paragraph(form.histSpory, self.styles['Body'])
 
         # Prehlásenie
-        story.append(Spacer(1, 0.3*cm))
-        story.append(Paragraph(
+        yield Spacer(1, 0.3*cm)
+        yield static_paragraph(
             'Vyhlasujem, že všetky údaje uvedené v zozname majetku väčšej hodnoty, ktorý som vlastnil '
             'v posledných troch rokoch, sú pravdivé, úplné a som si vedomý právnych následkov v prípade '
             'úmyselného uvedenia nepravdivých alebo neúplných údajov.',
-            self.styles['Legal']))
+            self.styles['Legal'])
 
-        self._signature_block(story)
-        doc.build(story)
-        return filename
+        yield from self._signature_block()
 
     # ============================================
     # DOKUMENT 4: ZOZNAM VERITEĽOV
     # ============================================
-    def generate_veritelia(self, filename):
-        doc = self._make_doc(filename)
-        story = []
-
-        story.append(Paragraph('Zoznam veriteľov dlžníka', self.styles['DocTitle']))
-        story.append(Spacer(1, 0.3*cm))
-        story.append(self._header_table())
-        story.append(Spacer(1, 0.3*cm))
-
-        veritelia = self._collect_dynamic('ver')
-        if veritelia:
-            for i, v in enumerate(veritelia, 1):
-                story.append(self._item_header(f'Veriteľ č. {i}'))
-                story.append(self._field_table([
-                    ['Názov / Meno:', esc(v.get('nazov',''))],
-                    ['IČO / Dátum narodenia:', esc(v.get('ico',''))],
-                    ['Ulica (trvalé bydlisko / sídlo):', esc(v.get('ulica',''))],
-                    ['Súpisné číslo:', esc(v.get('supisne',''))],
-                    ['Obec:', esc(v.get('obec',''))],
-                    ['PSČ:', esc(v.get('psc',''))],
-                    ['Štát:', esc(v.get('stat','SR'))],
-                ]))
-                story.append(Spacer(1, 0.2*cm))
-        else:
-            story.append(Paragraph('Žiadni veritelia neuvedení', self.styles['Body']))
+    def generate_veritelia(self, filename, max_pages=None):
+        return self._render('veritelia', filename, self._story_veritelia, max_pages)
+
+    def _story_veritelia(self):
+        form = self.form
+        yield static_paragraph('Zoznam veriteľov dlžníka', self.styles['DocTitle'])
+        yield Spacer(1, 0.3*cm)
+        yield self._header_table()
+        yield Spacer(1, 0.3*cm)
+
+        yield from self._item_section(
+            'veritelia', form.groups['ver'], 'Veriteľ', 'veritel', empty='Žiadni veritelia neuvedení')
 
         # Prehlásenie
-        story.append(Spacer(1, 0.3*cm))
-        story.append(Paragraph(
+        yield Spacer(1, 0.3*cm)
+        yield static_paragraph(
             'Vyhlasujem, že všetky údaje uvedené v zozname veriteľov sú pravdivé, úplné a že som si vedomý '
             'právnych následkov v prípade úmyselného uvedenia nepravdivých alebo neúplných údajov.',
-            self.styles['Legal']))
+            self.styles['Legal'])
 
-        self._signature_block(story)
-        doc.build(story)
-        return filename
+        yield from self._signature_block()
 
-    def generate_all(self, output_dir='.'):
-        meno = self.g('meno', 'Dlznik')
-        priezvisko = self.g('priezvisko', 'Neznamy')
-        files = {
-            'zivotopis': f"{output_dir}/Zivotopis_{meno}_{priezvisko}.pdf",
-            'majetok': f"{output_dir}/Majetok_{meno}_{priezvisko}.pdf",
-            'historia': f"{output_dir}/Majetok_Historia_{meno}_{priezvisko}.pdf",
-            'veritelia': f"{output_dir}/Veritelia_{meno}_{priezvisko}.pdf",
+    # ============================================
+    # SPOJENÝ DOKUMENT (všetky 4 v jednom PDF)
+    # ============================================
+    def generate_combined(self, filename, max_pages=None):
+        """All four documents in one PDF, each on a new page under its own outline entry.
+        Fonts are embedded once instead of four times, so the file is much smaller."""
+        stories = {
+            'zivotopis': self._story_zivotopis,
+            'majetok': self._story_majetok,
+            'historia': self._story_majetok_historia,
+            'veritelia': self._story_veritelia,
         }
-        self.generate_zivotopis(files['zivotopis'])
-        self.generate_majetok(files['majetok'])
-        self.generate_majetok_historia(files['historia'])
-        self.generate_veritelia(files['veritelia'])
-        return files
 
+        def build_story():
+            for i, (key, build) in enumerate(stories.items()):
+                if i:
+                    yield PageBreak()
+                yield _Bookmark(key, DOCUMENT_TITLES[key])
+                yield from build()
+
+        return self._render('combined', filename, build_story, max_pages)
+
+    def combined_file_name(self):
+        return f"{COMBINED_PREFIX}_{self.form.file_stem}.pdf"
+
+    def file_names(self):
+        """Output file name of every document, keyed like DOCUMENTS"""
+        return {key: f"{prefix}_{self.form.file_stem}.pdf" for key, (prefix, _) in DOCUMENTS.items()}
+
+    def generate_all(self, output_dir='.', parallel=False, cache=None):
+        """Render all four documents. With parallel=True each document is built
+        in its own process of a shared pool, so the builds are not serialized by the GIL.
+        With a cache the PDFs go through generate_all_bytes and are written from its result."""
+        files = {key: f"{output_dir}/{name}" for key, name in self.file_names().items()}
+        if cache is not None:
+            pdfs = self.generate_all_bytes(parallel=parallel, cache=cache)
+            for key, path in files.items():
+                with open(path, 'wb') as f:
+                    f.write(pdfs[os.path.basename(path)])
+        elif parallel:
+            pool = _get_process_pool()
+            traced = self.trace.spans is not None
+            futures = [pool.submit(_render_document, self.data, method, files[key], self.options, traced)
+                       for key, (_, method) in DOCUMENTS.items()]
+            for future in futures:
+                _, spans = future.result()
+                if spans:
+                    self.trace.spans.extend(spans)
+        else:
+            for key, (_, method) in DOCUMENTS.items():
+                getattr(self, method)(files[key])
+        return files
 
-if __name__ == '__main__':
-    if len(sys.argv) > 1:
-        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+    def generate_all_bytes(self, parallel=False, cache=None, merged=False):
+        """Render all four documents in memory, returns {file name: PDF bytes} in DOCUMENTS order.
+        With a MemoryRenderCache or DiskRenderCache each document is cached under its own
+        dependency fingerprint, so only documents whose inputs changed are rendered again.
+        With merged=True the result is the single generate_combined PDF instead."""
+        if merged:
+            return self._generate_combined_bytes(cache)
+
+        names = self.file_names()
+        result = {}
+        missing = {}  # document -> cache key (None without cache)
+        if cache is not None:
+            with self.trace.span('cache') as meta:
+                for key in DOCUMENTS:
+                    cache_key = render_cache_key(self.data, self.signature_date, key, self.compact, self.dense)
+                    cached = cache.get(cache_key)
+                    if cached is not None and names[key] in cached:
+                        result[names[key]] = cached[names[key]]
+                    else:
+                        missing[key] = cache_key
+                meta['hits'] = self.cache_hits = [key for key in DOCUMENTS if key not in missing]
+        else:
+            missing = dict.fromkeys(DOCUMENTS)
+
+        if parallel and len(missing) > 1:
+            pool = _get_process_pool()
+            traced = self.trace.spans is not None
+            futures = {key: pool.submit(_render_document_bytes, self.data, DOCUMENTS[key][1], self.options, traced)
+                       for key in missing}
+            for key, future in futures.items():
+                result[names[key]], spans = future.result()
+                if spans:
+                    self.trace.spans.extend(spans)
+        else:
+            for key in missing:
+                buf = io.BytesIO()
+                getattr(self, DOCUMENTS[key][1])(buf)
+                result[names[key]] = buf.getvalue()
+
+        for key, cache_key in missing.items():
+            if cache_key is not None:
+                cache.put(cache_key, {names[key]: result[names[key]]})
+        return {names[key]: result[names[key]] for key in DOCUMENTS}
+
+
+    def _generate_combined_bytes(self, cache=None):
+        name = self.combined_file_name()
+        cache_key = None
+        if cache is not None:
+            with self.trace.span('cache') as meta:
+                cache_key = render_cache_key(self.data, self.signature_date, 'combined', self.compact, self.dense)
+                cached = cache.get(cache_key)
+                meta['hits'] = self.cache_hits = ['combined'] if cached and name in cached else []
+            if meta['hits']:
+                return {name: cached[name]}
+        buf = io.BytesIO()
+        self.generate_combined(buf)
+        result = {name: buf.getvalue()}
+        if cache_key is not None:
+            cache.put(cache_key, result)
+        return result
+
+    def prerender(self, cache, parallel=False, merged=False):
+        """Render the documents missing from cache into it, without returning them, e.g. after
+        each saved draft, so the final submit finds unchanged documents ready and renders only
+        the stale ones. Returns the keys rendered now."""
+        if cache is None:
+            raise ValueError('Predrenderovanie potrebuje cache renderov')
+        self.generate_all_bytes(parallel=parallel, cache=cache, merged=merged)
+        return [key for key in (['combined'] if merged else DOCUMENTS) if key not in self.cache_hits]
+
+    def preview(self, document, max_pages=None, thumbnail=None, cache=None):
+        """Render one document for a preview, returns {file name: bytes} with a single entry.
+
+        max_pages stops the layout after that many pages (<name>_nahlad.pdf). thumbnail=<width px>
+        returns a PNG of page 1 instead (rasterize_first_page). The whole document goes through
+        cache under the same key as generate_all_bytes, so previews of a prerendered draft are
+        cache hits and a previewed document is not rendered again on submit.
+        """
+        if document not in DOCUMENTS:
+            raise ValueError(f'Neznámy dokument {document!r}, možnosti: {", ".join(DOCUMENTS)}')
+        name = self.file_names()[document]
+        stem = name[:-len('.pdf')]
+        render = getattr(self, DOCUMENTS[document][1])
+
+        def document_bytes(pages=None):
+            buf = io.BytesIO()
+            render(buf, max_pages=pages)
+            return buf.getvalue()
+
+        if max_pages and not thumbnail:
+            return {f'{stem}_nahlad.pdf': document_bytes(max_pages)}
+
+        pdf = cache_key = None
+        self.cache_hits = []
+        if cache is not None:
+            with self.trace.span('cache') as meta:
+                cache_key = render_cache_key(self.data, self.signature_date, document, self.compact, self.dense)
+                cached = cache.get(cache_key)
+                if cached is not None and name in cached:
+                    pdf = cached[name]
+                    self.cache_hits = [document]
+                meta['hits'] = self.cache_hits
+
+        if thumbnail:
+            # Na náhľad 1. strany stačí 1 strana, celý dokument len keď už je v cache
+            pdf = pdf or document_bytes(1)
+            with self.trace.span('thumbnail') as meta:
+                meta['width'] = thumbnail
+                return {f'{stem}_nahlad.png': rasterize_first_page(pdf, thumbnail)}
+
+        if pdf is None:
+            pdf = document_bytes()
+            if cache_key is not None:
+                cache.put(cache_key, {name: pdf})
+        return {name: pdf}
+
+
+# Predvolená šírka PNG náhľadu 1. strany (px)
+THUMBNAIL_WIDTH = 240
+
+
+class PreviewUnavailableError(RuntimeError):
+    """No rasterizer for PNG previews is installed"""
+
+
+def rasterize_first_page(pdf, width):
+    """PNG of the first page of pdf, width pixels wide. Uses PyMuPDF when installed,
+    otherwise the pdftoppm binary from poppler-utils; neither is a hard dependency."""
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+    if fitz is not None:
+        with fitz.open(stream=pdf, filetype='pdf') as doc:
+            page = doc[0]
+            zoom = width / page.rect.width
+            return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes('png')
+
+    import shutil, subprocess
+    if not shutil.which('pdftoppm'):
+        raise PreviewUnavailableError('Náhľad PNG potrebuje PyMuPDF (pip install pymupdf) alebo pdftoppm (poppler-utils)')
+    # PDF zo stdin (-), PNG na stdout (bez výstupného mena)
+    return subprocess.run(
+        ['pdftoppm', '-png', '-singlefile', '-f', '1', '-l', '1', '-scale-to-x', str(width), '-scale-to-y', '-1', '-'],
+        input=pdf, capture_output=True, check=True).stdout
+
+
+def run_instrumented(render, trace_target=None, profile_path=None, **meta):
+    """Call render(trace) with an optional RenderTrace (emitted to trace_target) and cProfile dump"""
+    trace = RenderTrace(**meta) if trace_target else None
+    profiler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+    try:
+        if profiler:
+            return profiler.runcall(render, trace)
+        return render(trace)
+    finally:
+        if trace:
+            trace.emit(trace_target)
+        if profiler:
+            profiler.dump_stats(profile_path)
+
+
+def serve(stdin=None, stdout=None, parallel=False, trace_target=None, profile_path=None, cache=None,
+          merged=False, compact=False, dense=()):
+    """Worker mode: one JSON request per line on stdin, one framed reply per request on stdout.
+
+    Request:  {"id": ..., "data": {...}, "parallel": false, "merged": false, "compact": false,
+               "dense": ["veritelia", ...] or true, "signature_date": "DD.MM.YYYY", "prerender": false}
+    Reply:    header line {"id": ..., "ok": true, "cached": [...], "files": [{"name": ..., "size": N}, ...]}
+              followed by the PDF bytes, or just {"id": ..., "ok": false, "error": "..."}.
+              With "prerender" the documents only go into the cache (PDFGenerator.prerender)
+              and the reply is {"id": ..., "ok": true, "cached": [...], "rendered": [...]}.
+              With "preview": {"document": "veritelia", "pages": N, "thumbnail": WIDTH} the reply
+              carries the one file of PDFGenerator.preview.
+    Hello:    before reading any request the worker writes {"id": null, "ok": true,
+              "documents": [...]}, the DOCUMENTS it renders, so server.js keeps no copy of them.
+    Nothing touches the filesystem. ReportLab, fonts and styles are loaded before the first
+    request is read, so even the first one is rendered warm. With profile_path each request is
+    dumped to <profile_path>.<id>.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    get_style_registry()
+    write_frame(stdout, {'id': None, 'ok': True, 'documents': list(DOCUMENTS)})
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get('id')
+            req_parallel = req.get('parallel', parallel)
+            req_merged = req.get('merged', merged)
+            generators = []
+
+            def render(trace):
+                generator = PDFGenerator(req['data'], trace=trace, signature_date=req.get('signature_date'),
+                                         compact=req.get('compact', compact), dense=req.get('dense', dense))
+                generators.append(generator)
+                if req.get('prerender'):
+                    return generator.prerender(cache, parallel=req_parallel, merged=req_merged)
+                if req.get('preview'):
+                    preview = req['preview']
+                    return generator.preview(preview['document'], max_pages=preview.get('pages'),
+                                             thumbnail=preview.get('thumbnail'), cache=cache)
+                return generator.generate_all_bytes(parallel=req_parallel, cache=cache, merged=req_merged)
+
+            result = run_instrumented(render, trace_target, profile_path and f'{profile_path}.{req_id}', id=req_id)
+        except Exception as e:
+            write_frame(stdout, {'id': req_id, 'ok': False, 'error': f'{type(e).__name__}: {e}'})
+            continue
+        header = {'id': req_id, 'ok': True, 'cached': generators[0].cache_hits}
+        if req.get('prerender'):
+            write_frame(stdout, dict(header, rendered=result))
+        else:
+            write_frame(stdout, header, result.items())
+
+
+def iter_batch_input(source):
+    """Yield (name, path, line) for every payload in a JSON-lines file or a directory of *.json files,
+    lazily, so the input is never held in memory as a whole"""
+    if os.path.isdir(source):
+        for entry in sorted(os.scandir(source), key=lambda e: e.name):
+            if entry.is_file() and entry.name.endswith('.json'):
+                yield entry.name[:-len('.json')], entry.path, None
+        return
+    with open(source, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            if line.strip():
+                yield f'{lineno:06d}', None, line
+
+
+def _batch_worker_init():
+    """Load ReportLab and warm the style registry once per batch worker"""
+    get_style_registry()
+
+
+def _batch_render(name, path, line, output_root, compact=False, dense=()):
+    """Render one debtor's document set into output_root/name, never raising"""
+    start = time.perf_counter()
+    try:
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = json.loads(line)
+        # Adresár až po overení údajov, aby neplatný riadok nenechal po sebe prázdny adresár
+        generator = PDFGenerator(data, compact=compact, dense=dense)
+        output_dir = os.path.join(output_root, name)
+        os.makedirs(output_dir, exist_ok=True)
+        files = generator.generate_all(output_dir)
+        return {'name': name, 'ok': True, 'seconds': round(time.perf_counter() - start, 3),
+                'files': list(files.values())}
+    except Exception as e:
+        return {'name': name, 'ok': False, 'seconds': round(time.perf_counter() - start, 3),
+                'error': f'{type(e).__name__}: {e}'}
+
+
+def run_batch(source, output_root, jobs=None, report_file=None, compact=False, dense=()):
+    """Render every payload from source on a process pool, streaming input and results.
+
+    At most 2 * jobs payloads are in flight at any time. Every result is appended as one
+    JSON line to report_file (default <output_root>/batch_report.jsonl). Returns a summary dict.
+    """
+    from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+    jobs = jobs or os.cpu_count() or 1
+    os.makedirs(output_root, exist_ok=True)
+    report_file = report_file or os.path.join(output_root, 'batch_report.jsonl')
+    summary = {'ok': 0, 'failed': 0, 'failures': [], 'seconds': 0.0}
+    start = time.perf_counter()
+
+    with open(report_file, 'w', encoding='utf-8') as report, \
+            ProcessPoolExecutor(max_workers=jobs, initializer=_batch_worker_init) as pool:
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                result = future.result()
+                report.write(json.dumps(result, ensure_ascii=False) + '\n')
+                if result['ok']:
+                    summary['ok'] += 1
+                else:
+                    summary['failed'] += 1
+                    summary['failures'].append((result['name'], result['error']))
+
+        for name, path, line in iter_batch_input(source):
+            pending.add(pool.submit(_batch_render, name, path, line, output_root, compact, dense))
+            if len(pending) >= 2 * jobs:
+                drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    summary['report'] = report_file
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generátor PDF dokumentov pre OddlženieOnline.sk')
+    parser.add_argument('data_file', nargs='?', help='JSON s údajmi z formulára (- = stdin)')
+    parser.add_argument('output_dir', nargs='?', default='/tmp', help='Cieľový adresár pre PDF')
+    parser.add_argument('--serve', action='store_true',
+        help='Worker režim: JSON požiadavky po riadkoch na stdin, odpovede na stdout')
+    parser.add_argument('--parallel', action='store_true',
+        help='Renderovať 4 dokumenty paralelne v samostatných procesoch')
+    parser.add_argument('--merged', action='store_true',
+        help='Jeden PDF so všetkými 4 dokumentmi a záložkami namiesto 4 súborov')
+    parser.add_argument('--compact', action='store_true',
+        help='Kompaktný výstup: menšie PDF (podmnožiny fontov, bez ASCII85 a metadát), rovnaký vzhľad')
+    parser.add_argument('--dense', nargs='*', choices=DENSE_DOCUMENTS, metavar='DOC',
+        help='Husté rozloženie (jedna tabuľka na skupinu) pre zadané dokumenty, bez zoznamu pre všetky: '
+             + ', '.join(DENSE_DOCUMENTS))
+    parser.add_argument('--stdout', action='store_true',
+        help='Nezapisovať súbory, poslať PDF na stdout v rovnakom rámcovaní ako --serve')
+    parser.add_argument('--trace', metavar='PATH',
+        help='Zapísať JSON trace jednotlivých fáz (- = stderr, inak pripojiť do súboru)')
+    parser.add_argument('--profile', metavar='PATH', help='Uložiť cProfile dump (pstats)')
+    parser.add_argument('--cache-dir', metavar='DIR',
+        help='Zdieľaná cache renderov na disku (inak --serve používa cache v pamäti)')
+    parser.add_argument('--cache-mb', type=int, default=64, help='Maximálna veľkosť cache v MB')
+    parser.add_argument('--cache-ttl', type=int, default=600, help='Platnosť položky cache v sekundách')
+    parser.add_argument('--no-cache', action='store_true', help='Vypnúť cache renderov')
+    parser.add_argument('--batch', nargs=2, metavar=('INPUT', 'OUTPUT_DIR'),
+        help='Dávkový režim: JSON-lines súbor alebo adresár *.json, každý dlžník do OUTPUT_DIR/<názov>')
+    parser.add_argument('--jobs', type=int, help='Počet procesov v dávkovom režime (predvolene počet CPU)')
+    parser.add_argument('--font-cache', metavar='PATH',
+        help=f'Pickle cache rozparsovaných fontov (rýchlejší štart procesu), inak ${FONT_CACHE_ENV}')
+    parser.add_argument('--preview', choices=DOCUMENTS, metavar='DOC',
+        help='Iba náhľad jedného dokumentu: ' + ', '.join(DOCUMENTS))
+    parser.add_argument('--pages', type=int, metavar='N', help='Náhľad len prvých N strán')
+    parser.add_argument('--thumbnail', type=int, nargs='?', const=THUMBNAIL_WIDTH, metavar='WIDTH',
+        help=f'Náhľad 1. strany ako PNG so šírkou WIDTH px (predvolene {THUMBNAIL_WIDTH}), '
+             'potrebuje PyMuPDF alebo pdftoppm')
+    parser.add_argument('--validate', action='store_true',
+        help='Iba skontrolovať údaje voči form_schema.json, negenerovať PDF (návratový kód 1 pri chybe)')
+    args = parser.parse_args(argv)
+    dense = DENSE_DOCUMENTS if args.dense == [] else args.dense or ()
+    if args.font_cache:
+        # Cez prostredie, aby ju zdedili aj procesy poolu a dávkoví workeri
+        os.environ[FONT_CACHE_ENV] = args.font_cache
+
+    if args.batch:
+        summary = run_batch(args.batch[0], args.batch[1], jobs=args.jobs, compact=args.compact, dense=dense)
+        total = summary['ok'] + summary['failed']
+        print(f"Dávka hotová: {summary['ok']}/{total} úspešných za {summary['seconds']} s")
+        for name, error in summary['failures']:
+            print(f"  ✗ {name}: {error}")
+        print(f"Report: {summary['report']}")
+        return 1 if summary['failed'] else 0
+
+    cache = None
+    if args.cache_dir and not args.no_cache:
+        cache = DiskRenderCache(args.cache_dir, max_bytes=args.cache_mb * 1024 * 1024, ttl=args.cache_ttl)
+
+    if args.serve:
+        if cache is None and not args.no_cache:
+            cache = MemoryRenderCache(max_bytes=args.cache_mb * 1024 * 1024, ttl=args.cache_ttl)
+        serve(parallel=args.parallel, trace_target=args.trace, profile_path=args.profile, cache=cache,
+              merged=args.merged, compact=args.compact, dense=dense)
+        return
+
+    if args.data_file == '-':
+        data = json.load(sys.stdin.buffer)
+    elif args.data_file:
+        with open(args.data_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
     else:
         data = {'meno': 'Test', 'priezvisko': 'User', 'rodneCislo': '000000/0000',
                 'datumNarodenia': '01.01.2000', 'email': 'test@test.sk', 'telefon': '+421900000000',
                 'ulica': 'Testová', 'cisloDomu': '1', 'obec': 'Nitra', 'psc': '94901'}
 
-    generator = PDFGenerator(data)
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else '/tmp'
-    files = generator.generate_all(output_dir)
+    if args.validate:
+        try:
+            get_form_schema().compile(data)
+        except FormValidationError as e:
+            print(f'Neplatné údaje formulára ({len(e.errors)}):')
+            for error in e.errors:
+                print(f'  ✗ {error}')
+            return 1
+        print('OK')
+        return 0
+
+    if args.preview:
+        try:
+            files = run_instrumented(
+                lambda trace: PDFGenerator(data, trace=trace, compact=args.compact, dense=dense).preview(
+                    args.preview, max_pages=args.pages, thumbnail=args.thumbnail, cache=cache),
+                args.trace, args.profile)
+        except PreviewUnavailableError as e:
+            print(e, file=sys.stderr)
+            return 1
+        if args.stdout:
+            write_frame(sys.stdout.buffer, {'ok': True}, files.items())
+            return
+        for name, content in files.items():
+            path = os.path.join(args.output_dir, name)
+            with open(path, 'wb') as f:
+                f.write(content)
+            print(f"Náhľad: {path}")
+        return
+
+    if args.stdout:
+        pdfs = run_instrumented(
+            lambda trace: PDFGenerator(data, trace=trace, compact=args.compact, dense=dense).generate_all_bytes(
+                parallel=args.parallel, cache=cache, merged=args.merged),
+            args.trace, args.profile)
+        write_frame(sys.stdout.buffer, {'ok': True}, pdfs.items())
+        return
+    if args.merged:
+        pdfs = run_instrumented(
+            lambda trace: PDFGenerator(data, trace=trace, compact=args.compact, dense=dense).generate_all_bytes(
+                cache=cache, merged=True),
+            args.trace, args.profile)
+        files = {}
+        for name, content in pdfs.items():
+            files['combined'] = os.path.join(args.output_dir, name)
+            with open(files['combined'], 'wb') as f:
+                f.write(content)
+    else:
+        files = run_instrumented(
+            lambda trace: PDFGenerator(data, trace=trace, compact=args.compact, dense=dense).generate_all(
+                args.output_dir, parallel=args.parallel, cache=cache),
+            args.trace, args.profile)
     print("PDF dokumenty vygenerované:")
     for key, path in files.items():
         print(f"  {key}: {path}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
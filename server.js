@@ -8,6 +8,9 @@ const rateLimit = require('express-rate-limit');
 const nodemailer = require('nodemailer');
 require('dotenv').config();
 
+// Polia a limity formulára (form_schema.json), rovnaký súbor číta aj pdf_generator.py
+const { FORM_SCHEMA, validateForm } = require('./form_validation');
+
 const app = express();
 const PORT = process.env.PORT || 3000;
 
@@ -15,7 +18,7 @@ const PORT = process.env.PORT || 3000;
 app.set('trust proxy', 1);
 
 // Middleware
-app.use(express.json({ limit: '5mb' }));
+app.use(express.json({ limit: FORM_SCHEMA.limits.max_body_bytes }));
 app.use(cors({
   origin: true,
   credentials: true
@@ -115,21 +118,56 @@ const apiLimiter = rateLimit({
   max: 10,
   message: { error: 'Príliš veľa žiadostí. Skúste znova o 15 minút.' }
 });
+// Koncept sa ukladá pri každom kroku formulára, preto voľnejší limit. Platí aj pre čítanie
+// a mazanie, aby sa ID konceptov nedali hádať neobmedzene.
+const draftLimiter = rateLimit({
+  windowMs: 15 * 60 * 1000,
+  max: 120,
+  message: { error: 'Príliš veľa požiadaviek na koncepty. Skúste znova o 15 minút.' }
+});
+const previewLimiter = rateLimit({
+  windowMs: 15 * 60 * 1000,
+  max: 120,
+  message: { error: 'Príliš veľa náhľadov. Skúste znova o 15 minút.' }
+});
 
 // ============================================
-// EMAIL CONFIGURATION (Gmail SMTP)
+// EMAIL CONFIGURATION (Gmail SMTP, pool spojení)
 // ============================================
+// SMTP_HOST = iný SMTP server (napr. lokálny z bench_mail.js --smtp), inak Gmail
+const SMTP_HOST = process.env.SMTP_HOST || '';
+const SMTP_POOL_SIZE = parseInt(process.env.SMTP_POOL_SIZE, 10) || 3;
 const transporter = nodemailer.createTransport({
-  service: 'gmail',
-  auth: {
+  ...(SMTP_HOST
+    ? { host: SMTP_HOST, port: parseInt(process.env.SMTP_PORT, 10) || 587, secure: process.env.SMTP_SECURE === '1' }
+    : { service: 'gmail' }),
+  auth: process.env.GMAIL_USER ? {
     user: process.env.GMAIL_USER,
     pass: process.env.GMAIL_APP_PASSWORD
-  }
+  } : undefined,
+  // Trvalé spojenia: správy z fronty idú po už otvorených spojeniach bez nového
+  // TCP/TLS/AUTH handshaku, po maxMessages sa spojenie obnoví
+  pool: true,
+  maxConnections: SMTP_POOL_SIZE,
+  maxMessages: 100
 });
 
 const RECIPIENT_EMAIL = process.env.RECIPIENT_EMAIL || 'propertyholdinglimited@gmail.com';
 const FROM_NAME = 'OddlženieOnline.sk';
 
+// ============================================
+// VALIDÁCIA FORMULÁRA (form_validation.js)
+// ============================================
+const VALIDATION_ERRORS_SHOWN = 10;
+
+function rejectInvalidForm(res, errors) {
+  return res.status(400).json({
+    error: 'Neplatné údaje formulára',
+    details: errors.slice(0, VALIDATION_ERRORS_SHOWN),
+    total: errors.length
+  });
+}
+
 // ============================================
 // HLAVNÝ ENDPOINT - Odoslanie formulára
 // ============================================
@@ -137,29 +175,39 @@ app.post('/api/submit-form', apiLimiter, async (req, res) => {
   try {
     const formData = req.body;
 
-    // Validácia
-    if (!formData.meno || !formData.priezvisko || !formData.email) {
-      return res.status(400).json({
-        error: 'Chýbajúce povinné údaje (meno, priezvisko, email)'
+    // Validácia ešte pred zaradením do fronty
+    const errors = validateForm(formData);
+    if (errors.length) return rejectInvalidForm(res, errors);
+
+    // Admission control: pri preťažení radšej hneď odmietnuť, ako hromadiť žiadosti
+    if (jobQueue.isFull()) {
+      const retryAfter = pdfPool.retryAfter() + Math.ceil(jobQueue.stats().queued / JOB_CONCURRENCY);
+      res.set('Retry-After', String(retryAfter));
+      return res.status(503).json({
+        error: 'Server je momentálne preťažený. Skúste to znova o chvíľu.',
+        retryAfter
       });
     }
 
     console.log(`📝 Nová žiadosť: ${formData.meno} ${formData.priezvisko} (${formData.email})`);
 
-    // 1. Generovanie PDF
-    console.log('📄 Generujem PDF dokumenty...');
-    const pdfFiles = await generatePDFs(formData);
-    console.log(`✅ ${pdfFiles.length} PDF vygenerovaných`);
+    // ?draft=<id>: render pôjde na workera, ktorý má dokumenty konceptu v cache,
+    // a renderuje sa len to, čo sa od posledného uloženia konceptu zmenilo
+    const draftId = drafts.has(req.query.draft) ? req.query.draft : undefined;
 
-    // 2. Email adminovi s PDF prílohami
-    await sendEmailToAdmin(formData, pdfFiles);
+    // PDF a emaily spracuje fronta na pozadí, klient dostane hneď ID úlohy
+    const job = await jobQueue.enqueue(formData, { draftId });
 
-    // 3. Potvrdenie klientovi
-    await sendConfirmationToClient(formData);
+    if (draftId) {
+      pdfPool.cancelPrerender(draftId);
+      drafts.remove(draftId).catch(err => console.error('⚠️ Zmazanie konceptu zlyhalo:', err.message));
+    }
 
-    res.json({
+    res.status(202).json({
       success: true,
-      message: 'Žiadosť úspešne odoslaná'
+      message: 'Žiadosť úspešne prijatá',
+      jobId: job.id,
+      statusUrl: `/api/jobs/${job.id}`
     });
 
   } catch (error) {
@@ -170,71 +218,966 @@ app.post('/api/submit-form', apiLimiter, async (req, res) => {
   }
 });
 
+// Stav spracovania žiadosti
+app.get('/api/jobs/:id', (req, res) => {
+  const job = jobQueue.get(req.params.id);
+  if (!job) {
+    return res.status(404).json({ error: 'Úloha neexistuje' });
+  }
+  res.json({
+    id: job.id,
+    status: job.status,
+    step: job.step,
+    attempts: job.attempts,
+    error: job.status === 'done' ? undefined : job.error,
+    createdAt: job.createdAt,
+    updatedAt: job.updatedAt
+  });
+});
+
 // ============================================
-// PDF GENEROVANIE (Python ReportLab)
+// PDF WORKER POOL (dlhožijúce python3 --serve procesy)
 // ============================================
-async function generatePDFs(formData) {
-  const { exec } = require('child_process');
-  const fs = require('fs').promises;
+const os = require('os');
+const CPU_COUNT = Math.max(1, os.availableParallelism ? os.availableParallelism() : os.cpus().length);
+// Koľko renderov beží naraz (= počet workerov); predvolene počet CPU
+const PDF_WORKERS = parseInt(process.env.PDF_WORKERS, 10) || CPU_COUNT;
+// Koľko renderov smie čakať vo fronte, potom okamžité odmietnutie (503)
+const PDF_QUEUE_LIMIT = parseInt(process.env.PDF_QUEUE_LIMIT, 10) || PDF_WORKERS * 4;
+// Maximálny čas od zaradenia do fronty po hotové PDF
+const PDF_DEADLINE = parseInt(process.env.PDF_DEADLINE_MS, 10) || 60000;
+const PDF_PARALLEL = process.env.PDF_PARALLEL === '1';
+const PDF_TRACE = process.env.PDF_TRACE || ''; // '-' = JSON trace každého renderu na stderr, inak cesta k súboru
+// Cache renderov na disku, zdieľaná všetkými workermi: opakované odoslanie alebo nový pokus
+// nájde dokumenty bez ohľadu na to, ktorý worker ich renderoval. 0 = cache v pamäti každého workera.
+const PDF_CACHE_DIR = process.env.PDF_CACHE_DIR === '0' ? ''
+  : process.env.PDF_CACHE_DIR || path.join(os.tmpdir(), 'oddlzenie_pdf_cache');
+// Ako dlho ostane nepoužitý dokument v cache (s); koncepty ju pri každom uložení obnovia
+const PDF_CACHE_TTL = parseInt(process.env.PDF_CACHE_TTL, 10) || 0;
+// 1 = adminovi ide jeden spojený PDF so záložkami namiesto 4 súborov (menší email)
+const PDF_MERGED = process.env.PDF_MERGED === '1';
+// Kompaktný výstup (menšie prílohy, rovnaký vzhľad); 0 = pôvodný výstup reportlabu
+const PDF_COMPACT = process.env.PDF_COMPACT !== '0';
+// Husté rozloženie (jedna tabuľka na skupinu položiek): zoznam dokumentov, napr. "veritelia,majetok", alebo "all"
+const PDF_DENSE = (process.env.PDF_DENSE || '').split(',').map(s => s.trim()).filter(Boolean);
+const PDF_TIMEOUT = 30000;
+const WORKER_RESPAWN_BASE = 500;    // po zlyhanom štarte 0.5 s, 1 s, 2 s, ... max 30 s
+const WORKER_RESPAWN_MAX = 30000;
+const WORKER_MAX_START_FAILURES = 5; // toľko zlyhaných štartov za sebou => workery sa už nespúšťajú
 
-  return new Promise(async (resolve, reject) => {
-    try {
-      const tempDir = `/tmp/oddlzenie_${Date.now()}`;
-      await fs.mkdir(tempDir, { recursive: true });
+// Render odmietnutý kvôli plnej fronte alebo prekročenému termínu; retryAfter v sekundách
+class RenderRejectedError extends Error {
+  constructor(message, retryAfter) {
+    super(message);
+    this.name = 'RenderRejectedError';
+    this.retryAfter = retryAfter;
+  }
+}
+
+// Chyba z workera; neplatné údaje sa opakovaním neopravia, preto permanent
+function workerError(message) {
+  const error = new Error(message || 'PDF generovanie zlyhalo');
+  error.permanent = /^FormValidationError\b/.test(error.message);
+  return error;
+}
+
+// Kĺzavé okno posledných meraní (ms) pre metriky
+class RollingStats {
+  constructor(size = 200) {
+    this.size = size;
+    this.values = [];
+  }
+
+  add(value) {
+    this.values.push(value);
+    if (this.values.length > this.size) this.values.shift();
+  }
+
+  summary() {
+    if (!this.values.length) return { count: 0, avgMs: 0, p95Ms: 0, maxMs: 0 };
+    const sorted = [...this.values].sort((a, b) => a - b);
+    const sum = sorted.reduce((a, b) => a + b, 0);
+    return {
+      count: sorted.length,
+      avgMs: Math.round(sum / sorted.length),
+      p95Ms: sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * 0.95))],
+      maxMs: sorted[sorted.length - 1]
+    };
+  }
+}
 
-      const dataFile = path.join(tempDir, 'data.json');
-      await fs.writeFile(dataFile, JSON.stringify(formData, null, 2));
+class PdfWorkerPool {
+  constructor(size, { queueLimit, deadline }) {
+    this.size = size;
+    this.queueLimit = queueLimit;
+    // Náhľady smú obsadiť len polovicu fronty, renderom odoslaných žiadostí ostane vždy miesto
+    this.previewQueueLimit = Math.max(1, Math.floor(queueLimit / 2));
+    this.deadline = deadline;
+    this.workers = [];
+    this.queue = [];
+    this.nextId = 1;
+    this.counters = { completed: 0, failed: 0, rejected: 0, expired: 0 };
+    this.prerenders = new Map(); // koncept -> údaje čakajúce na voľného workera
+    this.prerenderCounters = { done: 0, failed: 0, coalesced: 0, dropped: 0 };
+    this.documents = { rendered: 0, prerendered: 0, cached: 0 };
+    this.waitStats = new RollingStats();
+    this.renderStats = new RollingStats();
+    this.previewStats = new RollingStats();
+    this.restarts = 0;
+    this.startFailures = 0; // workery za sebou ukončené skôr, než poslali prvú odpoveď
+    this.pendingSpawns = 0;
+    this.documentNames = null; // z úvodnej odpovede workera (pdf_generator.DOCUMENTS)
+    for (let i = 0; i < size; i++) this.workers.push(this._spawn());
+  }
+
+  _spawn() {
+    const { spawn } = require('child_process');
+
+    const pythonScript = path.join(__dirname, 'pdf_generator.py');
+    const args = [pythonScript, '--serve'];
+    if (PDF_PARALLEL) args.push('--parallel');
+    if (PDF_TRACE) args.push('--trace', PDF_TRACE);
+    if (PDF_CACHE_DIR) args.push('--cache-dir', PDF_CACHE_DIR);
+    if (PDF_CACHE_TTL) args.push('--cache-ttl', String(PDF_CACHE_TTL));
+    if (PDF_COMPACT) args.push('--compact');
+    if (PDF_DENSE.length) args.push('--dense', ...(PDF_DENSE.includes('all') ? [] : PDF_DENSE));
+    const proc = spawn('python3', args, { stdio: ['pipe', 'pipe', 'inherit'] });
+    const worker = {
+      proc, job: null, timer: null, dead: false, replied: false,
+      chunks: [], buffered: 0, header: null, need: 0
+    };
+
+    proc.stdout.on('data', (chunk) => this._onData(worker, chunk));
+    proc.stdin.on('error', (err) => console.error('PDF worker stdin:', err.message));
+
+    // Pri zlyhanom spustení (napr. ENOENT) 'exit' nemusí prísť, nahradiť treba aj odtiaľto
+    proc.on('error', (err) => {
+      console.error('PDF worker error:', err.message);
+      this._replace(worker, err.code || err.message);
+    });
+    proc.on('exit', (code, signal) => this._replace(worker, signal || code));
+
+    return worker;
+  }
 
-      const pythonScript = path.join(__dirname, 'pdf_generator.py');
-      const command = `python3 "${pythonScript}" "${dataFile}" "${tempDir}"`;
+  // Mŕtvy worker nahradí novým. Kým žiadny worker neodpovedal, každý ďalší štart čaká
+  // exponenciálne dlhšie; po WORKER_MAX_START_FAILURES zlyhaniach za sebou sa už nespúšťa.
+  _replace(worker, reason) {
+    if (worker.dead) return;
+    worker.dead = true;
+    if (worker.proc.exitCode === null && worker.proc.signalCode === null) worker.proc.kill('SIGKILL');
+    const job = worker.job;
+    this._finish(worker);
+    if (job) job.reject(new Error(`PDF worker skončil (${reason})`));
 
-      exec(command, { cwd: tempDir, timeout: 30000 }, async (error, stdout, stderr) => {
-        if (error) {
-          console.error('PDF generation error:', error.message);
-          if (stderr) console.error('stderr:', stderr);
-          reject(new Error('PDF generovanie zlyhalo'));
+    if (!worker.replied) this.startFailures++;
+    if (this.startFailures >= WORKER_MAX_START_FAILURES) {
+      console.error(`❌ PDF worker zlyhal ${this.startFailures}x za sebou pri štarte, ďalší nespúšťam`);
+      this._rejectIfNoWorkers();
+      return;
+    }
+    const delay = this.startFailures
+      ? Math.min(WORKER_RESPAWN_MAX, WORKER_RESPAWN_BASE * 2 ** (this.startFailures - 1))
+      : 0;
+    this.restarts++;
+    this.pendingSpawns++;
+    setTimeout(() => {
+      this.pendingSpawns--;
+      const idx = this.workers.indexOf(worker);
+      if (idx !== -1) this.workers[idx] = this._spawn();
+      this._dispatch();
+    }, delay);
+  }
+
+  // Bez živého workera a bez plánovaného štartu by čakajúce rendery len vypršali
+  _rejectIfNoWorkers() {
+    if (this.pendingSpawns || this.workers.some(w => !w.dead)) return;
+    for (const job of this.queue.splice(0)) {
+      clearTimeout(job.deadlineTimer);
+      job.reject(new Error('Žiadny PDF worker nebeží'));
+    }
+  }
+
+  // Odpoveď workera: JSON hlavička na jednom riadku, potom PDF bajty podľa veľkostí v hlavičke
+  _onData(worker, chunk) {
+    worker.chunks.push(chunk);
+    worker.buffered += chunk.length;
+
+    while (true) {
+      if (!worker.header) {
+        const buf = Buffer.concat(worker.chunks, worker.buffered);
+        const nl = buf.indexOf(10);
+        if (nl === -1) {
+          worker.chunks = [buf];
           return;
         }
+        try {
+          worker.header = JSON.parse(buf.subarray(0, nl).toString('utf8'));
+        } catch (e) {
+          console.error('PDF worker: neplatná hlavička odpovede, reštartujem');
+          worker.proc.kill('SIGKILL');
+          return;
+        }
+        if (!worker.replied) {
+          worker.replied = true;
+          this.startFailures = 0;
+        }
+        worker.need = (worker.header.files || []).reduce((n, f) => n + f.size, 0);
+        const rest = buf.subarray(nl + 1);
+        worker.chunks = [rest];
+        worker.buffered = rest.length;
+      }
 
-        console.log('PDF output:', stdout.trim());
-
-        const meno = formData.meno || 'Dlznik';
-        const priezvisko = formData.priezvisko || 'Neznamy';
-
-        const pdfNames = [
-          `Zivotopis_${meno}_${priezvisko}.pdf`,
-          `Majetok_${meno}_${priezvisko}.pdf`,
-          `Majetok_Historia_${meno}_${priezvisko}.pdf`,
-          `Veritelia_${meno}_${priezvisko}.pdf`
-        ];
-
-        const attachments = [];
-        for (const name of pdfNames) {
-          const filePath = path.join(tempDir, name);
-          try {
-            const content = await fs.readFile(filePath);
-            attachments.push({
-              filename: name,
-              content: content
-            });
-          } catch (err) {
-            console.error(`⚠️ Súbor nenájdený: ${name}`);
-          }
+      if (worker.buffered < worker.need) return;
+
+      const buf = Buffer.concat(worker.chunks, worker.buffered);
+      const reply = worker.header;
+      const files = [];
+      let offset = 0;
+      for (const f of reply.files || []) {
+        files.push({ filename: f.name, content: buf.subarray(offset, offset + f.size) });
+        offset += f.size;
+      }
+      const rest = buf.subarray(offset);
+      worker.chunks = [rest];
+      worker.buffered = rest.length;
+      worker.header = null;
+      worker.need = 0;
+
+      if (reply.documents) this.documentNames = reply.documents;
+      const job = worker.job;
+      if (job && reply.id === job.id) {
+        this._finish(worker);
+        if (reply.ok) {
+          this.documents.cached += (reply.cached || []).length;
+          job.resolve(files, reply);
+        } else {
+          job.reject(workerError(reply.error));
+        }
+      }
+    }
+  }
+
+  _finish(worker) {
+    clearTimeout(worker.timer);
+    worker.timer = null;
+    worker.job = null;
+    setImmediate(() => this._dispatch());
+  }
+
+  _dispatch() {
+    let idle = this.workers.filter(w => !w.job && !w.dead);
+    while (idle.length && this.queue.length) {
+      const job = this.queue.shift();
+      clearTimeout(job.deadlineTimer);
+      // Worker konceptu má jeho dokumenty v cache; keď je obsadený, poslúži ktorýkoľvek voľný
+      const preferred = job.affinity && this._workerFor(job.affinity);
+      const worker = idle.includes(preferred) ? preferred : idle[0];
+      idle = idle.filter(w => w !== worker);
+      job.startedAt = Date.now();
+      this.waitStats.add(job.startedAt - job.enqueuedAt);
+      this._start(worker, job, Math.max(1000, Math.min(PDF_TIMEOUT, job.deadline - job.startedAt)));
+    }
+
+    // Koncepty len na workeroch, na ktoré nečaká žiadny render. Bez zdieľanej cache na disku
+    // iba na workeri konceptu, inde by výsledok pri odoslaní nenašiel.
+    for (const [key, data] of this.prerenders) {
+      if (!idle.length) return;
+      const worker = PDF_CACHE_DIR ? idle[0] : this._workerFor(key);
+      if (!idle.includes(worker)) continue;
+      this.prerenders.delete(key);
+      idle = idle.filter(w => w !== worker);
+      this._start(worker, this._prerenderJob(data), PDF_TIMEOUT);
+    }
+  }
+
+  _start(worker, job, timeout) {
+    worker.job = job;
+    worker.timer = setTimeout(() => {
+      console.error(`PDF worker timeout (job ${job.id}), reštartujem`);
+      worker.proc.kill('SIGKILL');
+    }, timeout);
+    const { id, data, merged, prerender, preview } = job;
+    worker.proc.stdin.write(JSON.stringify({ id, data, merged, prerender, preview }) + '\n');
+  }
+
+  // Stály worker pre koncept (rovnaký index aj po reštarte workera)
+  _workerFor(key) {
+    const hash = require('crypto').createHash('sha1').update(key).digest();
+    return this.workers[hash.readUInt32BE(0) % this.workers.length];
+  }
+
+  _prerenderJob(data) {
+    return {
+      id: this.nextId++,
+      data,
+      merged: PDF_MERGED,
+      prerender: true,
+      resolve: (files, reply) => {
+        this.prerenderCounters.done++;
+        this.documents.prerendered += reply.rendered.length;
+      },
+      reject: (err) => {
+        this.prerenderCounters.failed++;
+        console.error('⚠️ Predrenderovanie konceptu zlyhalo:', err.message);
+      }
+    };
+  }
+
+  // Odhad, o koľko sekúnd sa uvoľní miesto vo fronte
+  retryAfter() {
+    const avg = this.renderStats.summary().avgMs || 2000;
+    return Math.max(1, Math.ceil(((this.queue.length + 1) * avg) / this.size / 1000));
+  }
+
+  // Vráti [{ filename, content: Buffer }] priamo z pamäte workera (merged => jeden spojený PDF).
+  // Pri plnej fronte odmietne hneď, čakanie dlhšie ako deadline (ms od teraz) tiež odmietne.
+  // affinity = ID konceptu, ktorého dokumenty sú už v cache jeho workera.
+  // preview = { document, pages, thumbnail }: iba jeden súbor náhľadu (PDFGenerator.preview).
+  // Čakajúce náhľady nezaberú miesto renderom žiadostí, tie ich vo fronte predbehnú.
+  render(data, { deadline = this.deadline, merged = PDF_MERGED, affinity, preview } = {}) {
+    if (!this.pendingSpawns && !this.workers.some(w => !w.dead)) {
+      this.counters.failed++;
+      return Promise.reject(new Error('Žiadny PDF worker nebeží'));
+    }
+    const waiting = preview ? this.queue.length : this.queue.filter(job => !job.preview).length;
+    if (waiting >= (preview ? this.previewQueueLimit : this.queueLimit)) {
+      this.counters.rejected++;
+      return Promise.reject(new RenderRejectedError('Fronta PDF renderov je plná', this.retryAfter()));
+    }
+    return new Promise((resolve, reject) => {
+      const job = {
+        id: this.nextId++,
+        data,
+        merged,
+        affinity,
+        preview,
+        enqueuedAt: Date.now(),
+        resolve: (files, reply) => {
+          this.counters.completed++;
+          this.documents.rendered += files.length - (reply.cached || []).length;
+          // Náhľady sú oveľa rýchlejšie, v renderTime by skresľovali odhad Retry-After
+          (preview ? this.previewStats : this.renderStats).add(Date.now() - job.startedAt);
+          resolve(files);
+        },
+        reject: (err) => {
+          this.counters.failed++;
+          reject(err);
+        }
+      };
+      job.deadline = job.enqueuedAt + deadline;
+      job.deadlineTimer = setTimeout(() => {
+        const idx = this.queue.indexOf(job);
+        if (idx === -1) return;
+        this.queue.splice(idx, 1);
+        this.counters.expired++;
+        reject(new RenderRejectedError('Render nezačal pred termínom', this.retryAfter()));
+      }, deadline);
+      const firstPreview = preview ? -1 : this.queue.findIndex(queued => queued.preview);
+      if (firstPreview === -1) this.queue.push(job);
+      else this.queue.splice(firstPreview, 0, job);
+      this._dispatch();
+    });
+  }
+
+  // Rozpracovaný koncept predrenderovať do cache, keď je worker voľný. Novšia verzia
+  // toho istého konceptu nahradí čakajúcu; pri odoslaní sa renderuje len zvyšok.
+  prerender(key, data) {
+    if (this.prerenders.has(key)) {
+      this.prerenderCounters.coalesced++;
+    } else if (this.prerenders.size >= this.queueLimit) {
+      this.prerenderCounters.dropped++;
+      return;
+    }
+    this.prerenders.set(key, data);
+    this._dispatch();
+  }
+
+  cancelPrerender(key) {
+    this.prerenders.delete(key);
+  }
+
+  metrics() {
+    return {
+      workers: this.size,
+      alive: this.workers.filter(w => !w.dead).length,
+      busy: this.workers.filter(w => w.job).length,
+      restarts: this.restarts,
+      startFailures: this.startFailures,
+      queueDepth: this.queue.length,
+      queueLimit: this.queueLimit,
+      previewQueueLimit: this.previewQueueLimit,
+      ...this.counters,
+      prerender: { pending: this.prerenders.size, ...this.prerenderCounters },
+      documents: this.documents,
+      waitTime: this.waitStats.summary(),
+      renderTime: this.renderStats.summary(),
+      previewTime: this.previewStats.summary()
+    };
+  }
+}
+
+const pdfPool = new PdfWorkerPool(PDF_WORKERS, { queueLimit: PDF_QUEUE_LIMIT, deadline: PDF_DEADLINE });
+
+// ============================================
+// PDF GENEROVANIE (Python ReportLab)
+// ============================================
+async function generatePDFs(formData, options) {
+  try {
+    return await pdfPool.render(formData, options);
+  } catch (error) {
+    console.error('PDF generation error:', error.message);
+    if (error instanceof RenderRejectedError) throw error;
+    if (error.permanent) throw Object.assign(new Error('Neplatné údaje formulára'), { permanent: true });
+    throw new Error('PDF generovanie zlyhalo');
+  }
+}
+
+// ============================================
+// JOB QUEUE (trvalá fronta žiadostí na disku)
+// ============================================
+const JOBS_DIR = process.env.JOBS_DIR || path.join(os.tmpdir(), 'oddlzenie_jobs');
+const JOB_CONCURRENCY = parseInt(process.env.JOB_CONCURRENCY, 10) || PDF_WORKERS;
+const JOB_QUEUE_LIMIT = parseInt(process.env.JOB_QUEUE_LIMIT, 10) || 200; // viac čakajúcich => 503
+const JOB_MAX_ATTEMPTS = 5;
+const JOB_RETRY_BASE = 5000;              // 5 s, 10 s, 20 s, ... max 5 min
+const JOB_RETENTION = 24 * 60 * 60 * 1000; // hotové úlohy držíme 24 h kvôli stavu
+
+class JobQueue {
+  constructor(dir, { concurrency, handler }) {
+    this.dir = dir;
+    this.concurrency = concurrency;
+    this.handler = handler;
+    this.jobs = new Map();
+    this.ready = [];
+    this.running = 0;
+    this.saving = new Map(); // id -> posledný rozpracovaný zápis
+  }
+
+  // Načíta úlohy z disku; rozpracované po reštarte servera pokračujú odznova
+  async init() {
+    const fs = require('fs').promises;
+    await fs.mkdir(this.dir, { recursive: true, mode: 0o700 });
+
+    const pending = [];
+    for (const name of await fs.readdir(this.dir)) {
+      if (!name.endsWith('.json')) continue;
+      try {
+        const job = JSON.parse(await fs.readFile(path.join(this.dir, name), 'utf8'));
+        if (this.jobs.has(job.id)) continue; // pridaná cez enqueue() počas načítania
+        this.jobs.set(job.id, job);
+        if (job.status === 'queued' || job.status === 'running') {
+          job.status = 'queued';
+          pending.push(job);
         }
+      } catch (err) {
+        console.error(`⚠️ Poškodená úloha ${name}:`, err.message);
+      }
+    }
+    pending.sort((a, b) => a.createdAt.localeCompare(b.createdAt));
+    this.ready.push(...pending.map(job => job.id));
+    if (pending.length) console.log(`🔁 Obnovujem ${pending.length} nespracovaných žiadostí`);
 
-        // Cleanup po 2 minútach
-        setTimeout(async () => {
-          try { await fs.rm(tempDir, { recursive: true, force: true }); } catch (e) {}
-        }, 120000);
+    setInterval(() => this._cleanup(), 60 * 60 * 1000).unref();
+    this._pump();
+  }
+
+  async enqueue(data, { draftId } = {}) {
+    const now = new Date().toISOString();
+    const job = {
+      id: require('crypto').randomUUID(),
+      status: 'queued',
+      step: null,
+      attempts: 0,
+      progress: {},
+      createdAt: now,
+      updatedAt: now,
+      draftId,
+      data
+    };
+    await this._save(job);
+    this.jobs.set(job.id, job);
+    this.ready.push(job.id);
+    this._pump();
+    return job;
+  }
+
+  get(id) {
+    return this.jobs.get(id);
+  }
+
+  stats() {
+    return { queued: this.ready.length, running: this.running, total: this.jobs.size };
+  }
 
-        resolve(attachments);
+  isFull() {
+    return this.ready.length >= JOB_QUEUE_LIMIT;
+  }
+
+  // Atomický zápis (tmp + rename), súbor obsahuje osobné údaje => 0600.
+  // Zápisy jednej úlohy idú za sebou, súbežné kroky (PDF, potvrdenie) by si inak prepisovali tmp súbor.
+  _save(job) {
+    const previous = this.saving.get(job.id) || Promise.resolve();
+    const next = previous.catch(() => {}).then(() => this._write(job));
+    this.saving.set(job.id, next);
+    const done = () => { if (this.saving.get(job.id) === next) this.saving.delete(job.id); };
+    next.then(done, done);
+    return next;
+  }
+
+  async _write(job) {
+    const fs = require('fs').promises;
+    job.updatedAt = new Date().toISOString();
+    const file = path.join(this.dir, `${job.id}.json`);
+    const tmp = `${file}.tmp`;
+    await fs.writeFile(tmp, JSON.stringify(job), { mode: 0o600 });
+    await fs.rename(tmp, file);
+  }
+
+  _pump() {
+    while (this.running < this.concurrency && this.ready.length) {
+      const job = this.jobs.get(this.ready.shift());
+      if (job) this._run(job);
+    }
+  }
+
+  async _run(job) {
+    this.running++;
+    try {
+      job.status = 'running';
+      job.attempts++;
+      await this._save(job);
+
+      await this.handler(job, async (step) => {
+        if (step) job.step = step;
+        await this._save(job);
       });
-    } catch (error) {
-      reject(error);
+
+      job.status = 'done';
+      job.step = 'done';
+      job.error = undefined;
+      delete job.data; // osobné údaje po spracovaní nedržíme
+    } catch (err) {
+      job.error = err.message;
+      if (err instanceof RenderRejectedError) {
+        // Preťažený pool nie je chyba žiadosti: pokus sa nepočíta, ďalší až keď sa fronta uvoľní
+        job.attempts--;
+        const delay = err.retryAfter * 1000;
+        job.status = 'queued';
+        job.nextAttemptAt = new Date(Date.now() + delay).toISOString();
+        console.error(`⏳ Úloha ${job.id} odložená o ${err.retryAfter} s:`, err.message);
+        setTimeout(() => {
+          this.ready.push(job.id);
+          this._pump();
+        }, delay);
+      } else if (err.permanent || job.attempts >= JOB_MAX_ATTEMPTS) {
+        job.status = 'failed';
+        delete job.data;
+        console.error(`❌ Úloha ${job.id} zlyhala definitívne:`, err.message);
+      } else {
+        const delay = Math.min(JOB_RETRY_BASE * 2 ** (job.attempts - 1), 5 * 60 * 1000);
+        job.status = 'queued';
+        job.nextAttemptAt = new Date(Date.now() + delay).toISOString();
+        console.error(`⚠️ Úloha ${job.id} zlyhala (pokus ${job.attempts}), opakujem o ${delay / 1000} s:`, err.message);
+        setTimeout(() => {
+          this.ready.push(job.id);
+          this._pump();
+        }, delay);
+      }
+    } finally {
+      try { await this._save(job); } catch (e) { console.error('⚠️ Uloženie úlohy zlyhalo:', e.message); }
+      this.running--;
+      this._pump();
     }
-  });
+  }
+
+  async _cleanup() {
+    const fs = require('fs').promises;
+    const cutoff = Date.now() - JOB_RETENTION;
+    for (const job of this.jobs.values()) {
+      if ((job.status === 'done' || job.status === 'failed') && Date.parse(job.updatedAt) < cutoff) {
+        this.jobs.delete(job.id);
+        try { await fs.rm(path.join(this.dir, `${job.id}.json`), { force: true }); } catch (e) {}
+      }
+    }
+  }
+}
+
+// Spracovanie jednej žiadosti: PDF -> email adminovi, potvrdenie klientovi
+// (nepotrebuje PDF) ide súbežne s renderovaním. Už odoslané emaily sa pri
+// opakovaní neposielajú znova, PDF sa renderuje len kým admin email neodišiel.
+async function processSubmission(job, save) {
+  const formData = job.data;
+
+  const client = job.progress.clientSent ? null : (async () => {
+    await sendConfirmationToClient(formData);
+    job.progress.clientSent = true;
+    await save();
+  })();
+  // Chyba potvrdenia sa prejaví až pri await nižšie, nie ako neošetrené odmietnutie počas renderu
+  if (client) client.catch(() => {});
+
+  try {
+    if (!job.progress.adminSent) {
+      await save('pdf');
+      console.log('📄 Generujem PDF dokumenty...');
+      const pdfFiles = await generatePDFs(formData, { affinity: job.draftId });
+      console.log(`✅ ${pdfFiles.length} PDF vygenerovaných`);
+
+      await save('admin_email');
+      await sendEmailToAdmin(formData, pdfFiles);
+      job.progress.adminSent = true;
+      await save();
+    }
+  } catch (err) {
+    // Pred opakovaním počkať na potvrdenie, inak by ho ďalší pokus mohol poslať druhýkrát
+    if (client) await Promise.allSettled([client]);
+    throw err;
+  }
+
+  if (client) {
+    if (!job.progress.clientSent) await save('client_email');
+    await client;
+  }
+}
+
+const jobQueue = new JobQueue(JOBS_DIR, { concurrency: JOB_CONCURRENCY, handler: processSubmission });
+jobQueue.init().catch(err => console.error('❌ Fronta žiadostí sa nenačítala:', err));
+
+// ============================================
+// ROZPRACOVANÉ ŽIADOSTI (koncepty na disku + predrenderovanie PDF)
+// ============================================
+const DRAFTS_DIR = process.env.DRAFTS_DIR || path.join(os.tmpdir(), 'oddlzenie_drafts');
+const DRAFT_RETENTION = 3 * 24 * 60 * 60 * 1000; // neaktívne koncepty (osobné údaje) mažeme po 3 dňoch
+
+class DraftStore {
+  constructor(dir) {
+    this.dir = dir;
+    this.updated = new Map(); // id -> čas posledného uloženia (ms), údaje sú len na disku
+    this.writing = new Map(); // id -> posledný rozpracovaný zápis
+  }
+
+  async init() {
+    const fs = require('fs').promises;
+    await fs.mkdir(this.dir, { recursive: true, mode: 0o700 });
+    for (const name of await fs.readdir(this.dir)) {
+      if (!name.endsWith('.json')) continue;
+      const id = name.slice(0, -'.json'.length);
+      if (this.updated.has(id)) continue; // uložený počas načítania
+      try {
+        this.updated.set(id, (await fs.stat(path.join(this.dir, name))).mtimeMs);
+      } catch (err) {}
+    }
+    setInterval(() => this._cleanup(), 60 * 60 * 1000).unref();
+  }
+
+  has(id) {
+    return typeof id === 'string' && this.updated.has(id);
+  }
+
+  size() {
+    return this.updated.size;
+  }
+
+  async create(data) {
+    const id = require('crypto').randomUUID();
+    await this.save(id, data);
+    return id;
+  }
+
+  // Formulár posiela vždy všetky doteraz vyplnené polia, koncept sa preto nahrádza celý
+  // (odstránené riadky tabuliek tak nezostanú visieť)
+  save(id, data) {
+    const draft = { id, updatedAt: new Date().toISOString(), data };
+    this.updated.set(id, Date.now());
+    return this._chain(id, async () => {
+      const fs = require('fs').promises;
+      const file = this._file(id);
+      await fs.writeFile(`${file}.tmp`, JSON.stringify(draft), { mode: 0o600 });
+      await fs.rename(`${file}.tmp`, file);
+    });
+  }
+
+  async get(id) {
+    if (!this.has(id)) return null;
+    try {
+      await this.writing.get(id);
+      return JSON.parse(await require('fs').promises.readFile(this._file(id), 'utf8'));
+    } catch (err) {
+      return null;
+    }
+  }
+
+  remove(id) {
+    this.updated.delete(id);
+    return this._chain(id, () => require('fs').promises.rm(this._file(id), { force: true }));
+  }
+
+  _file(id) {
+    return path.join(this.dir, `${id}.json`);
+  }
+
+  // Zápisy a mazanie jedného konceptu idú za sebou, ako JobQueue._save
+  _chain(id, operation) {
+    const previous = this.writing.get(id) || Promise.resolve();
+    const next = previous.catch(() => {}).then(operation);
+    this.writing.set(id, next);
+    const done = () => { if (this.writing.get(id) === next) this.writing.delete(id); };
+    next.then(done, done);
+    return next;
+  }
+
+  async _cleanup() {
+    const cutoff = Date.now() - DRAFT_RETENTION;
+    for (const [id, updated] of this.updated) {
+      if (updated < cutoff) {
+        try { await this.remove(id); } catch (e) {}
+      }
+    }
+  }
+}
+
+const drafts = new DraftStore(DRAFTS_DIR);
+drafts.init().catch(err => console.error('❌ Koncepty sa nenačítali:', err));
+
+// Nový koncept; odpoveď nesie draftId pre ďalšie uloženia a ?draft= pri odoslaní
+app.post('/api/drafts', draftLimiter, async (req, res) => {
+  try {
+    const errors = validateForm(req.body, { partial: true });
+    if (errors.length) return rejectInvalidForm(res, errors);
+
+    const draftId = await drafts.create(req.body);
+    pdfPool.prerender(draftId, req.body);
+    res.status(201).json({ success: true, draftId, draftUrl: `/api/drafts/${draftId}` });
+  } catch (error) {
+    console.error('❌ Chyba pri ukladaní konceptu:', error);
+    res.status(500).json({ error: 'Koncept sa nepodarilo uložiť. Skúste to znova.' });
+  }
+});
+
+// Uloženie kroku formulára: PDF dokumenty, ktorých údaje sa zmenili, sa prerenderujú na pozadí
+app.put('/api/drafts/:id', draftLimiter, async (req, res) => {
+  try {
+    const draftId = req.params.id;
+    if (!drafts.has(draftId)) {
+      return res.status(404).json({ error: 'Koncept neexistuje' });
+    }
+    const errors = validateForm(req.body, { partial: true });
+    if (errors.length) return rejectInvalidForm(res, errors);
+
+    await drafts.save(draftId, req.body);
+    pdfPool.prerender(draftId, req.body);
+    res.json({ success: true, draftId });
+  } catch (error) {
+    console.error('❌ Chyba pri ukladaní konceptu:', error);
+    res.status(500).json({ error: 'Koncept sa nepodarilo uložiť. Skúste to znova.' });
+  }
+});
+
+// Obnovenie rozpracovaného formulára
+app.get('/api/drafts/:id', draftLimiter, async (req, res) => {
+  const draft = await drafts.get(req.params.id);
+  if (!draft) {
+    return res.status(404).json({ error: 'Koncept neexistuje' });
+  }
+  res.json(draft);
+});
+
+app.delete('/api/drafts/:id', draftLimiter, async (req, res) => {
+  const draftId = req.params.id;
+  if (!drafts.has(draftId)) {
+    return res.status(404).json({ error: 'Koncept neexistuje' });
+  }
+  pdfPool.cancelPrerender(draftId);
+  try {
+    await drafts.remove(draftId);
+  } catch (error) {
+    console.error('⚠️ Zmazanie konceptu zlyhalo:', error.message);
+  }
+  res.status(204).end();
+});
+
+// ============================================
+// NÁHĽAD DOKUMENTU (jeden dokument, prvé strany alebo PNG 1. strany)
+// ============================================
+const PREVIEW_MAX_PAGES = 20;
+const PREVIEW_WIDTH = 240;            // px, predvolená šírka PNG
+const PREVIEW_MAX_WIDTH = 1600;
+const PREVIEW_DEADLINE = 10000;       // na náhľad sa nečaká tak dlho ako na žiadosť
+const PREVIEW_CACHE_TTL = 60 * 1000;  // opakované kliknutia na ten istý náhľad
+const PREVIEW_CACHE_BYTES = 32 * 1024 * 1024;
+
+// Krátkodobá LRU cache hotových náhľadov, opakovaný náhľad ani nejde do workera
+class PreviewCache {
+  constructor(ttl, maxBytes) {
+    this.ttl = ttl;
+    this.maxBytes = maxBytes;
+    this.bytes = 0;
+    this.entries = new Map(); // kľúč -> { expires, file }
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry || entry.expires < Date.now()) {
+      if (entry) this._delete(key);
+      this.misses++;
+      return null;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.file;
+  }
+
+  put(key, file) {
+    if (file.content.length > this.maxBytes) return;
+    this._delete(key);
+    this.entries.set(key, { expires: Date.now() + this.ttl, file });
+    this.bytes += file.content.length;
+    while (this.bytes > this.maxBytes) this._delete(this.entries.keys().next().value);
+  }
+
+  _delete(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+    this.entries.delete(key);
+    this.bytes -= entry.file.content.length;
+  }
+
+  metrics() {
+    return { entries: this.entries.size, bytes: this.bytes, hits: this.hits, misses: this.misses };
+  }
+}
+
+const previewCache = new PreviewCache(PREVIEW_CACHE_TTL, PREVIEW_CACHE_BYTES);
+
+// Náhľad dokumentu z údajov v tele požiadavky, prázdne telo + ?draft=<id> = uložený koncept.
+// ?pages=N = len prvých N strán, ?format=png[&width=px] = obrázok 1. strany.
+app.post('/api/preview/:document', previewLimiter, async (req, res) => {
+  const document = req.params.document;
+  // Zoznam dokumentov pošle každý PDF worker hneď po štarte
+  const documents = pdfPool.documentNames;
+  if (!documents) {
+    res.set('Retry-After', '1');
+    return res.status(503).json({ error: 'PDF generátor sa ešte spúšťa. Skúste to znova o chvíľu.', retryAfter: 1 });
+  }
+  if (!documents.includes(document)) {
+    return res.status(404).json({ error: `Neznámy dokument, možnosti: ${documents.join(', ')}` });
+  }
+  const pages = req.query.pages === undefined ? null : Number(req.query.pages);
+  if (pages !== null && !(Number.isInteger(pages) && pages >= 1 && pages <= PREVIEW_MAX_PAGES)) {
+    return res.status(400).json({ error: `pages: celé číslo 1-${PREVIEW_MAX_PAGES}` });
+  }
+  const png = req.query.format === 'png';
+  const width = req.query.width === undefined ? PREVIEW_WIDTH : Number(req.query.width);
+  if (png && !(Number.isInteger(width) && width >= 16 && width <= PREVIEW_MAX_WIDTH)) {
+    return res.status(400).json({ error: `width: celé číslo 16-${PREVIEW_MAX_WIDTH}` });
+  }
+
+  try {
+    const draftId = drafts.has(req.query.draft) ? req.query.draft : undefined;
+    let data = req.body;
+    if (!data || !Object.keys(data).length) {
+      const draft = draftId && await drafts.get(draftId);
+      if (!draft) return res.status(404).json({ error: 'Koncept neexistuje' });
+      data = draft.data;
+    }
+    const preview = { document, pages: png ? null : pages, thumbnail: png ? width : null };
+    const key = require('crypto').createHash('sha256')
+      .update(JSON.stringify(preview)).update('\n').update(JSON.stringify(data)).digest('hex');
+    let file = previewCache.get(key);
+    res.set('X-Preview-Cache', file ? 'hit' : 'miss');
+    if (!file) {
+      // V cache sú len náhľady už overených údajov
+      const errors = validateForm(data, { partial: true });
+      if (errors.length) return rejectInvalidForm(res, errors);
+      [file] = await pdfPool.render(data, { deadline: PREVIEW_DEADLINE, affinity: draftId, preview });
+      previewCache.put(key, file);
+    }
+
+    res.type(png ? 'image/png' : 'application/pdf');
+    res.set('Content-Disposition', `inline; filename*=UTF-8''${encodeURIComponent(file.filename)}`);
+    res.send(file.content);
+  } catch (error) {
+    if (error instanceof RenderRejectedError) {
+      res.set('Retry-After', String(error.retryAfter));
+      return res.status(503).json({ error: 'Server je momentálne preťažený. Skúste to znova o chvíľu.', retryAfter: error.retryAfter });
+    }
+    if (error.permanent) {
+      return res.status(400).json({ error: 'Neplatné údaje formulára' });
+    }
+    if (/^PreviewUnavailableError\b/.test(error.message)) {
+      return res.status(501).json({ error: 'Náhľad PNG nie je na serveri dostupný, použite PDF' });
+    }
+    console.error('❌ Chyba pri náhľade:', error.message);
+    res.status(500).json({ error: 'Náhľad sa nepodarilo vytvoriť. Skúste to znova.' });
+  }
+});
+
+// ============================================
+// DORUČOVANIE EMAILOV (pool SMTP spojení + krátke opakovanie)
+// ============================================
+const MAIL_ATTEMPTS = parseInt(process.env.MAIL_ATTEMPTS, 10) || 3;
+const MAIL_RETRY_BASE = 1000; // 1 s, 2 s, ...; potom preberá opakovanie fronta žiadostí
+
+// Odmietnutý príjemca (5xx na RCPT) sa opakovaním nezmení, spojenie, timeout a 4xx áno
+function permanentMailError(err) {
+  return err.code === 'EENVELOPE' && err.responseCode >= 500;
 }
 
+class MailDelivery {
+  constructor(transport, { attempts, retryBase }) {
+    this.transport = transport;
+    this.attempts = attempts;
+    this.retryBase = retryBase;
+    this.inFlight = 0;
+    this.counts = { sent: 0, failed: 0, retried: 0 };
+    this.latency = new RollingStats();
+  }
+
+  // Správy nad veľkosť poolu čakajú v nodemaileri na voľné spojenie a odídu
+  // po ňom za sebou, bez nového handshaku
+  async send(mailOptions) {
+    this.inFlight++;
+    const start = Date.now();
+    try {
+      for (let attempt = 1; ; attempt++) {
+        try {
+          const info = await this.transport.sendMail(mailOptions);
+          this.counts.sent++;
+          this.latency.add(Date.now() - start);
+          return info;
+        } catch (err) {
+          if (permanentMailError(err) || attempt >= this.attempts) {
+            this.counts.failed++;
+            err.permanent = permanentMailError(err);
+            throw err;
+          }
+          this.counts.retried++;
+          const delay = this.retryBase * 2 ** (attempt - 1);
+          console.error(`⚠️ Email pre ${mailOptions.to} neodišiel (pokus ${attempt}), opakujem o ${delay / 1000} s:`, err.message);
+          await new Promise(resolve => setTimeout(resolve, delay));
+        }
+      }
+    } finally {
+      this.inFlight--;
+    }
+  }
+
+  metrics() {
+    return {
+      poolSize: SMTP_POOL_SIZE,
+      inFlight: this.inFlight,
+      ...this.counts,
+      sendTime: this.latency.summary()
+    };
+  }
+}
+
+const mailer = new MailDelivery(transporter, { attempts: MAIL_ATTEMPTS, retryBase: MAIL_RETRY_BASE });
+
 // ============================================
 // EMAIL ADMINOVI (s PDF prílohami)
 // ============================================
@@ -271,7 +1214,9 @@ async function sendEmailToAdmin(formData, pdfFiles) {
               <td style="padding:8px;">${new Date().toLocaleString('sk-SK')}</td>
             </tr>
           </table>
-          <p style="margin-top:20px;color:#666;">V prílohe sú 4 PDF dokumenty na kontrolu.</p>
+          <p style="margin-top:20px;color:#666;">${pdfFiles.length === 1
+            ? 'V prílohe je spojený PDF so všetkými 4 dokumentmi (záložky) na kontrolu.'
+            : `V prílohe sú ${pdfFiles.length} PDF dokumenty na kontrolu.`}</p>
         </div>
         <div style="background:#f8f7f4;padding:16px 30px;border-radius:0 0 8px 8px;border:1px solid #e5e7eb;border-top:none;">
           <p style="margin:0;font-size:12px;color:#999;">OddlženieOnline.sk</p>
@@ -281,7 +1226,7 @@ async function sendEmailToAdmin(formData, pdfFiles) {
     attachments: pdfFiles
   };
 
-  await transporter.sendMail(mailOptions);
+  await mailer.send(mailOptions);
   console.log('✅ Email odoslaný adminovi');
 }
 
@@ -326,7 +1271,7 @@ async function sendConfirmationToClient(formData) {
     `
   };
 
-  await transporter.sendMail(mailOptions);
+  await mailer.send(mailOptions);
   console.log('✅ Potvrdenie odoslané klientovi');
 }
 
@@ -341,6 +1286,35 @@ app.get('/health', (req, res) => {
   });
 });
 
+// Metriky prezrádzajú záťaž a počty žiadostí, heslo stránky /api/ nechráni. S METRICS_TOKEN
+// len s hlavičkou "Authorization: Bearer <token>", bez neho len priamo z lokálneho stroja.
+const METRICS_TOKEN = process.env.METRICS_TOKEN || '';
+const LOOPBACK = new Set(['127.0.0.1', '::1', '::ffff:127.0.0.1']);
+
+function metricsAccess(req, res, next) {
+  if (METRICS_TOKEN) {
+    const crypto = require('crypto');
+    const given = crypto.createHash('sha256').update(req.get('authorization') || '').digest();
+    const expected = crypto.createHash('sha256').update(`Bearer ${METRICS_TOKEN}`).digest();
+    if (crypto.timingSafeEqual(given, expected)) return next();
+  } else if (LOOPBACK.has(req.socket.remoteAddress) && !req.get('x-forwarded-for')) {
+    // Cez proxy je spojenie tiež lokálne, skutočný klient je v X-Forwarded-For
+    return next();
+  }
+  res.status(403).json({ error: 'Prístup k metrikám zamietnutý' });
+}
+
+// Metriky renderovania a fronty žiadostí
+app.get('/api/metrics', metricsAccess, (req, res) => {
+  res.json({
+    render: pdfPool.metrics(),
+    jobs: jobQueue.stats(),
+    drafts: drafts.size(),
+    previews: previewCache.metrics(),
+    mail: mailer.metrics()
+  });
+});
+
 // ============================================
 // 404 - Fallback
 // ============================================
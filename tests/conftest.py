@@ -0,0 +1,68 @@
+"""Shared fixtures: repository modules on sys.path, deterministic PDF output and sample payloads"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Bez časových pečiatok a náhodného ID dokumentu: rovnaký vstup => rovnaké bajty PDF.
+# Cez prostredie, aby to platilo aj v procesoch paralelného renderovania.
+os.environ['RL_invariant'] = '1'
+
+import bench_pdf  # noqa: E402
+
+SIGNATURE_DATE = '01.02.2026'
+
+
+@pytest.fixture(scope='session')
+def payload():
+    """Small payload with one row in the main dynamic groups"""
+    return {
+        'meno': 'Ján', 'priezvisko': 'Nováček', 'titul': 'Ing.', 'datumNarodenia': '17.05.1980',
+        'rodneCislo': '800517/1234', 'ulica': 'Štúrova', 'cisloDomu': '12', 'psc': '94901',
+        'obec': 'Nitra', 'email': 'jan.novacek@example.sk', 'vznikDlhov': 'Strata zamestnania',
+        'p_lv_0': '1234', 'p_obec_0': 'Nitra', 'p_hodnota_0': '15000',
+        'h_popis_0': 'Škoda Octavia', 'h_hodnota_0': '4500',
+        'hh_popis_0': 'motocykel Jawa 350', 'hh_hodnota_0': '1200',
+        'ver_nazov_0': 'Slovenská sporiteľňa, a.s.', 'ver_ico_0': '00151653',
+    }
+
+
+@pytest.fixture(scope='session')
+def medium_payload():
+    """Payload with ten rows per group, so tables and paragraphs span several pages"""
+    return bench_pdf.make_payload(*bench_pdf.PROFILES['medium'])
+
+
+@pytest.fixture
+def generator():
+    """PDFGenerator factory with a fixed signature date"""
+    import pdf_generator
+
+    def make(data, **options):
+        return pdf_generator.PDFGenerator(data, signature_date=SIGNATURE_DATE, **options)
+
+    return make
+
+
+@pytest.fixture
+def drawn_words(monkeypatch):
+    """Returns render(fn) -> words of every string fn draws on a PDF canvas in this process"""
+    from reportlab.pdfgen.textobject import PDFTextObject
+    captured = []
+    format_text = PDFTextObject._formatText
+
+    def recording(self, text):
+        captured.append(text)
+        return format_text(self, text)
+
+    monkeypatch.setattr(PDFTextObject, '_formatText', recording)
+
+    def render(fn):
+        del captured[:]
+        fn()
+        return ' '.join(captured).split()
+
+    return render
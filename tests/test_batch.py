@@ -0,0 +1,36 @@
+"""Batch mode renders every good payload and reports the bad ones without stopping"""
+import json
+import os
+
+import pdf_generator
+
+
+def test_batch_renders_good_lines_and_reports_bad_ones(payload, tmp_path):
+    source = tmp_path / 'dlznici.jsonl'
+    source.write_text('\n'.join([
+        json.dumps(payload),
+        '{not json',
+        '',
+        json.dumps([1, 2]),
+        json.dumps(dict(payload, datumNarodenia='2001-02-29')),
+        json.dumps(dict(payload, meno='Mária')),
+    ]) + '\n', encoding='utf-8')
+    output = tmp_path / 'out'
+
+    assert pdf_generator.main(['--batch', str(source), str(output), '--jobs', '2']) == 1
+
+    with open(output / 'batch_report.jsonl', encoding='utf-8') as f:
+        report = {r['name']: r for r in map(json.loads, f)}
+    assert sorted(report) == ['000001', '000002', '000004', '000005', '000006']
+    assert report['000002']['error'].startswith('JSONDecodeError')
+    assert not report['000004']['ok']
+    assert report['000005']['error'].startswith('FormValidationError')
+    for name in ('000002', '000004', '000005'):
+        assert not (output / name).exists()
+    for name in ('000001', '000006'):
+        assert report[name]['ok']
+        assert len(report[name]['files']) == 4
+        for path in report[name]['files']:
+            assert os.path.dirname(path) == str(output / name)
+            with open(path, 'rb') as f:
+                assert f.read(5) == b'%PDF-'
@@ -0,0 +1,82 @@
+"""Render caches return exactly what a fresh render produces"""
+import json
+
+import pytest
+
+import pdf_generator
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        return pdf_generator.MemoryRenderCache()
+    return pdf_generator.DiskRenderCache(str(tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize('merged', [False, True])
+def test_cache_hit_matches_fresh_render(generator, payload, cache, merged):
+    fresh = generator(payload).generate_all_bytes(merged=merged)
+    first = generator(payload).generate_all_bytes(cache=cache, merged=merged)
+    cached = generator(payload).generate_all_bytes(cache=cache, merged=merged)
+    documents = 1 if merged else len(pdf_generator.DOCUMENTS)
+    assert (cache.misses, cache.hits) == (documents, documents)
+    assert first == fresh
+    assert cached == fresh
+
+
+def test_signature_date_is_part_of_the_key(payload, cache):
+    pdf_generator.PDFGenerator(payload, signature_date='01.02.2026').generate_all_bytes(cache=cache)
+    pdf_generator.PDFGenerator(payload, signature_date='02.02.2026').generate_all_bytes(cache=cache)
+    assert (cache.misses, cache.hits) == (2 * len(pdf_generator.DOCUMENTS), 0)
+
+
+def test_disk_cache_write_error_is_counted(tmp_path):
+    cache = pdf_generator.DiskRenderCache(str(tmp_path / 'cache'))
+    (tmp_path / 'cache').rmdir()
+    cache.put('key', {'a.pdf': b'%PDF'})
+    assert cache.write_errors == 1
+    assert cache.get('key') is None
+
+
+def test_changed_section_renders_only_its_documents(generator, payload, cache):
+    generator(payload).generate_all_bytes(cache=cache)
+    changed = dict(payload, ver_nazov_0='Iný veriteľ s.r.o.')
+    misses = cache.misses
+    cached = generator(changed).generate_all_bytes(cache=cache)
+    assert cache.misses == misses + 1
+    assert cached == generator(changed).generate_all_bytes()
+    assert cached != generator(payload).generate_all_bytes()
+
+
+def test_cache_key_reads_the_rows_the_schema_compiles(payload):
+    subset = pdf_generator.document_payload(dict(payload, p_lv_07='1', p_lv_1='5678'), 'majetok')
+    assert 'p_lv_1' in subset and 'p_lv_07' not in subset
+
+
+def test_cache_key_follows_form_schema(payload, monkeypatch):
+    with open(pdf_generator.FORM_SCHEMA_PATH, encoding='utf-8') as f:
+        spec = json.load(f)
+    key = pdf_generator.render_cache_key(payload, '01.02.2026', 'majetok')
+
+    monkeypatch.setattr(pdf_generator, '_form_schema', pdf_generator.FormSchema(dict(spec, _comment='')))
+    assert pdf_generator.render_cache_key(payload, '01.02.2026', 'majetok') == key
+
+    spec['fields']['bsm'] = {'type': 'text', 'default': 'Áno'}
+    monkeypatch.setattr(pdf_generator, '_form_schema', pdf_generator.FormSchema(spec))
+    assert pdf_generator.render_cache_key(payload, '01.02.2026', 'majetok') != key
+
+
+def test_prerendered_draft_is_served_on_submit(generator, payload, cache):
+    assert generator(payload).prerender(cache) == list(pdf_generator.DOCUMENTS)
+    edited = dict(payload, h_popis_0='bicykel')
+    assert set(generator(edited).prerender(cache)) == {'majetok'}
+
+    submit = generator(edited)
+    pdfs = submit.generate_all_bytes(cache=cache)
+    assert submit.cache_hits == list(pdf_generator.DOCUMENTS)
+    assert pdfs == generator(edited).generate_all_bytes()
+
+
+def test_prerender_needs_a_cache(generator, payload):
+    with pytest.raises(ValueError):
+        generator(payload).prerender(None)
@@ -0,0 +1,63 @@
+"""Previews: the first pages of a document, the whole document through the cache, or a PNG of page 1"""
+import io
+import re
+
+import pytest
+
+import pdf_generator
+
+
+def _page_count(pdf):
+    return len(re.findall(rb'/Type /Page\b(?!s)', pdf))
+
+
+def _full_document(generator, data, document):
+    buf = io.BytesIO()
+    getattr(generator(data), pdf_generator.DOCUMENTS[document][1])(buf)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize('max_pages', [1, 2, 3])
+def test_preview_has_max_pages(generator, medium_payload, max_pages):
+    assert _page_count(_full_document(generator, medium_payload, 'majetok')) > 3
+    (name, pdf), = generator(medium_payload).preview('majetok', max_pages=max_pages).items()
+    assert name.endswith('_nahlad.pdf')
+    assert _page_count(pdf) == max_pages
+
+
+def test_preview_pages_match_full_document(generator, medium_payload, drawn_words):
+    full = drawn_words(lambda: _full_document(generator, medium_payload, 'majetok'))
+    preview = drawn_words(lambda: generator(medium_payload).preview('majetok', max_pages=2))
+    assert 0 < len(preview) < len(full)
+    assert full[:len(preview)] == preview
+
+
+def test_preview_longer_than_document(generator, payload):
+    full = _full_document(generator, payload, 'veritelia')
+    (_, pdf), = generator(payload).preview('veritelia', max_pages=100).items()
+    assert _page_count(pdf) == _page_count(full)
+
+
+def test_whole_document_preview_uses_cache(generator, payload):
+    cache = pdf_generator.MemoryRenderCache()
+    pdfs = generator(payload).generate_all_bytes(cache=cache)
+    previewing = generator(payload)
+    preview = previewing.preview('historia', cache=cache)
+    assert previewing.cache_hits == ['historia']
+    assert preview == {name: pdf for name, pdf in pdfs.items() if name in preview}
+    assert len(preview) == 1
+
+
+def test_unknown_document(generator, payload):
+    with pytest.raises(ValueError):
+        generator(payload).preview('zmluva')
+
+
+def test_thumbnail_is_png(generator, payload):
+    try:
+        result = generator(payload).preview('zivotopis', thumbnail=120)
+    except pdf_generator.PreviewUnavailableError:
+        pytest.skip('bez PyMuPDF aj pdftoppm')
+    (name, png), = result.items()
+    assert name.endswith('_nahlad.png')
+    assert png.startswith(b'\x89PNG\r\n\x1a\n')
@@ -0,0 +1,69 @@
+"""Rendering options change how the documents are produced, never what they say"""
+import io
+import re
+
+import pytest
+
+import bench_pdf
+import pdf_generator
+
+
+def test_parallel_files_match_sequential(generator, payload, tmp_path):
+    (tmp_path / 'seq').mkdir()
+    (tmp_path / 'par').mkdir()
+    sequential = generator(payload).generate_all(tmp_path / 'seq')
+    parallel = generator(payload).generate_all(tmp_path / 'par', parallel=True)
+    for key in pdf_generator.DOCUMENTS:
+        with open(sequential[key], 'rb') as a, open(parallel[key], 'rb') as b:
+            assert a.read() == b.read(), key
+
+
+def test_parallel_bytes_match_sequential(generator, payload):
+    sequential = generator(payload).generate_all_bytes()
+    parallel = generator(payload).generate_all_bytes(parallel=True)
+    assert list(parallel) == list(sequential)
+    assert parallel == sequential
+
+
+def _page_count(pdf):
+    return len(re.findall(rb'/Type /Page\b(?!s)', pdf))
+
+
+def test_merged_pdf_holds_every_document(generator, payload):
+    separate = generator(payload).generate_all_bytes()
+    (name, merged), = generator(payload).generate_all_bytes(merged=True).items()
+    assert name == generator(payload).combined_file_name()
+    assert _page_count(merged) == sum(map(_page_count, separate.values()))
+
+
+@pytest.mark.parametrize('document', list(pdf_generator.DOCUMENTS))
+def test_profiles_draw_the_same_text(generator, medium_payload, drawn_words, document):
+    method = getattr(pdf_generator.PDFGenerator, pdf_generator.DOCUMENTS[document][1])
+    default = drawn_words(lambda: method(generator(medium_payload), io.BytesIO()))
+    compact = drawn_words(lambda: method(generator(medium_payload, compact=True), io.BytesIO()))
+    assert len(default) > 300
+    assert compact == default
+
+
+def _value_words(data, document):
+    """Word tokens of the payload values a document reads"""
+    values = pdf_generator.document_payload(data, document).values()
+    return set(re.findall(r'\w+', ' '.join(str(value) for value in values)))
+
+
+@pytest.mark.parametrize('document', pdf_generator.DENSE_DOCUMENTS)
+def test_dense_layout_draws_every_value(generator, medium_payload, drawn_words, document):
+    method = getattr(pdf_generator.PDFGenerator, pdf_generator.DOCUMENTS[document][1])
+    per_item = drawn_words(lambda: method(generator(medium_payload), io.BytesIO()))
+    dense = drawn_words(lambda: method(generator(medium_payload, dense=[document]), io.BytesIO()))
+    values = _value_words(medium_payload, document) & set(re.findall(r'\w+', ' '.join(per_item)))
+    assert len(values) > 20
+    assert values <= set(re.findall(r'\w+', ' '.join(dense)))
+
+
+def test_dense_row_taller_than_a_page_is_split(generator, drawn_words):
+    data = bench_pdf.make_payload(*bench_pdf.PROFILES['long_fields'])
+    method = getattr(pdf_generator.PDFGenerator, pdf_generator.DOCUMENTS['majetok'][1])
+    words = drawn_words(lambda: method(generator(data, dense=['majetok']), io.BytesIO()))
+    row = ' '.join(value for key, value in data.items() if key.startswith('b_') and key.endswith('_0'))
+    assert set(re.findall(r'\w+', row)) <= set(re.findall(r'\w+', ' '.join(words)))
@@ -0,0 +1,106 @@
+"""form_schema.json: pdf_generator.FormSchema and server.js (form_validation.js) accept and reject the same payloads"""
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import bench_pdf
+import pdf_generator
+from conftest import ROOT
+
+LIMITS = pdf_generator.get_form_schema().limits
+
+# názov -> (zmeny oproti platnému formuláru, kľúče s chybou)
+CASES = {
+    'valid': ({}, []),
+    'local date': ({'datumNarodenia': '5.2.1980', 'dom_datnar_0': '26. 6. 1978'}, []),
+    'flags and numbers': ({'soc_davky': True, 'soc_ine': False, 'vydaj_strava': 250, 'prijem_suma_0': 820.5}, []),
+    'empty optional values': ({'titul': '', 'dom_datnar_0': '', 'zdravotnyStav': None}, []),
+    'too long field': ({'meno': 'J' * (LIMITS['max_length'] + 1)}, ['meno']),
+    'field max_length override': ({'vznikDlhov': 'x' * 10000, 'dalsieVzdelanie': 'x' * 10001}, ['dalsieVzdelanie']),
+    'too long row field': ({'ver_nazov_0': 'x' * (LIMITS['max_length'] + 1)}, ['ver_nazov_0']),
+    'date with slashes': ({'datumNarodenia': '26/06/1978'}, ['datumNarodenia']),
+    'two-digit year': ({'dom_datnar_0': '26.6.78'}, ['dom_datnar_0']),
+    'nonexistent date': ({'datumNarodenia': '2001-02-29', 'dom_datnar_0': '2000-02-29'}, ['datumNarodenia']),
+    'list value': ({'meno': ['Ján']}, ['meno']),
+    'object row value': ({'p_lv_0': {'lv': 1}}, ['p_lv_0']),
+    'row index over limit': ({f'p_lv_{LIMITS["max_index"] + 1}': '1'}, [f'p_lv_{LIMITS["max_index"] + 1}']),
+    'row index with leading zero': ({'p_lv_07': '1'}, ['p_lv_07']),
+    'group key without index': ({'ver_nazov': 'x'}, ['ver_nazov']),
+    'too long unknown value': ({'poznamka': 'x' * (LIMITS['max_value_length'] + 1)}, ['poznamka']),
+    'too long unknown row field': ({'ver_junk_0': 'x' * (LIMITS['max_value_length'] + 1)}, ['ver_junk_0']),
+    'unknown row field within limit': ({'ver_junk_0': 'x' * LIMITS['max_value_length']}, []),
+    'too many rows': ({f'prijem_suma_{i}': '1' for i in range(LIMITS['max_rows'] + 1)}, ['prijem']),
+}
+
+
+def _payload(changes):
+    data = bench_pdf.make_payload(*bench_pdf.PROFILES['small'])
+    data.update(changes)
+    return data
+
+
+def _python_errors(data):
+    try:
+        pdf_generator.get_form_schema().compile(data)
+    except pdf_generator.FormValidationError as e:
+        return e.errors
+    return []
+
+
+def _too_many_keys():
+    return {f'x{i}': '' for i in range(LIMITS['max_keys'] + 1)}
+
+
+def _error_keys(errors):
+    return sorted(error.split(': ', 1)[0] for error in errors)
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_schema_accepts_and_rejects(name):
+    changes, keys = CASES[name]
+    assert _error_keys(_python_errors(_payload(changes))) == keys
+
+
+def test_too_many_keys_rejected():
+    assert _error_keys(_python_errors(_too_many_keys())) == ['payload']
+
+
+def test_valid_payload_compiles_to_form():
+    form = pdf_generator.get_form_schema().compile(_payload({'datumNarodenia': '1980-05-17'}))
+    assert form.datumNarodenia == '17.05.1980'
+    assert form.zabezpPrava.startswith('Dlh vznikol')
+    assert len(form.groups['ver']) == 1
+
+
+def _node_errors(payloads, partial):
+    """validateForm of form_validation.js (server.js) for every payload"""
+    script = ("const { validateForm } = require('./form_validation');"
+              "const payloads = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+              f"const partial = {json.dumps(partial)};"
+              "process.stdout.write(JSON.stringify(payloads.map(data => validateForm(data, { partial }))));")
+    result = subprocess.run(['node', '-e', script], cwd=ROOT, input=json.dumps(payloads),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='node nie je nainštalovaný')
+
+
+@needs_node
+def test_server_validation_agrees_with_python():
+    # Povinné polia kontroluje len server.js, preto partial; texty chýb sa líšia názvami typov (dict/object)
+    names = list(CASES) + ['too many keys']
+    payloads = [_payload(changes) for changes, _ in CASES.values()] + [_too_many_keys()]
+    node = [_error_keys(errors) for errors in _node_errors(payloads, partial=True)]
+    python = [_error_keys(_python_errors(data)) for data in payloads]
+    assert dict(zip(names, node)) == dict(zip(names, python))
+
+
+@needs_node
+def test_server_requires_contact_fields():
+    missing_email = _payload({'email': '  '})
+    full, partial = _node_errors([missing_email], partial=False)[0], _node_errors([missing_email], partial=True)[0]
+    assert full == ['chýbajúce povinné údaje: email']
+    assert partial == []
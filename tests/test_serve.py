@@ -0,0 +1,84 @@
+"""Worker protocol of pdf_generator.serve, the side of server.js's PDF worker pool in Python"""
+import io
+import json
+
+import pdf_generator
+from conftest import SIGNATURE_DATE
+
+
+def _read_frames(stream):
+    """Split serve() output into (header, {name: bytes}) frames, the way server.js reads them"""
+    frames = []
+    while True:
+        line = stream.readline()
+        if not line:
+            return frames
+        header = json.loads(line)
+        blobs = {f['name']: stream.read(f['size']) for f in header.get('files', [])}
+        frames.append((header, blobs))
+
+
+def _serve(*requests, hello=False, **options):
+    """Frames serve() writes for the given request lines (dicts are JSON-encoded), without the hello"""
+    lines = [r if isinstance(r, str) else json.dumps(r) for r in requests]
+    stdout = io.BytesIO()
+    pdf_generator.serve(stdin=io.BytesIO(('\n'.join(lines) + '\n').encode('utf-8')), stdout=stdout, **options)
+    stdout.seek(0)
+    frames = _read_frames(stdout)
+    return frames if hello else frames[1:]
+
+
+def test_write_frame_lists_blob_sizes():
+    stream = io.BytesIO()
+    pdf_generator.write_frame(stream, {'id': 1, 'ok': True}, [('a.pdf', b'%PDF-a'), ('b.pdf', b'')])
+    stream.seek(0)
+    (header, blobs), = _read_frames(stream)
+    assert header['files'] == [{'name': 'a.pdf', 'size': 6}, {'name': 'b.pdf', 'size': 0}]
+    assert blobs == {'a.pdf': b'%PDF-a', 'b.pdf': b''}
+
+
+def test_hello_lists_documents_before_any_request():
+    (hello, blobs), = _serve(hello=True)
+    assert hello == {'id': None, 'ok': True, 'documents': list(pdf_generator.DOCUMENTS)}
+    assert blobs == {}
+
+
+def test_render_reply_carries_the_pdfs(generator, payload):
+    (header, blobs), = _serve({'id': 7, 'data': payload, 'signature_date': SIGNATURE_DATE})
+    assert header['id'] == 7 and header['ok']
+    assert blobs == generator(payload).generate_all_bytes()
+
+
+def test_bad_lines_get_error_frames_and_the_worker_continues(payload):
+    frames = _serve('{not json', '', {'id': 2}, {'id': 3, 'data': payload})
+    assert [header['id'] for header, _ in frames] == [None, 2, 3]
+    (bad_json, no_blobs), (no_data, _), (good, pdfs) = frames
+    assert not bad_json['ok'] and bad_json['error'].startswith('JSONDecodeError')
+    assert 'files' not in bad_json and no_blobs == {}
+    assert not no_data['ok'] and no_data['error'].startswith('KeyError')
+    assert good['ok'] and len(pdfs) == 4
+
+
+def test_prerender_reply_lists_rendered_documents_and_fills_the_cache(generator, payload):
+    cache = pdf_generator.MemoryRenderCache()
+    request = {'data': payload, 'signature_date': SIGNATURE_DATE}
+    (prerendered, no_blobs), (submitted, pdfs) = _serve(dict(request, id=1, prerender=True), dict(request, id=2),
+                                                        cache=cache)
+    assert prerendered['ok'] and prerendered['rendered'] == list(pdf_generator.DOCUMENTS)
+    assert no_blobs == {}
+    assert submitted['cached'] == list(pdf_generator.DOCUMENTS)
+    assert pdfs == generator(payload).generate_all_bytes()
+
+
+def test_prerender_without_cache_is_an_error(payload):
+    (reply, _), = _serve({'id': 1, 'data': payload, 'prerender': True})
+    assert not reply['ok'] and reply['error'].startswith('ValueError')
+
+
+def test_preview_reply_carries_one_file(generator, payload):
+    request = {'id': 4, 'data': payload, 'signature_date': SIGNATURE_DATE,
+               'preview': {'document': 'veritelia', 'pages': 1}}
+    (header, blobs), (unknown, _) = _serve(request, dict(request, id=5, preview={'document': 'zmluva'}))
+    assert header['ok']
+    assert blobs == generator(payload).preview('veritelia', max_pages=1)
+    assert not unknown['ok'] and unknown['error'].startswith('ValueError')
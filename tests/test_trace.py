@@ -0,0 +1,12 @@
+"""RenderTrace spans of a traced render"""
+import pdf_generator
+
+
+def test_build_spans_report_story_time(generator, payload):
+    trace = pdf_generator.RenderTrace()
+    generator(payload, trace=trace).generate_all_bytes()
+    builds = [span for span in trace.spans if span['name'].endswith('.build')]
+    assert [span['name'] for span in builds] == [f'{key}.build' for key in pdf_generator.DOCUMENTS]
+    for span in builds:
+        assert 0 < span['story_seconds'] <= span['seconds']
+        assert span['pages'] >= 1